@@ -0,0 +1,334 @@
+"""
+Seeded bulk generator of synthetic activity records for load-testing the dashboards, with
+the same columns as the Faker loop in activity_monitoring.py:
+
+    Timestamp   "YYYY-MM-DD_hhmm:ss [unix]"
+    datetime    the same time as a datetime
+    log         a sentence
+    score       0.00 - 100.00
+    reference   UUID4
+    tags        1-3 words
+
+Nothing is generated row by row. Sentences and tags are drawn by index from vocabularies made
+once up front (with Faker when it is installed, otherwise from syllables); times, scores,
+vocabulary codes and UUID bytes are NumPy arrays. CSV and NDJSON rows are assembled as bytes
+straight from those arrays (fixed-width fields as byte matrices, times from lookup tables,
+vocabulary fields gathered from pre-rendered byte tables), so no per-row Python runs. Parquet needs the optional pyarrow.
+
+The same seed gives the same records, whatever the chunk size.
+
+Usage: python activity_generator.py activity.csv --rows 10000000
+       python activity_generator.py activity.ndjson --rows 1000000 --seed 7
+       python activity_generator.py activity.parquet --rows 100000000
+"""
+import argparse
+import os
+import sys
+import time
+from typing import Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    from faker import Faker
+except ImportError:  # vocabularies are then built from syllables
+    Faker = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet output then raises a clear error
+    pa = None
+
+CHUNK_ROWS = 131_072  # records per write; the padded byte matrix of a chunk stays small
+FORMATS = ("csv", "ndjson", "parquet")
+SYLLABLES = ("ka", "lo", "mi", "ne", "ru", "sa", "ti", "vo", "ze", "an", "el", "or", "us", "ba", "de", "fi")
+
+def _syllable_words(rng: np.random.Generator, count: int) -> List[str]:
+    """count distinct words of 2-3 syllables, longer ones once count nears what those can form."""
+    longest = 3
+    while sum(len(SYLLABLES) ** n for n in range(2, longest + 1)) < 2 * count:
+        longest += 1
+    words = set()
+    while len(words) < count:
+        words.add("".join(rng.choice(SYLLABLES, rng.integers(2, longest + 1))))
+    return sorted(words)
+
+def build_vocabulary(seed: int, sentences: int = 10_000, tags: int = 1_000):
+    """Distinct sentences and tag words, reproducible from the seed."""
+    rng = np.random.default_rng([seed, 1])
+    if Faker is not None:
+        fake = Faker()
+        fake.seed_instance(seed)
+        sentence_list = [fake.sentence() for _ in range(sentences)]
+        words = sorted({fake.word() for _ in range(tags * 4)})
+        if len(words) < tags:  # Faker's word list only has about 1,000 words
+            known = set(words)
+            words += [w for w in _syllable_words(rng, tags) if w not in known][:tags - len(words)]
+        words = np.array(words, dtype=object)
+    else:
+        words = np.array(_syllable_words(rng, max(2_000, tags)), dtype=object)
+        lengths = rng.integers(4, 10, sentences)
+        picks = np.split(words[rng.integers(0, len(words), int(lengths.sum()))], np.cumsum(lengths)[:-1])
+        sentence_list = [" ".join(pick).capitalize() + "." for pick in picks]
+    tag_list = sorted(words[rng.permutation(len(words))[:tags]])  # a seeded pick, not the first alphabetically
+    # Keep the pre-rendered CSV/JSON fields free of characters that would need escaping.
+    clean = lambda s: s.replace('"', "'").replace("\\", "/")
+    return [clean(s) for s in sentence_list], [clean(t) for t in tag_list]
+
+class _Vocabulary:
+    """
+    Strings encoded once into a zero-padded (entries, longest) byte table, plus a mask of
+    the real bytes, so a field is one row gather per record.
+    """
+
+    def __init__(self, strings: List[str]):
+        encoded = [s.encode("utf-8") for s in strings]
+        lengths = np.array([len(b) for b in encoded], dtype=np.int64)
+        width = max(int(lengths.max()), 1)
+        self.mask = np.arange(width) < lengths[:, None]
+        self.table = np.zeros((len(encoded), width), dtype=np.uint8)
+        self.table[self.mask] = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+        self.width = width
+
+def _width(part) -> int:
+    if isinstance(part, bytes):
+        return len(part)
+    if isinstance(part, np.ndarray):
+        return part.shape[1]
+    return part[0].width
+
+def _assemble(parts, rows: int) -> bytes:
+    """
+    Concatenate per-record fields into one byte string, record after record. A part is
+    bytes (the same for every record), a (rows, width) uint8 matrix, or (vocabulary, codes)
+    for a variable-length field. Fields are laid out at their widest in a (rows, total)
+    matrix, and one boolean compaction drops the padding of the variable-length ones.
+    """
+    total = sum(_width(part) for part in parts)
+    out = np.empty((rows, total), dtype=np.uint8)
+    keep = None
+    column = 0
+    for part in parts:
+        width = _width(part)
+        span = slice(column, column + width)
+        if isinstance(part, bytes):
+            out[:, span] = np.frombuffer(part, dtype=np.uint8)
+        elif isinstance(part, np.ndarray):
+            out[:, span] = part
+        else:
+            vocabulary, codes = part
+            out[:, span] = vocabulary.table[codes]
+            if keep is None:
+                keep = np.ones((rows, total), dtype=bool)
+            keep[:, span] = vocabulary.mask[codes]
+        column += width
+    return (out if keep is None else out[keep]).tobytes()
+
+_DIGITS = np.arange(10, dtype=np.uint8) + ord("0")
+_FIVE_DIGITS = _DIGITS[np.arange(100_000)[:, None] // 10 ** np.arange(4, -1, -1) % 10]   # "00000" .. "99999"
+_CLOCK = np.hstack([_FIVE_DIGITS[np.arange(86_400) // 3600][:, 3:],                       # "hhmmss" by second of day
+                    _FIVE_DIGITS[np.arange(86_400) // 60 % 60][:, 3:],
+                    _FIVE_DIGITS[np.arange(86_400) % 60][:, 3:]])
+_HEX = np.frombuffer(b"0123456789abcdef", dtype=np.uint8)
+_UUID_LAYOUT = np.array([0, 1, 2, 3, 4, 5, 6, 7, -1, 8, 9, 10, 11, -1, 12, 13, 14, 15, -1,
+                         16, 17, 18, 19, -1, 20, 21, 22, 23, 24, 25, 26, 27, 28, 29, 30, 31])  # -1: dash
+class ActivityChunk:
+    """One chunk of generated records as arrays; rendered on demand."""
+
+    def __init__(self, unix: np.ndarray, cents: np.ndarray, log_codes: np.ndarray, uuid_bytes: np.ndarray,
+                 tag_codes: np.ndarray, tag_counts: np.ndarray, generator: "ActivityGenerator"):
+        self.unix, self.cents, self.log_codes = unix, cents, log_codes
+        self.uuid_bytes, self.tag_codes, self.tag_counts = uuid_bytes, tag_codes, tag_counts
+        self.generator = generator
+        self._time = None
+
+    def __len__(self):
+        return len(self.unix)
+
+    def _time_parts(self):
+        """(date, hhmmss, unix digits) byte matrices, from lookup tables rather than strftime."""
+        if self._time is None:
+            day, second = np.divmod(self.unix, 86_400)
+            days, which = np.unique(day, return_inverse=True)  # records are in time order: few days
+            dates = np.datetime_as_string(days.astype("datetime64[D]")).astype("S10").view(np.uint8).reshape(-1, 10)
+            high, low = np.divmod(self.unix, 100_000)
+            self._time = (dates[which], _CLOCK[second], np.hstack([_FIVE_DIGITS[high], _FIVE_DIGITS[low]]))
+        return self._time
+
+    def timestamp_parts(self) -> list:
+        """Parts of "YYYY-MM-DD_hhmm:ss [unix]" for _assemble."""
+        date, clock, unix = self._time_parts()
+        return [date, b"_", clock[:, :4], b":", clock[:, 4:], b" [", unix, b"]"]
+
+    def iso_parts(self) -> list:
+        """Parts of "YYYY-MM-DDThh:mm:ss" for _assemble."""
+        date, clock, _ = self._time_parts()
+        return [date, b"T", clock[:, :2], b":", clock[:, 2:4], b":", clock[:, 4:]]
+
+    def uuid_text(self) -> np.ndarray:
+        """(rows, 36) UUID4 text from the random bytes."""
+        nibbles = np.empty((len(self), 32), dtype=np.uint8)
+        nibbles[:, 0::2] = _HEX[self.uuid_bytes >> 4]
+        nibbles[:, 1::2] = _HEX[self.uuid_bytes & 0x0F]
+        text = nibbles[:, np.maximum(_UUID_LAYOUT, 0)]
+        text[:, _UUID_LAYOUT < 0] = ord("-")
+        return text
+
+    def _tag_parts(self, first: _Vocabulary, more: _Vocabulary) -> list:
+        """The tags of each record as three vocabulary fields; a missing tag is the empty last entry of more."""
+        padded = np.full((len(self), 3), len(more.table) - 1, dtype=np.int64)
+        padded[np.arange(3) < self.tag_counts[:, None]] = self.tag_codes
+        return [(first, padded[:, 0]), (more, padded[:, 1]), (more, padded[:, 2])]
+
+    def csv_bytes(self) -> bytes:
+        g = self.generator
+        return _assemble([*self.timestamp_parts(), b",", *self.iso_parts(), b',"', (g.sentences, self.log_codes),
+                          b'",', (g.scores, self.cents), b",", self.uuid_text(), b',"',
+                          *self._tag_parts(g.tags, g.csv_more_tags), b'"\n'], len(self))
+
+    def ndjson_bytes(self) -> bytes:
+        g = self.generator
+        return _assemble([b'{"Timestamp":"', *self.timestamp_parts(), b'","datetime":"', *self.iso_parts(),
+                          b'","log":"', (g.sentences, self.log_codes), b'","score":', (g.scores, self.cents),
+                          b',"reference":"', self.uuid_text(), b'","tags":["',
+                          *self._tag_parts(g.tags, g.json_more_tags), b'"]}\n'], len(self))
+
+    def _timestamp_text(self) -> bytes:
+        return _assemble(self.timestamp_parts(), len(self))  # fixed width: 31 bytes per record
+
+    def frame(self) -> pd.DataFrame:
+        """The chunk as the dashboards' DataFrame (tags as lists)."""
+        g = self.generator
+        tag_values = np.array(g.tag_list, dtype=object)[self.tag_codes]
+        bounds = np.cumsum(self.tag_counts)[:-1]
+        return pd.DataFrame({
+            "Timestamp": np.frombuffer(self._timestamp_text(), dtype="S31").astype(str),
+            "datetime": self.unix.astype("datetime64[s]"),
+            "log": np.array(g.sentence_list, dtype=object)[self.log_codes],
+            "score": self.cents / 100,
+            "reference": np.ascontiguousarray(self.uuid_text()).view("S36").ravel().astype(str),
+            "tags": [list(t) for t in np.split(tag_values, bounds)],
+        })
+
+    def arrow_table(self):
+        g = self.generator
+        rows = len(self)
+        timestamps = pa.StringArray.from_buffers(rows, pa.py_buffer(np.arange(0, 31 * rows + 1, 31, dtype=np.int32)),
+                                                 pa.py_buffer(self._timestamp_text()))
+        references = pa.StringArray.from_buffers(rows, pa.py_buffer(np.arange(0, 36 * rows + 1, 36, dtype=np.int32)),
+                                                 pa.py_buffer(self.uuid_text().tobytes()))
+        tag_offsets = np.concatenate([[0], np.cumsum(self.tag_counts)]).astype(np.int32)
+        tags = pa.ListArray.from_arrays(pa.array(tag_offsets),
+                                        pa.DictionaryArray.from_arrays(pa.array(self.tag_codes.astype(np.int32)),
+                                                                       g.arrow_tags))
+        return pa.table({
+            "Timestamp": timestamps,
+            "datetime": pa.array(self.unix.astype("datetime64[s]")),
+            "log": pa.DictionaryArray.from_arrays(pa.array(self.log_codes.astype(np.int32)), g.arrow_sentences),
+            "score": pa.array(self.cents / 100),
+            "reference": references,
+            "tags": tags,
+        })
+
+class ActivityGenerator:
+    def __init__(self, seed: int = 0, start: str = "2025-01-01", span_days: float = 10.0,
+                 sentences: int = 10_000, tags: int = 1_000):
+        self.seed = seed
+        self.start = int(pd.Timestamp(start).timestamp())
+        self.span_days = span_days
+        if not 10 ** 9 <= self.start <= 10 ** 10 - span_days * 86400:
+            raise ValueError("records must fall between 2001-09-09 and 2286-11-20 (10-digit unix times)")
+        self.sentence_list, self.tag_list = build_vocabulary(seed, sentences, tags)
+        self.sentences = _Vocabulary(self.sentence_list)
+        self.tags = _Vocabulary(self.tag_list)
+        self.csv_more_tags = _Vocabulary([", " + t for t in self.tag_list] + [""])
+        self.json_more_tags = _Vocabulary(['","' + t for t in self.tag_list] + [""])
+        self.scores = _Vocabulary([f"{cents / 100:.2f}" for cents in range(10_001)])
+        if pa is not None:
+            self.arrow_sentences = pa.array(self.sentence_list)
+            self.arrow_tags = pa.array(self.tag_list)
+
+    def chunks(self, rows: int, chunk_rows: int = CHUNK_ROWS) -> Iterator[ActivityChunk]:
+        """
+        rows records spread over span_days in time order, about chunk_rows at a time. Every
+        block of 65,536 records is drawn from (seed, block number), so chunk_rows does not
+        change the output.
+        """
+        block = 65_536
+        mean_gap = self.span_days * 86400 / max(rows, 1)  # seconds between records
+        carry = float(self.start)
+        buffered = []
+        produced = 0
+        for index in range((rows + block - 1) // block):
+            n = min(block, rows - index * block)
+            rng = np.random.default_rng([self.seed, index])
+            times = carry + np.cumsum(rng.exponential(mean_gap, n))
+            carry = times[-1]
+            tag_counts = rng.integers(1, 4, n)
+            buffered.append((
+                times.astype(np.int64),
+                rng.integers(0, 10_001, n),
+                rng.integers(0, len(self.sentence_list), n),
+                rng.integers(0, 256, (n, 16), dtype=np.uint8),
+                rng.integers(0, len(self.tag_list), int(tag_counts.sum())),
+                tag_counts,
+            ))
+            produced += n
+            if sum(len(b[0]) for b in buffered) >= chunk_rows or produced == rows:
+                unix, cents, logs, uuids, tag_codes, counts = (np.concatenate(c) for c in zip(*buffered))
+                uuids[:, 6] = uuids[:, 6] & 0x0F | 0x40  # version 4
+                uuids[:, 8] = uuids[:, 8] & 0x3F | 0x80  # RFC 4122 variant
+                buffered = []
+                yield ActivityChunk(unix, cents, logs, uuids, tag_codes, counts, self)
+
+    def frame(self, rows: int) -> pd.DataFrame:
+        frames = [chunk.frame() for chunk in self.chunks(rows)]
+        if not frames:  # no records: the same columns and dtypes, empty
+            return next(self.chunks(1)).frame().iloc[:0]
+        return pd.concat(frames, ignore_index=True)
+
+    def write(self, path: str, rows: int, fmt: Optional[str] = None, chunk_rows: int = CHUNK_ROWS) -> int:
+        """Stream rows records to path as CSV, NDJSON or Parquet (default: from the extension)."""
+        fmt = fmt or os.path.splitext(path)[1].lstrip(".").lower().replace("jsonl", "ndjson")
+        if fmt not in FORMATS:
+            raise ValueError(f"unknown format {fmt!r}; expected one of {FORMATS}")
+        if fmt == "parquet":
+            if pa is None:
+                raise ImportError("Parquet output needs the pyarrow package")
+            writer = None
+            try:
+                for chunk in self.chunks(rows, chunk_rows):
+                    table = chunk.arrow_table()
+                    writer = writer or pq.ParquetWriter(path, table.schema)
+                    writer.write_table(table)
+            finally:
+                if writer is not None:
+                    writer.close()
+            return rows
+        with open(path, "wb") as f:
+            if fmt == "csv":
+                f.write(b"Timestamp,datetime,log,score,reference,tags\n")
+            for chunk in self.chunks(rows, chunk_rows):
+                f.write(chunk.csv_bytes() if fmt == "csv" else chunk.ndjson_bytes())
+        return rows
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write seeded synthetic activity records for load tests")
+    parser.add_argument("output", nargs="?", default="activity.csv", help="*.csv, *.ndjson/*.jsonl or *.parquet")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--start", default="2025-01-01", help="time of the first record (UTC)")
+    parser.add_argument("--span-days", type=float, default=10.0, help="time range covered by the records")
+    parser.add_argument("--format", choices=FORMATS, help="default: from the output extension")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    generator = ActivityGenerator(args.seed, args.start, args.span_days)
+    t1 = time.perf_counter()
+    generator.write(args.output, args.rows, args.format, args.chunk_rows)
+    elapsed = time.perf_counter() - t1
+    print(f"{args.rows:,} rows -> {args.output} ({os.path.getsize(args.output) / 2**20:,.1f} MiB) in {elapsed:.2f}s "
+          f"({args.rows / max(elapsed, 1e-9) / 1e6:,.2f}M rows/s; vocabulary {t1 - t0:.2f}s)", file=sys.stderr)
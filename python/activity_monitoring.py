@@ -1,43 +1,63 @@
 #!pip install faker
+import argparse
 import json
 import random
 from datetime import datetime, timedelta
-from faker import Faker
 import plotly.express as px
 import pandas as pd
 
+try:
+    from faker import Faker
+except ImportError:  # only the default 100-row sample needs it; --rows does not
+    Faker = None
+
+from activity_downsample import POINT_BUDGET, downsample
+from activity_generator import ActivityGenerator
+
+parser = argparse.ArgumentParser(description="Plot a score time series of activity logs")
+parser.add_argument("--rows", type=int, help="load test: generate this many records with the seeded bulk "
+                                             "generator (activity_generator.py) instead of 100 Faker rows")
+parser.add_argument("--seed", type=int, default=0)
+args, _ = parser.parse_known_args()
+
 # Step 1: Generate fake data
-fake = Faker()
-data = []
+if args.rows:
+    df = ActivityGenerator(args.seed).frame(args.rows)
+else:
+    if Faker is None:
+        parser.error("the sample data needs the faker package (pip install faker), or pass --rows")
+    fake = Faker()
+    data = []
 
-start_time = datetime.now() - timedelta(days=10)
+    start_time = datetime.now() - timedelta(days=10)
 
-for _ in range(100):
-    time = start_time + timedelta(minutes=random.randint(0, 14400))  # Spread over 10 days
-    unix_time = int(time.timestamp())
-    timestamp_str = f"{time.strftime('%Y-%m-%d_%H%M:%S')} [{unix_time}]"
+    for _ in range(100):
+        time = start_time + timedelta(minutes=random.randint(0, 14400))  # Spread over 10 days
+        unix_time = int(time.timestamp())
+        timestamp_str = f"{time.strftime('%Y-%m-%d_%H%M:%S')} [{unix_time}]"
     
-    data.append({
-        "Timestamp": timestamp_str,
-        "datetime": time,  # true datetime object for plotting
-        "log": fake.sentence(),
-        "score": round(random.uniform(0, 100), 2),
-        "reference": fake.uuid4(),
-        "tags": [fake.word() for _ in range(random.randint(1, 3))]
-    })
-
-# Step 2: Convert to DataFrame
-df = pd.DataFrame(data)
+        data.append({
+            "Timestamp": timestamp_str,
+            "datetime": time,  # true datetime object for plotting
+            "log": fake.sentence(),
+            "score": round(random.uniform(0, 100), 2),
+            "reference": fake.uuid4(),
+            "tags": [fake.word() for _ in range(random.randint(1, 3))]
+        })
+
+    # Step 2: Convert to DataFrame
+    df = pd.DataFrame(data)
 
 # Sort the DataFrame by datetime
 df = df.sort_values(by="datetime")
 
-fig.update_traces(mode="markers+lines")
-fig.update_layout(hovermode="closest")
+# Draw at most POINT_BUDGET rows (LTTB + per-bucket min/max, so spikes stay visible); the
+# drawn rows are real rows, so the hover text still shows their own log
+plot_df = downsample(df, POINT_BUDGET)
 
 # Then re-plot (scatter only, or sorted lines)
 fig = px.scatter(
-    df,
+    plot_df,
     x="datetime",
     y="score",
     hover_data={
@@ -1,40 +1,66 @@
 #!pip install faker
+import argparse
 import json
 import random
 from datetime import datetime, timedelta
-from faker import Faker
 import plotly.express as px
 import pandas as pd
 
-# Step 1: Generate fake data
-fake = Faker()
-data = []
+try:
+    from faker import Faker
+except ImportError:  # only the default 100-row sample needs it; --rows does not
+    Faker = None
+
+from activity_downsample import EMBED_LIMIT, POINT_BUDGET, downsample, view_rows
+from activity_generator import ActivityGenerator
+from activity_payload import DECODE_JS, payload_json
 
-start_time = datetime.now() - timedelta(days=10)
+parser = argparse.ArgumentParser(description="Plot a score time series of activity logs")
+parser.add_argument("--rows", type=int, help="load test: generate this many records with the seeded bulk "
+                                             "generator (activity_generator.py) instead of 100 Faker rows")
+parser.add_argument("--seed", type=int, default=0)
+args, _ = parser.parse_known_args()
 
-for _ in range(100):
-    time = start_time + timedelta(minutes=random.randint(0, 14400))  # Spread over 10 days
-    unix_time = int(time.timestamp())
-    timestamp_str = f"{time.strftime('%Y-%m-%d_%H%M:%S')} [{unix_time}]"
+# Step 1: Generate fake data
+if args.rows:
+    df = ActivityGenerator(args.seed).frame(args.rows)
+else:
+    if Faker is None:
+        parser.error("the sample data needs the faker package (pip install faker), or pass --rows")
+    fake = Faker()
+    data = []
+
+    start_time = datetime.now() - timedelta(days=10)
+
+    for _ in range(100):
+        time = start_time + timedelta(minutes=random.randint(0, 14400))  # Spread over 10 days
+        unix_time = int(time.timestamp())
+        timestamp_str = f"{time.strftime('%Y-%m-%d_%H%M:%S')} [{unix_time}]"
     
-    data.append({
-        "Timestamp": timestamp_str,
-        "datetime": time,
-        "log": fake.sentence(),
-        "score": round(random.uniform(0, 100), 2),
-        "reference": fake.uuid4(),
-        "tags": [fake.word() for _ in range(random.randint(1, 3))]
-    })
-
-df = pd.DataFrame(data)
+        data.append({
+            "Timestamp": timestamp_str,
+            "datetime": time,
+            "log": fake.sentence(),
+            "score": round(random.uniform(0, 100), 2),
+            "reference": fake.uuid4(),
+            "tags": [fake.word() for _ in range(random.randint(1, 3))]
+        })
+
+    df = pd.DataFrame(data)
+
 df = df.sort_values(by="datetime")
 
 # Preprocess tags for filter UI
 df["tag_str"] = df["tags"].apply(lambda x: ", ".join(x))
 
+# Embed a downsampled sample instead of every row (LTTB + per-bucket min/max): POINT_BUDGET
+# points for the whole series, and each tag's own series sharing the rest of EMBED_LIMIT rows
+embedded, series = view_rows(df, POINT_BUDGET, limit=EMBED_LIMIT)
+plot_df = df.iloc[embedded]
+
 # Create the figure
 fig = px.scatter(
-    df,
+    downsample(df, POINT_BUDGET),
     x="datetime",
     y="score",
     hover_data={
@@ -76,7 +102,9 @@ custom_html = f"""
 <div id="controls">
     <label for="tagFilter">Filter by Tags:</label>
     <select id="tagFilter" multiple style="width:300px;height:100px;"></select>
-    <button onclick="downloadCSV()">Download CSV</button>
+    <button onclick="downloadCSV()">Download plotted points (CSV)</button>
+    <p>The page embeds a downsampled sample of {len(plot_df):,} of {len(df):,} records; the chart and the
+       CSV download show the sampled points, not every record.</p>
 </div>
 
 <div id="chart"></div>
@@ -87,70 +115,63 @@ custom_html = f"""
 </div>
 
 <script>
-    const data = {df.to_json(orient="records", date_format="iso")};
-
-    // Extract unique tags
-    const uniqueTags = new Set();
-    data.forEach(d => d.tags.forEach(t => uniqueTags.add(t)));
+{DECODE_JS}
+    // Columnar payload: typed arrays for times and scores, string tables for logs and tags
+    const cols = decodeColumns({payload_json(plot_df)});
+    const seriesRows = {json.dumps(series.tolist())};  // the whole-series points among the embedded rows
+    let shownRows = seriesRows;
 
     // Populate tag filter
     const tagFilter = document.getElementById("tagFilter");
-    [...uniqueTags].sort().forEach(tag => {{
+    cols.tagValues.map((tag, code) => [tag, code]).sort((p, q) => p[0] < q[0] ? -1 : p[0] > q[0] ? 1 : 0).forEach(([tag, code]) => {{
         const opt = document.createElement("option");
-        opt.value = tag;
+        opt.value = code;  // the tag's code in the tag index
         opt.textContent = tag;
         tagFilter.appendChild(opt);
     }});
 
-    // Draw plot
-    const trace = {{
-        x: data.map(d => d.datetime),
-        y: data.map(d => d.score),
-        mode: "markers+lines",
-        type: "scatter",
-        text: data.map(d => d.Timestamp),
-        customdata: data.map(d => [d.log, d.tags.join(", ")]),
-        hovertemplate: "<b>%{{text}}</b><br>Score: %{{y}}<br>Tags: %{{customdata[1]}}<extra></extra>"
-    }};
+    // One trace for the given rows; customdata carries the row, for the log viewer
+    function traceFor(rows) {{
+        return {{
+            x: rows.map(i => cols.time[i]),
+            y: rows.map(i => cols.score[i]),
+            mode: "markers+lines",
+            type: "scatter",
+            text: rows.map(i => cols.timestamp(i)),
+            customdata: rows.map(i => [i, cols.tags(i).join(", ")]),
+            hovertemplate: "<b>%{{text}}</b><br>Score: %{{y:.2f}}<br>Tags: %{{customdata[1]}}<extra></extra>"
+        }};
+    }}
 
     const layout = {{
         title: "Score Time Series",
-        xaxis: {{ title: "Time" }},
+        xaxis: {{ title: "Time", type: "date" }},
         yaxis: {{ title: "Score" }},
         hovermode: "closest"
     }};
 
-    Plotly.newPlot("chart", [trace], layout);
+    Plotly.newPlot("chart", [traceFor(shownRows)], layout);
 
     // Add log viewer interaction
     document.getElementById("chart").on("plotly_click", function(data) {{
         const point = data.points[0];
-        const log = point.customdata[0];
-        document.getElementById("logContent").innerText = log;
+        document.getElementById("logContent").innerText = cols.log(point.customdata[0]);
     }});
 
-    // Add tag filter functionality
+    // Add tag filter functionality: OR of the selected tags' precomputed row bitmaps
     tagFilter.addEventListener("change", () => {{
-        const selected = Array.from(tagFilter.selectedOptions).map(opt => opt.value);
-        const filtered = data.filter(d => selected.length === 0 || d.tags.some(t => selected.includes(t)));
-
-        Plotly.react("chart", [{{
-            x: filtered.map(d => d.datetime),
-            y: filtered.map(d => d.score),
-            mode: "markers+lines",
-            type: "scatter",
-            text: filtered.map(d => d.Timestamp),
-            customdata: filtered.map(d => [d.log, d.tags.join(", ")]),
-            hovertemplate: "<b>%{{text}}</b><br>Score: %{{y}}<br>Tags: %{{customdata[1]}}<extra></extra>"
-        }}], layout);
+        const selected = Array.from(tagFilter.selectedOptions).map(opt => Number(opt.value));
+        shownRows = selected.length === 0 ? seriesRows : cols.rowsWithTags(selected);
+        Plotly.react("chart", [traceFor(shownRows)], layout);
     }});
 
-    // Add download CSV functionality
+    // Add download CSV functionality: the plotted points only, as the full data is not embedded
     function downloadCSV() {{
-        const headers = Object.keys(data[0]);
-        const csv = [headers.join(",")].concat(
-            data.map(row => headers.map(h => JSON.stringify(row[h] || "")).join(","))
-        ).join("\\n");
+        const headers = ["Timestamp", "datetime", "log", "score", "reference", "tags"];
+        const csv = [headers.join(",")].concat(shownRows.map(i => [
+            cols.timestamp(i), new Date(cols.time[i]).toISOString(), cols.log(i),
+            Math.round(cols.score[i] * 100) / 100, cols.reference(i), cols.tags(i).join(", ")
+        ].map(v => JSON.stringify(v)).join(","))).join("\\n");
 
         const blob = new Blob([csv], {{type: "text/csv"}});
         const link = document.createElement("a");
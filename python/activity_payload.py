@@ -0,0 +1,223 @@
+"""
+Compact columnar payload of activity records for the HTML dashboard, instead of
+df.to_json(orient="records") which repeats every key per row, stores the time twice and the
+tags twice.
+
+    time       Float64Array  epoch milliseconds of "datetime" (wall clock, as drawn)
+    unix       Float64Array  the "[unix]" part of "Timestamp"; the text is rebuilt from both
+    score      Float32Array
+    log        string table (each distinct sentence once) + Uint8/16/32 codes
+    reference  16 raw bytes per UUID (a string table if any reference is not a UUID)
+    tags       tag table + Uint32 offsets (rows + 1) + codes, one code per tag of each row
+    tag_index  the reverse, tag -> rows, as bitmaps for common tags and row lists for rare
+               ones, so the tag filter is an OR of a few bitmaps instead of a scan of all rows
+
+Numbers are little-endian typed arrays in base64, so the page decodes them with one atob
+and a typed-array view instead of parsing JSON per row (DECODE_JS). A Timestamp column that
+is not "YYYY-MM-DD_hhmm:ss [unix]" of datetime is kept as a string table instead.
+
+Benchmark: python activity_payload.py --n 1000000
+"""
+import argparse
+import base64
+import json
+import time
+import uuid
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+
+UUID_PATTERN = r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}"  # lowercase, as rebuilt
+
+def _b64(values: np.ndarray) -> str:
+    return base64.b64encode(np.ascontiguousarray(values).tobytes()).decode("ascii")
+
+def _code_dtype(size: int):
+    return "<u1" if size <= 1 << 8 else "<u2" if size <= 1 << 16 else "<u4"
+
+def _strings(values) -> dict:
+    """Dictionary-encoded strings: each distinct value once, plus a code per row."""
+    codes, uniques = pd.factorize(pd.Series(values, dtype=object))
+    return {"values": uniques.tolist(), "codes": _b64(codes.astype(_code_dtype(len(uniques)))),
+            "type": _code_dtype(len(uniques))}
+
+def _wall_text(times: np.ndarray) -> np.ndarray:
+    """ "YYYY-MM-DD_hhmm:ss" of datetime64 values, rearranged from ISO text without strftime."""
+    iso = np.datetime_as_string(times.astype("datetime64[s]"), unit="s").astype("S19")
+    chars = iso.view(np.uint8).reshape(-1, 19)[:, [0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 14, 15, 16, 17, 18]]
+    chars[:, 10], chars[:, 15] = ord("_"), ord(":")
+    return np.ascontiguousarray(chars).view("S18").ravel().astype(str).astype(object)
+
+def encode_columns(df: pd.DataFrame) -> dict:
+    """The dashboard columns of df as a JSON-ready dict of base64 typed arrays."""
+    times = df["datetime"].to_numpy().astype("datetime64[ms]")
+    payload = {"rows": len(df), "time": _b64(times.astype("<f8")), "score": _b64(df["score"].to_numpy().astype("<f4"))}
+
+    stamps = df["Timestamp"].astype(str)
+    unix = stamps.str.extract(r"\[(-?\d+)\]$")[0]
+    if unix.notna().all() and (_wall_text(times) + " [" + unix.to_numpy() + "]" == stamps.to_numpy()).all():
+        payload["unix"] = _b64(unix.astype(np.int64).to_numpy().astype("<f8"))  # exact to 2^53, no 2038 wrap
+    else:
+        payload["timestamp"] = _strings(stamps.tolist())
+
+    payload["log"] = _strings(df["log"].tolist())
+    references = df["reference"].astype(str)
+    if references.str.fullmatch(UUID_PATTERN).all():
+        payload["reference"] = base64.b64encode(bytes.fromhex("".join(references).replace("-", ""))).decode("ascii")
+    else:
+        payload["reference_text"] = _strings(references.tolist())
+
+    counts = df["tags"].str.len().to_numpy()
+    codes, tag_values = pd.factorize(pd.Series(list(chain.from_iterable(df["tags"])), dtype=object))
+    payload["tags"] = {
+        "values": tag_values.tolist(),
+        "offsets": _b64(np.concatenate([[0], np.cumsum(counts)]).astype("<u4")),
+        "codes": _b64(codes.astype(_code_dtype(len(tag_values)))),
+        "type": _code_dtype(len(tag_values)),
+    }
+    payload["tag_index"] = tag_index(codes, counts, len(tag_values))
+    return payload
+
+def tag_index(codes: np.ndarray, counts: np.ndarray, tags: int) -> dict:
+    """
+    Tag -> rows index for the tag filter, from the flat tag codes of the rows. A tag on more
+    than one row in 32 gets a bitmap (one bit per row, Uint32 words); rarer tags get their
+    sorted row numbers (Uint32, CSR by tag), which is smaller for them.
+    """
+    rows = len(counts)
+    owners = np.repeat(np.arange(rows, dtype=np.int64), counts)
+    pairs = np.unique(codes.astype(np.int64) * max(rows, 1) + owners)  # by tag, then row; repeats dropped
+    pair_tags, pair_rows = np.divmod(pairs, max(rows, 1))
+    per_tag = np.bincount(pair_tags, minlength=tags)
+    dense = np.flatnonzero(per_tag * 32 > rows)
+    starts = np.concatenate([[0], np.cumsum(per_tag)])
+    bitmaps = []
+    for tag in dense:
+        bits = np.zeros((rows + 31) // 32 * 32, dtype=bool)
+        bits[pair_rows[starts[tag]:starts[tag + 1]]] = True
+        bitmaps.append(np.packbits(bits, bitorder="little"))  # little-endian bit order = Uint32 words
+    sparse = ~np.isin(pair_tags, dense)
+    return {
+        "dense": dense.tolist(),
+        "bitmaps": _b64(np.concatenate(bitmaps) if bitmaps else np.zeros(0, np.uint8)),
+        "offsets": _b64(np.concatenate([[0], np.cumsum(np.bincount(pair_tags[sparse], minlength=tags))]).astype("<u4")),
+        "rows": _b64(pair_rows[sparse].astype("<u4")),
+    }
+
+def payload_json(df: pd.DataFrame) -> str:
+    # "</" would end the <script> element the payload is embedded in
+    return json.dumps(encode_columns(df), separators=(",", ":")).replace("</", "<\\/")
+
+# Client side: decodeColumns(payload) -> typed arrays plus timestamp(i), log(i), tags(i),
+# reference(i) accessors.
+DECODE_JS = r"""
+    function b64(text, Type) {
+        const bin = atob(text);
+        const bytes = new Uint8Array(bin.length);
+        for (let i = 0; i < bin.length; i++) bytes[i] = bin.charCodeAt(i);
+        return new Type(bytes.buffer);
+    }
+    const CODE_TYPES = {"<u1": Uint8Array, "<u2": Uint16Array, "<u4": Uint32Array};
+    const pad = (n, w) => String(n).padStart(w, "0");
+
+    function decodeColumns(p) {
+        const cols = {
+            rows: p.rows,
+            time: b64(p.time, Float64Array),
+            score: b64(p.score, Float32Array),
+            logValues: p.log.values,
+            logCodes: b64(p.log.codes, CODE_TYPES[p.log.type]),
+            tagValues: p.tags.values,
+            tagOffsets: b64(p.tags.offsets, Uint32Array),
+            tagCodes: b64(p.tags.codes, CODE_TYPES[p.tags.type]),
+        };
+        if (p.unix) {
+            const unix = b64(p.unix, Float64Array);
+            cols.timestamp = i => {
+                const d = new Date(cols.time[i]);
+                return `${d.getUTCFullYear()}-${pad(d.getUTCMonth() + 1, 2)}-${pad(d.getUTCDate(), 2)}_` +
+                       `${pad(d.getUTCHours(), 2)}${pad(d.getUTCMinutes(), 2)}:${pad(d.getUTCSeconds(), 2)} [${unix[i]}]`;
+            };
+        } else {
+            const codes = b64(p.timestamp.codes, CODE_TYPES[p.timestamp.type]);
+            cols.timestamp = i => p.timestamp.values[codes[i]];
+        }
+        cols.log = i => cols.logValues[cols.logCodes[i]];
+        cols.tags = i => Array.from(cols.tagCodes.subarray(cols.tagOffsets[i], cols.tagOffsets[i + 1]),
+                                    c => cols.tagValues[c]);
+        if (p.reference) {
+            const references = b64(p.reference, Uint8Array);
+            cols.reference = i => {
+                const hex = Array.from(references.subarray(16 * i, 16 * i + 16), b => pad(b.toString(16), 2)).join("");
+                return `${hex.slice(0, 8)}-${hex.slice(8, 12)}-${hex.slice(12, 16)}-${hex.slice(16, 20)}-${hex.slice(20)}`;
+            };
+        } else {
+            const codes = b64(p.reference_text.codes, CODE_TYPES[p.reference_text.type]);
+            cols.reference = i => p.reference_text.values[codes[i]];
+        }
+        const index = p.tag_index;
+        const words = Math.ceil(p.rows / 32);
+        const bitmaps = b64(index.bitmaps, Uint32Array);
+        const denseSlot = new Map(index.dense.map((tag, k) => [tag, k]));
+        const indexOffsets = b64(index.offsets, Uint32Array);
+        const indexRows = b64(index.rows, Uint32Array);
+        // Rows carrying any of the tag codes, in row order: OR of the tags' bitmaps, then one
+        // pass over the set bits.
+        cols.rowsWithTags = tagCodes => {
+            const bits = new Uint32Array(words);
+            for (const tag of tagCodes) {
+                const k = denseSlot.get(tag);
+                if (k !== undefined) {
+                    const bitmap = bitmaps.subarray(k * words, (k + 1) * words);
+                    for (let w = 0; w < words; w++) bits[w] |= bitmap[w];
+                } else {
+                    for (let j = indexOffsets[tag]; j < indexOffsets[tag + 1]; j++) {
+                        const row = indexRows[j];
+                        bits[row >>> 5] |= 1 << (row & 31);
+                    }
+                }
+            }
+            const rows = [];
+            for (let w = 0; w < words; w++) {
+                for (let v = bits[w]; v !== 0; ) {
+                    const low = v & -v;
+                    rows.push(w * 32 + 31 - Math.clz32(low));
+                    v ^= low;
+                }
+            }
+            return rows;
+        };
+        return cols;
+    }
+"""
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the columnar payload with df.to_json on random records")
+    parser.add_argument("--n", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    words = np.array([f"word{i}" for i in range(500)])
+    sentences = np.array([" ".join(rng.choice(words, 6)).capitalize() + "." for _ in range(2000)])
+    unix = np.sort(rng.integers(1_700_000_000, 1_700_000_000 + 10 * 86400, args.n))
+    wall = (unix + 7200).astype("datetime64[s]")
+    df = pd.DataFrame({
+        "Timestamp": pd.Series(wall).dt.strftime("%Y-%m-%d_%H%M:%S") + " [" + pd.Series(unix).astype(str) + "]",
+        "datetime": wall,
+        "log": sentences[rng.integers(0, len(sentences), args.n)],
+        "score": np.round(rng.uniform(0, 100, args.n), 2),
+        "reference": [str(uuid.UUID(bytes=rng.bytes(16))) for _ in range(args.n)],
+        "tags": [list(words[rng.integers(0, len(words), k)]) for k in rng.integers(1, 4, args.n)],
+    })
+    df["tag_str"] = df["tags"].apply(lambda x: ", ".join(x))
+
+    t0 = time.perf_counter()
+    records = df.to_json(orient="records", date_format="iso")
+    t1 = time.perf_counter()
+    columnar = payload_json(df)
+    t2 = time.perf_counter()
+    print(f"to_json records: {len(records) / 2**20:,.1f} MiB in {t1 - t0:.2f}s")
+    print(f"columnar:        {len(columnar) / 2**20:,.1f} MiB in {t2 - t1:.2f}s "
+          f"({len(records) / len(columnar):.1f}x smaller)")
@@ -0,0 +1,356 @@
+"""
+Serve mode for the activity dashboard: instead of a static page with every record embedded,
+a local HTTP server holds the records in memory, sorted by time, and the page asks it for
+the visible time range only, each time the chart is zoomed or panned.
+
+    GET /                  the dashboard page
+    GET /api/tags          tag names and record counts (a tag's code is its position)
+    GET /api/range?start=&end=&width=&tags=
+                           records with start <= time <= end (epoch ms) carrying any of the tag
+                           codes, aggregated to `width` buckets (one per pixel): time, count,
+                           min, max, mean per non-empty bucket; when no more records than
+                           buckets are visible, the records themselves
+    GET /api/record?row=   one record, for the log viewer
+    GET /api/csv?start=&end=&tags=
+                           the selected records as CSV, streamed in blocks
+
+A range query is two binary searches in the time column (one per selected tag, in that tag's
+own time-sorted rows) plus a bucketed reduce, so its cost follows the visible records, not
+the whole history, and the response size follows the chart width.
+
+Usage: python activity_serve.py activity.csv          (.ndjson/.jsonl or .parquet too)
+       python activity_serve.py --rows 10000000 --seed 7
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import chain
+from typing import Optional, Sequence
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from activity_generator import ActivityGenerator
+
+MAX_WIDTH = 10_000     # buckets per query, whatever the client asks for
+CSV_ROWS = 100_000     # records per CSV write
+
+def load_records(path: str) -> pd.DataFrame:
+    """Activity records from a CSV, NDJSON or Parquet file as written by activity_generator.py."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".csv":
+        df = pd.read_csv(path, keep_default_na=False)
+        df["tags"] = df["tags"].str.split(", ")
+    elif ext in (".ndjson", ".jsonl"):
+        df = pd.read_json(path, lines=True, convert_dates=False)
+    elif ext == ".parquet":
+        df = pd.read_parquet(path)
+        df["tags"] = df["tags"].apply(list)
+    else:
+        raise ValueError(f"unknown file type {ext!r}; expected .csv, .ndjson/.jsonl or .parquet")
+    df["datetime"] = pd.to_datetime(df["datetime"])
+    return df
+
+class ActivityIndex:
+    """Records sorted by time, with the time column and a tag -> rows index for range queries."""
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df.sort_values(by="datetime", kind="stable").reset_index(drop=True)
+        self.times = self.df["datetime"].to_numpy().astype("datetime64[ms]").astype(np.int64)
+        self.scores = self.df["score"].to_numpy().astype(np.float64)
+
+        counts = self.df["tags"].str.len().to_numpy()
+        owners = np.repeat(np.arange(len(self.df), dtype=np.int64), counts)
+        codes, tag_values = pd.factorize(pd.Series(list(chain.from_iterable(self.df["tags"])), dtype=object))
+        self.tag_values = tag_values.tolist()
+        # Rows of tag 0, then tag 1, ... each in row (= time) order, a tag repeated on a row once
+        pairs = np.unique(codes.astype(np.int64) * max(len(self.df), 1) + owners)
+        pair_tags, self.tag_rows = np.divmod(pairs, max(len(self.df), 1))
+        per_tag = np.bincount(pair_tags, minlength=len(self.tag_values))
+        self.tag_starts = np.concatenate([[0], np.cumsum(per_tag)])
+        self.tag_times = self.times[self.tag_rows]
+
+    def __len__(self):
+        return len(self.df)
+
+    def tags(self) -> dict:
+        return {"values": self.tag_values, "counts": np.diff(self.tag_starts).tolist()}
+
+    def rows(self, start: int, end: int, tags: Optional[Sequence[int]] = None):
+        """Positions of the records with start <= time <= end (and any of the tags), in time order."""
+        if not tags:
+            return np.arange(np.searchsorted(self.times, start, side="left"), np.searchsorted(self.times, end, side="right"))
+        parts = []
+        for tag in tags:
+            if not 0 <= tag < len(self.tag_values):
+                raise ValueError(f"unknown tag code {tag}")
+            first, last = self.tag_starts[tag], self.tag_starts[tag + 1]
+            times = self.tag_times[first:last]
+            lo, hi = np.searchsorted(times, start, side="left"), np.searchsorted(times, end, side="right")
+            parts.append(self.tag_rows[first + lo:first + hi])
+        return parts[0] if len(parts) == 1 else np.unique(np.concatenate(parts))
+
+    def query(self, start: int, end: int, width: int, tags: Optional[Sequence[int]] = None) -> dict:
+        """The chart data of a time range: the records if they fit in `width` points, otherwise buckets."""
+        width = min(max(int(width), 1), MAX_WIDTH)
+        rows = self.rows(start, end, tags)
+        times, scores = self.times[rows], self.scores[rows]
+        result = {"start": start, "end": end, "total": len(rows)}
+        if len(rows) <= width:
+            result.update(mode="records", row=rows.tolist(), time=times.tolist(), score=scores.tolist())
+            return result
+        # Rows are in time order, so each bucket is a contiguous run of them
+        span = max(end - start, 1)
+        bucket = np.minimum((times - start) * width // span, width - 1)
+        edges = np.flatnonzero(np.concatenate([[True], bucket[1:] != bucket[:-1]]))
+        count = np.diff(np.append(edges, len(rows)))
+        result.update(
+            mode="buckets",
+            time=(start + (bucket[edges] + 0.5) * span / width).round().astype(np.int64).tolist(),
+            count=count.tolist(),
+            min=np.minimum.reduceat(scores, edges).tolist(),
+            max=np.maximum.reduceat(scores, edges).tolist(),
+            mean=np.round(np.add.reduceat(scores, edges) / count, 4).tolist(),
+        )
+        return result
+
+    def record(self, row: int) -> dict:
+        if not 0 <= row < len(self.df):
+            raise ValueError(f"row {row} out of range")
+        r = self.df.iloc[row]
+        return {"row": row, "Timestamp": str(r["Timestamp"]), "datetime": r["datetime"].isoformat(),
+                "log": r["log"], "score": float(r["score"]), "reference": str(r["reference"]), "tags": list(r["tags"])}
+
+    def csv_blocks(self, rows: np.ndarray):
+        """The records at rows as CSV text, in blocks of CSV_ROWS records (header first)."""
+        columns = ["Timestamp", "datetime", "log", "score", "reference", "tags"]
+        for i in range(0, max(len(rows), 1), CSV_ROWS):
+            part = self.df.iloc[rows[i:i + CSV_ROWS]][columns].copy()
+            part["tags"] = part["tags"].apply(", ".join)
+            yield part.to_csv(index=False, header=i == 0)
+
+def _params(query: str):
+    params = {key: values[-1] for key, values in parse_qs(query).items()}
+    tags = [int(t) for t in params.get("tags", "").split(",") if t != ""]
+    return params, tags
+
+def serve(index: ActivityIndex, host: str = "127.0.0.1", port: int = 8050) -> ThreadingHTTPServer:
+    """Start a background HTTP server for the dashboard; call .shutdown() to stop it."""
+    full_range = (int(index.times[0]), int(index.times[-1])) if len(index) else (0, 0)
+
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, body: bytes, content_type: str):
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _json(self, data: dict):
+            self._send(json.dumps(data, separators=(",", ":")).encode("utf-8"), "application/json")
+
+        def do_GET(self):
+            url = urlsplit(self.path)
+            try:
+                params, tags = _params(url.query)
+                start = int(params.get("start", full_range[0]))
+                end = int(params.get("end", full_range[1]))
+                if url.path == "/":
+                    self._send(PAGE.encode("utf-8"), "text/html; charset=utf-8")
+                elif url.path == "/api/tags":
+                    self._json(index.tags())
+                elif url.path == "/api/range":
+                    self._json(index.query(start, end, int(params.get("width", 1000)), tags))
+                elif url.path == "/api/record":
+                    self._json(index.record(int(params["row"])))
+                elif url.path == "/api/csv":
+                    rows = index.rows(start, end, tags)
+                    # Streamed block by block with no Content-Length (HTTP/1.0: the response
+                    # ends when the connection closes), so at most one block is in memory
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/csv; charset=utf-8")
+                    self.send_header("Content-Disposition", 'attachment; filename="score_data.csv"')
+                    self.end_headers()
+                    for block in index.csv_blocks(rows):
+                        self.wfile.write(block.encode("utf-8"))
+                else:
+                    self.send_error(404)
+            except (KeyError, ValueError) as exc:
+                self.send_error(400, str(exc))
+
+        def log_message(self, format, *args):
+            pass  # every zoom and pan is a request
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+# The page: the chart asks /api/range for the visible range at its own pixel width after every
+# zoom, pan or tag change. Buckets are drawn as a min-max band around the mean; records as
+# points that open their log on click.
+PAGE = r"""<html>
+<head>
+    <title>Score Time Series</title>
+    <script src="https://cdn.plot.ly/plotly-latest.min.js"></script>
+    <style>
+        body { font-family: Arial; margin: 40px; }
+        #controls { margin-bottom: 20px; }
+        #logViewer { border: 1px solid #ccc; padding: 10px; margin-top: 20px; }
+        label { font-weight: bold; }
+    </style>
+</head>
+<body>
+
+<h2>Score Time Series with Logs and Filters</h2>
+
+<div id="controls">
+    <label for="tagFilter">Filter by Tags:</label>
+    <select id="tagFilter" multiple style="width:300px;height:100px;"></select>
+    <button onclick="downloadCSV()">Download CSV</button>
+    <span id="status"></span>
+</div>
+
+<div id="chart"></div>
+
+<div id="logViewer">
+    <h3>Log Viewer</h3>
+    <p id="logContent">Click on a point to view the log message.</p>
+</div>
+
+<script>
+    const chart = document.getElementById("chart");
+    const tagFilter = document.getElementById("tagFilter");
+    let view = null;        // [start, end] in epoch ms; null for the whole history
+    let pending = null;     // AbortController of the request in flight
+
+    const layout = {
+        title: "Score Time Series",
+        xaxis: { title: "Time", type: "date" },
+        yaxis: { title: "Score" },
+        hovermode: "closest",
+        uirevision: "keep"
+    };
+
+    // Plotly reports ranges as "YYYY-MM-DD hh:mm:ss.sss" (UTC, possibly shortened) or numbers
+    function toMs(value) {
+        if (typeof value === "number") return value;
+        const m = String(value).match(/^(\d+)-(\d+)-(\d+)(?:[ T](\d+)(?::(\d+)(?::(\d+(?:\.\d*)?))?)?)?/);
+        return Date.UTC(+m[1], m[2] - 1, +m[3], +(m[4] || 0), +(m[5] || 0)) + Math.round(1000 * (+(m[6] || 0)));
+    }
+
+    function selectedTags() {
+        return Array.from(tagFilter.selectedOptions).map(opt => opt.value).join(",");
+    }
+
+    function query(path, extra) {
+        const params = new URLSearchParams(extra);
+        if (view) { params.set("start", Math.floor(view[0])); params.set("end", Math.ceil(view[1])); }
+        if (selectedTags()) params.set("tags", selectedTags());
+        return `${path}?${params}`;
+    }
+
+    function traces(data) {
+        if (data.mode === "records") {
+            return [{
+                x: data.time, y: data.score, customdata: data.row,
+                mode: "markers+lines", type: "scatter", name: "score",
+                hovertemplate: "Score: %{y:.2f}<br>%{x}<extra></extra>"
+            }];
+        }
+        const hover = data.count.map((n, i) => [n, data.min[i], data.max[i]]);
+        return [
+            { x: data.time, y: data.min, mode: "lines", line: { width: 0 }, hoverinfo: "skip", showlegend: false },
+            { x: data.time, y: data.max, mode: "lines", line: { width: 0 }, fill: "tonexty",
+              fillcolor: "rgba(99, 110, 250, 0.25)", hoverinfo: "skip", name: "min - max" },
+            { x: data.time, y: data.mean, customdata: hover, mode: "lines", type: "scatter", name: "mean",
+              hovertemplate: "Mean: %{y:.2f} of %{customdata[0]} records<br>" +
+                             "Min %{customdata[1]:.2f}, max %{customdata[2]:.2f}<extra></extra>" }
+        ];
+    }
+
+    async function refresh() {
+        if (pending) pending.abort();
+        pending = new AbortController();
+        const width = Math.max(chart.clientWidth - 160, 100);  // plot area, about a bucket per pixel
+        let data;
+        try {
+            data = await (await fetch(query("/api/range", { width }), { signal: pending.signal })).json();
+        } catch (err) {
+            if (err.name === "AbortError") return;  // superseded by a newer zoom
+            throw err;
+        }
+        document.getElementById("status").innerText = data.mode === "records" ?
+            `${data.total.toLocaleString()} records` :
+            `${data.total.toLocaleString()} records in ${data.time.length.toLocaleString()} buckets; zoom in for single records`;
+        const next = Object.assign({}, layout, {
+            xaxis: Object.assign({}, layout.xaxis, view ? { range: view, autorange: false } : { autorange: true })
+        });
+        Plotly.react(chart, traces(data), next);
+    }
+
+    fetch("/api/tags").then(r => r.json()).then(tags => {
+        tags.values.map((tag, code) => [tag, code]).sort((p, q) => p[0] < q[0] ? -1 : p[0] > q[0] ? 1 : 0).forEach(([tag, code]) => {
+            const opt = document.createElement("option");
+            opt.value = code;
+            opt.textContent = `${tag} (${tags.counts[code]})`;
+            tagFilter.appendChild(opt);
+        });
+    });
+
+    Plotly.newPlot(chart, [], layout).then(() => {
+        refresh();
+        chart.on("plotly_relayout", event => {
+            if (event["xaxis.autorange"]) view = null;
+            else if (event["xaxis.range[0]"] !== undefined) view = [toMs(event["xaxis.range[0]"]), toMs(event["xaxis.range[1]"])];
+            else if (event["xaxis.range"]) view = event["xaxis.range"].map(toMs);
+            else return;  // not an x-axis change
+            refresh();
+        });
+        chart.on("plotly_click", data => {
+            const row = data.points[0].customdata;
+            if (typeof row !== "number") return;  // a bucket, not a record
+            fetch(`/api/record?row=${row}`).then(r => r.json()).then(rec => {
+                document.getElementById("logContent").innerText =
+                    `${rec.Timestamp}  score ${rec.score}  [${rec.tags.join(", ")}]\n${rec.log}\n${rec.reference}`;
+            });
+        });
+    });
+    tagFilter.addEventListener("change", refresh);
+
+    // The visible range and tag filter as CSV, written by the server
+    function downloadCSV() {
+        const link = document.createElement("a");
+        link.href = query("/api/csv", {});
+        link.download = "score_data.csv";
+        link.click();
+    }
+</script>
+
+</body>
+</html>
+"""
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the activity dashboard with on-demand time-range queries")
+    parser.add_argument("records", nargs="?", help="*.csv, *.ndjson/*.jsonl or *.parquet from activity_generator.py")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="without a file: generate this many records")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8050)
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    df = load_records(args.records) if args.records else ActivityGenerator(args.seed).frame(args.rows)
+    index = ActivityIndex(df)
+    print(f"Indexed {len(index):,} records and {len(index.tag_values):,} tags in {time.perf_counter() - t0:.1f}s")
+    server = serve(index, args.host, args.port)
+    print(f"Serving http://{args.host}:{args.port}/ ; Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
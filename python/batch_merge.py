@@ -0,0 +1,40 @@
+"""
+Streaming k-way merge of sorted batches parsed in a worker pool, shared by
+logging/log_ingest.py (journal entries) and incident_tracking/trace_ingest.py (trace events).
+"""
+import heapq
+from collections import deque
+
+def merge_batches(pool, parse, tasks, starts, unpack, ahead: int):
+    """
+    k-way merge of the sorted batches of tasks, streamed: tasks are parsed in order of their
+    start (a lower bound of their first key; None skips a task with nothing in it), at most
+    `ahead` at a time, and a batch is only waited for and merged in once the merge reaches
+    its start. unpack(batch) iterates a batch's items. Only the batches overlapping the merge
+    point are held at once. Items are ordered by item[0], ties by task, then batch order.
+    """
+    order = sorted((start, i) for i, start in enumerate(starts) if start is not None)
+    running = deque()
+    submitted = loaded = 0
+    heap = []
+    while True:
+        while submitted < len(order) and submitted - loaded < ahead:
+            running.append(pool.submit(parse, tasks[order[submitted][1]]))
+            submitted += 1
+        if loaded < len(order) and (not heap or order[loaded][0] <= heap[0][0]):
+            task = order[loaded][1]
+            items = iter(unpack(running.popleft().result()))
+            loaded += 1
+            first = next(items, None)
+            if first is not None:
+                heapq.heappush(heap, (first[0], task, first, items))
+            continue
+        if not heap:
+            return
+        _, task, item, items = heap[0]
+        yield item
+        following = next(items, None)
+        if following is None:
+            heapq.heappop(heap)
+        else:
+            heapq.heapreplace(heap, (following[0], task, following, items))
@@ -0,0 +1,148 @@
+"""
+Rule-table breadcrumb classifier.
+
+A rule table is an ordered list of (label, patterns). A message gets the label of the first
+rule with a pattern it contains (case-insensitive substring), or the default label when no
+rule matches, the same first-match-wins order as an if/elif chain.
+
+Each rule's patterns are compiled once into one alternation. A whole Message column is
+classified with one regex scan per rule over its distinct values joined together, instead
+of a Python call per row, and repeated messages cost nothing extra.
+Rule files are JSON, for example:
+
+    {
+        "default": "ℹ️ Info",
+        "rules": [
+            {"label": "🔴 Trigger", "contains": ["sell order"]},
+            {"label": "🟠 Risk Bypass", "contains": ["vwap", "100%"]},
+            {"label": "🔴 Data Anomaly", "regex": ["msft = 0\\.0\\d"]}
+        ]
+    }
+
+"regex" entries are matched as-is against each lowercased message.
+
+Usage: python breadcrumb_rules.py "Received market sell order" --rules my_rules.json
+"""
+import argparse
+import json
+import re
+from typing import List, NamedTuple, Tuple
+
+import numpy as np
+import pandas as pd
+
+class Rule(NamedTuple):
+    label: str
+    patterns: Tuple[str, ...]  # regex source, matched against the lowercased message
+
+def contains(label: str, *substrings: str) -> Rule:
+    return Rule(label, tuple(re.escape(s.lower()) for s in substrings))
+
+# The Flash Crash trail from failure_trace_reporting.py
+DEFAULT_RULES = [
+    contains("🔴 Trigger", "sell order"),
+    contains("🟠 Risk Bypass", "vwap", "100%"),
+    contains("🟡 Market Stress", "liquidity", "bid-ask"),
+    contains("🟠 Platform Stress", "latency"),
+    contains("🔴 Control Failure", "circuit-breaker"),
+    contains("🟡 Risk Acceleration", "var"),
+    contains("🔴 Data Anomaly", "msft = 0.01", "sanity bounds"),
+    contains("🔥 Final Failure", "dropping client sessions"),
+    contains("📣 Alerting", "alert"),
+]
+DEFAULT_LABEL = "ℹ️ Info"
+
+# A pattern that is only literal characters (as re.escape writes them), safe to search in the
+# joined messages; anything else is searched message by message.
+_LITERAL = re.compile(r"(?:\\[^0-9A-Za-z]|[^\\.^$*+?{}\[\]|()])*")
+
+class RuleTable:
+    def __init__(self, rules: List[Rule] = DEFAULT_RULES, default: str = DEFAULT_LABEL):
+        self.rules = list(rules)
+        self.default = default
+        self.labels = np.array([rule.label for rule in self.rules] + [default], dtype=object)
+        self._patterns = [re.compile("|".join(rule.patterns)) if rule.patterns else None for rule in self.rules]
+        self._literal = [all(_LITERAL.fullmatch(p) for p in rule.patterns) for rule in self.rules]
+
+    def first_rule(self, message: str) -> int:
+        """Index of the first matching rule, len(self.rules) for the default."""
+        if isinstance(message, str):
+            text = message.lower()
+            for i, pattern in enumerate(self._patterns):
+                if pattern is not None and pattern.search(text):
+                    return i
+        return len(self.rules)
+
+    def classify_one(self, message: str) -> str:
+        return self.labels[self.first_rule(message)]
+
+    def first_rules(self, messages: List[str]) -> np.ndarray:
+        """
+        first_rule for many messages at once. The lowercased messages are joined into one
+        newline-separated text and each substring rule runs over all of it in a single
+        finditer; match offsets are mapped back to messages with searchsorted. Rules with
+        other regex syntax (anchors, lookarounds, ...) could match differently across the
+        joined text, so they are searched message by message. Rules are applied last to first
+        so that the earliest matching rule is what remains.
+        """
+        lowered = [m.lower() if isinstance(m, str) else "" for m in messages]
+        result = np.full(len(lowered), len(self.rules), dtype=np.intp)
+        if not lowered:
+            return result
+        lengths = np.fromiter(map(len, lowered), dtype=np.int64, count=len(lowered))
+        starts = np.concatenate(([0], np.cumsum(lengths[:-1] + 1)))
+        text = "\n".join(lowered)
+        for i in reversed(range(len(self.rules))):
+            pattern = self._patterns[i]
+            if pattern is None:
+                continue
+            if not self._literal[i]:
+                hit = np.fromiter((pattern.search(t) is not None for t in lowered), dtype=bool, count=len(lowered))
+                result[hit] = i
+                continue
+            spans = np.array([m.span() for m in pattern.finditer(text)], dtype=np.int64).reshape(-1, 2)
+            owner = np.searchsorted(starts, spans[:, 0], side="right") - 1
+            if (spans[:, 1] > starts[owner] + lengths[owner]).any():
+                # a substring with a newline matched across the separator; check messages one by one instead
+                hit = np.fromiter((pattern.search(t) is not None for t in lowered), dtype=bool, count=len(lowered))
+                result[hit] = i
+            else:
+                result[owner] = i
+        return result
+
+    def classify(self, messages) -> pd.Series:
+        """Labels for a whole column (Series or list), aligned with its index."""
+        messages = messages if isinstance(messages, pd.Series) else pd.Series(messages)
+        codes, uniques = pd.factorize(messages)  # repeated messages are classified once; NaN gets -1
+        rule_ids = np.append(self.first_rules(uniques.tolist()), len(self.rules))
+        return pd.Series(self.labels[rule_ids[codes]], index=messages.index, name="Breadcrumb")
+
+def load_rules(path: str) -> RuleTable:
+    """Read a JSON rule file (see module docstring). Raises ValueError on a malformed rule."""
+    with open(path, encoding="utf-8") as f:
+        spec = json.load(f)
+    if isinstance(spec, list):
+        spec = {"rules": spec}
+    rules = []
+    for n, entry in enumerate(spec.get("rules", [])):
+        if "label" not in entry:
+            raise ValueError(f"{path}: rule {n} has no label")
+        patterns = [re.escape(s.lower()) for s in entry.get("contains", [])]
+        for source in entry.get("regex", []):
+            try:
+                re.compile(source)
+            except re.error as e:
+                raise ValueError(f"{path}: rule {n} ({entry['label']}): bad regex {source!r}: {e}") from None
+            patterns.append(f"(?:{source})")
+        rules.append(Rule(entry["label"], tuple(patterns)))
+    return RuleTable(rules, spec.get("default", DEFAULT_LABEL))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Classify log messages with a breadcrumb rule table")
+    parser.add_argument("messages", nargs="+")
+    parser.add_argument("--rules", help="JSON rule file (default: the built-in Flash Crash rules)")
+    args = parser.parse_args()
+
+    table = load_rules(args.rules) if args.rules else RuleTable()
+    for message, label in zip(args.messages, table.classify(args.messages)):
+        print(f"{label}\t{message}")
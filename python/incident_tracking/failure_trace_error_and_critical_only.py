@@ -1,39 +1,120 @@
 import re
 import pandas as pd
 
+from trace_events import parse_line  # the trace line format, shared with the cache and db paths
+from trace_cache import EventColumns
+from trace_db import query as query_db
+from trace_checkpoint import ResumableTrace
+from trace_io import open_trace
+
 # Define severity and breadcrumb mappings
 breadcrumb_map = {
     'ERROR': '🔴 Critical',
     'CRITICAL': '🔥 Failure',
 }
 
-# Regex to parse log lines
-log_pattern = re.compile(
-    r'^\[(?P<timestamp>[\d\-:\s,]+)\]\s(?P<level>\w+)\s+-\s+\[(?P<component>[^\]]+)\]\s(?P<message>.*)$'
-)
-
-def extract_critical_breadcrumbs(filepath):
-    critical_trail = []
-
-    with open(filepath, 'r') as f:
-        for line in f:
-            match = log_pattern.match(line)
-            if match:
-                data = match.groupdict()
-                level = data['level']
-                if level in breadcrumb_map:
-                    critical_trail.append({
-                        "Timestamp": data["timestamp"],
-                        "Component": data["component"],
-                        "Message": data["message"],
-                        "Breadcrumb": breadcrumb_map[level]
-                    })
-
-    return pd.DataFrame(critical_trail)
-
-# Example usage
-df_critical = extract_critical_breadcrumbs("system_trace.log")
-print(df_critical.to_string(index=False))
+CHUNK_SIZE = 4 * 1024 * 1024  # bytes per read in binary mode
+
+def severity_prefilter(levels):
+    """
+    Bytes regex for the "] LEVEL<space>" part of a trace line, restricted to levels. It starts
+    with a literal "]", so the regex engine can skip ahead with a fast literal search instead
+    of trying every position; candidate lines are confirmed by their position in the line.
+    """
+    alternation = b"|".join(re.escape(level.encode("ascii")) for level in sorted(levels))
+    return re.compile(rb"\]\s(?:" + alternation + rb")\s")
+
+def extract_critical_breadcrumbs(filepath, levels=None, cache=False, db=None, checkpoint=False):
+    """
+    With db (a trace_db.py database) the events are queried through its (level, time)
+    index instead of reading the trace; filepath then selects that trace's events, or
+    None for every trace in the database.
+
+    With cache=True the parsed events come from the trace's columnar cache (built on first
+    use): rows are picked by level code and only their messages are decoded.
+
+    Otherwise scan the trace in large binary chunks. Lines whose severity is not in levels (default: the
+    breadcrumb_map keys) are skipped by one regex search over the whole chunk, without being
+    decoded, split or matched; only the hits are parsed, by trace_events.parse_line like the
+    cache and db paths, so all three skip the same malformed lines (e.g. an invalid timestamp).
+
+    With checkpoint=True only the lines added since the last checkpointed call are scanned,
+    following the trace across rotation and truncation (see trace_checkpoint.py).
+    """
+    levels = set(levels or breadcrumb_map)
+    if db:
+        events = query_db(db, levels=sorted(levels), source=filepath)
+        events = events[events["Severity"].isin(levels)]  # the query also returns level aliases
+        return pd.DataFrame({
+            "Timestamp": events["TimestampText"].tolist(),
+            "Component": events["Component"].tolist(),
+            "Message": events["Message"].tolist(),
+            "Breadcrumb": [breadcrumb_map.get(level, level) for level in events["Severity"]],
+        })
+    if cache:
+        with EventColumns(filepath) as events:
+            rows = events.rows_with_level(levels)
+            return pd.DataFrame({
+                "Timestamp": events.timestamp(rows),
+                "Component": events.component_at(rows),
+                "Message": events.message(rows),
+                "Breadcrumb": [breadcrumb_map.get(level, level) for level in events.level_at(rows)],
+            })
+
+    prefilter = severity_prefilter(levels)
+    timestamps, components, messages, breadcrumbs = [], [], [], []
+
+    def scan(block):
+        last_line = -1
+        for hit in prefilter.finditer(block):
+            start = block.rfind(b"\n", 0, hit.start()) + 1
+            # The level field follows the first "]" of a line that starts with "[".
+            if start == last_line or block[start:start + 1] != b"[" or block.find(b"]", start) != hit.start():
+                continue
+            last_line = start
+            end = block.find(b"\n", hit.end())
+            line = block[start:end if end >= 0 else len(block)]
+            event = parse_line(line.decode("utf-8", errors="replace"))
+            if event is not None and event.level in levels:
+                timestamps.append(event.timestamp)
+                components.append(event.component)
+                messages.append(event.message)
+                breadcrumbs.append(breadcrumb_map.get(event.level, event.level))
+
+    def frame():
+        return pd.DataFrame({
+            "Timestamp": timestamps,
+            "Component": components,
+            "Message": messages,
+            "Breadcrumb": breadcrumbs,
+        })
+
+    if checkpoint:
+        # The checkpoint is written when the with block exits, after the frame is built.
+        with ResumableTrace(filepath) as trace:
+            for block in trace.blocks(CHUNK_SIZE):
+                scan(block)
+            return frame()
+
+    with open_trace(filepath) as f:  # plain, .gz, .zst, .bz2 or .xz
+        tail = b""
+        while True:
+            chunk = f.read(CHUNK_SIZE)
+            if not chunk:
+                scan(tail)  # last line without a trailing newline
+                break
+            cut = chunk.rfind(b"\n") + 1
+            if cut == 0:
+                tail += chunk
+                continue
+            scan(tail + chunk[:cut])
+            tail = chunk[cut:]
+    return frame()
+
+if __name__ == "__main__":
+    # Example usage
+    df_critical = extract_critical_breadcrumbs("system_trace.log")
+    print(df_critical.to_string(index=False))
 
 """
               Timestamp       Component                                                        Message Breadcrumb
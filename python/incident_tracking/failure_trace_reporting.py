@@ -1,6 +1,17 @@
+import argparse
+import os
 import re
+import sys
 import pandas as pd
-from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from timestamp_codec import TRACE, to_datetime64  # shared with logging/
+from breadcrumb_rules import RuleTable, load_rules
+from trace_events import iter_events
+from trace_cache import EventColumns
+from trace_db import query as query_db
+from trace_io import open_trace
+from trace_sampling import SeveritySampler
 
 # Sample log lines in the new format
 log_lines = [
@@ -23,45 +34,54 @@ log_lines = [
 # Regex pattern to parse each log line
 log_pattern = re.compile(r'\[(.*?)\] (\w+) - \[.*?\] (\w+): (.*)')
 
+parser = argparse.ArgumentParser(description="Label a trace's events with breadcrumb types")
+parser.add_argument("--trace", help="trace file in the system_trace.log format, plain or compressed "
+                                    "(default: the sample lines above)")
+parser.add_argument("--cache", action="store_true",
+                    help="read --trace through its columnar event cache (built on first use)")
+parser.add_argument("--db", help="read events from a trace_db.py database instead (--trace then picks one trace in it)")
+parser.add_argument("--rules", help="JSON breadcrumb rule file (default: the built-in rules)")
+parser.add_argument("--sample", type=int, metavar="N",
+                    help="with --trace: keep every WARN and above, but only N lower-severity events per "
+                         "component per --sample-window, plus --context events around each kept one")
+parser.add_argument("--sample-window", type=float, default=1.0, help="sampling window in seconds")
+parser.add_argument("--context", type=int, default=5)
+args, _ = parser.parse_known_args()
+if args.sample is not None and (args.cache or args.db or not args.trace):
+    parser.error("--sample reads the trace itself: use it with --trace, without --cache or --db")
+
 # Parsed logs
 parsed_logs = []
 
-for line in log_lines:
-    match = log_pattern.match(line)
-    if match:
-        timestamp_str, severity, component, message = match.groups()
-        timestamp = datetime.strptime(timestamp_str, "%Y-%m-%d %H:%M:%S,%f")
-        parsed_logs.append((timestamp, component, message, severity))
+if args.db:
+    events = query_db(args.db, source=args.trace)
+    parsed_logs = list(zip(events["TimestampText"], events["Severity"], events["Component"], events["Message"]))
+elif args.trace and args.cache:
+    with EventColumns(args.trace) as events:
+        parsed_logs = list(zip(events.timestamp(), events.level, events.component, events.message()))
+elif args.trace:
+    with open_trace(args.trace, encoding="utf-8") as f:
+        events = iter_events(f)
+        if args.sample is not None:  # bounded memory however noisy the trace is
+            events = SeveritySampler(per_window=args.sample, window=args.sample_window,
+                                     context=args.context).run(events)
+        parsed_logs = [(e.timestamp, e.level, e.component, e.message) for e in events]
+else:
+    for line in log_lines:
+        match = log_pattern.match(line)
+        if match:
+            parsed_logs.append(match.groups())  # timestamp_str, severity, component, message
 
-# Create DataFrame
-df_logs = pd.DataFrame(parsed_logs, columns=["Timestamp", "Component", "Message", "Severity"])
+# Create DataFrame; timestamps are decoded in one batch instead of one strptime per line
+df_logs = pd.DataFrame(parsed_logs, columns=["Timestamp", "Severity", "Component", "Message"])
+df_logs["Timestamp"] = to_datetime64(df_logs["Timestamp"].tolist(), TRACE)
+df_logs = df_logs[["Timestamp", "Component", "Message", "Severity"]]
 df_logs = df_logs.sort_values("Timestamp")
 
-# Assign breadcrumb types
-def assign_breadcrumb(row):
-    msg = row["Message"].lower()
-    if "sell order" in msg:
-        return "🔴 Trigger"
-    elif "vwap" in msg or "100%" in msg:
-        return "🟠 Risk Bypass"
-    elif "liquidity" in msg or "bid-ask" in msg:
-        return "🟡 Market Stress"
-    elif "latency" in msg:
-        return "🟠 Platform Stress"
-    elif "circuit-breaker" in msg:
-        return "🔴 Control Failure"
-    elif "var" in msg:
-        return "🟡 Risk Acceleration"
-    elif "msft = 0.01" in msg or "sanity bounds" in msg:
-        return "🔴 Data Anomaly"
-    elif "dropping client sessions" in msg:
-        return "🔥 Final Failure"
-    elif "alert" in msg:
-        return "📣 Alerting"
-    else:
-        return "ℹ️ Info"
-
-df_logs["Breadcrumb"] = df_logs.apply(assign_breadcrumb, axis=1)
+# Assign breadcrumb types from an ordered rule table (first matching rule wins), classified
+# column-wise; pass --rules to use your own rules instead of the built-in ones
+rules = load_rules(args.rules) if args.rules else RuleTable()
+df_logs["Breadcrumb"] = rules.classify(df_logs["Message"])
 df_logs.reset_index(drop=True, inplace=True)
 df_logs[["Timestamp", "Component", "Message", "Breadcrumb"]]
 
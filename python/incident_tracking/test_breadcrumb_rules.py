@@ -0,0 +1,17 @@
+from breadcrumb_rules import Rule, RuleTable, contains
+
+MESSAGES = ["x error", "error y", "all done", "done z", "Received market sell order", "latency 100%", "", "ERROR\nnext"]
+
+def test_classify_matches_classify_one_for_anchored_regex():
+    table = RuleTable([Rule("E", ("(?:^error)",)), Rule("D", ("(?:done$)",)), Rule("A", (r"(?:\Aall)",)),
+                       Rule("Z", (r"(?:z\Z)",)), Rule("L", (r"(?:y(?=\s))",))])
+    assert table.classify(MESSAGES).tolist() == [table.classify_one(m) for m in MESSAGES]
+    assert table.classify(MESSAGES).tolist()[:4] == [table.default, "E", "D", "Z"]
+
+def test_classify_matches_classify_one_for_default_rules():
+    table = RuleTable()
+    assert table.classify(MESSAGES).tolist() == [table.classify_one(m) for m in MESSAGES]
+
+def test_first_rule_wins():
+    table = RuleTable([contains("A", "sell"), contains("B", "order")])
+    assert table.classify(["sell order", "order", "none"]).tolist() == ["A", "B", table.default]
@@ -0,0 +1,34 @@
+import os
+
+from trace_checkpoint import ResumableTrace
+
+def _lines(path):
+    with ResumableTrace(path) as trace:
+        return list(trace.lines())
+
+def _first_line(path):
+    with ResumableTrace(path) as trace:
+        for line in trace.lines():
+            return line
+
+def test_early_stop_keeps_unread_lines(tmp_path):
+    path = str(tmp_path / "t.log")
+    with open(path, "w") as f:
+        f.write("".join(f"a{i}\n" for i in range(5)))
+    assert _first_line(path) == "a0"
+    assert _lines(path) == [f"a{i}" for i in range(5)]
+    assert _lines(path) == []
+
+def test_early_stop_in_rotated_file_keeps_it(tmp_path):
+    path = str(tmp_path / "t.log")
+    with open(path, "w") as f:
+        f.write("a0\n")
+    assert _lines(path) == ["a0"]
+    with open(path, "a") as f:
+        f.write("".join(f"b{i}\n" for i in range(5)))
+    os.rename(path, path + ".1")
+    with open(path, "w") as f:
+        f.write("c0\nc1\n")
+    assert _first_line(path) == "b0"
+    assert _lines(path) == [f"b{i}" for i in range(5)] + ["c0", "c1"]
+    assert _lines(path) == []
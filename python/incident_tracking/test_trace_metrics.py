@@ -0,0 +1,30 @@
+import os
+import time
+from datetime import datetime
+
+import pytest
+
+from trace_events import parse_line
+from trace_metrics import TraceMetrics, trace_now
+
+@pytest.fixture
+def utc_minus_5():
+    saved = os.environ.get("TZ")
+    os.environ["TZ"] = "EST+5"  # fixed UTC-5, no daylight saving
+    time.tzset()
+    yield
+    if saved is None:
+        del os.environ["TZ"]
+    else:
+        os.environ["TZ"] = saved
+    time.tzset()
+
+def test_trace_now_is_local_wall_clock(utc_minus_5):
+    assert abs(trace_now() - (time.time() - 5 * 3600)) < 5
+
+def test_wall_clock_keeps_events_logged_now(utc_minus_5):
+    stamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S,000")
+    metrics = TraceMetrics(wall_clock=True)
+    metrics.observe(parse_line(f"[{stamp}] ERROR - [Gateway] timeout"))
+    rate = 'trace_event_rate{component="Gateway",level="ERROR",window="1m"} '
+    assert rate + "0.0166667" in metrics.render()
@@ -0,0 +1,191 @@
+"""
+Columnar cache of parsed trace events, so repeated investigations of the same trace skip the
+regex and timestamp parsing. The cache is an uncompressed NumPy .npz next to the trace
+(system_trace.log -> system_trace.log.events.npz) with one member per column:
+
+    time_ms                      int64 epoch milliseconds
+    level_codes, levels          dictionary-encoded level (int16 codes + distinct values)
+    component_codes, components  dictionary-encoded component (int32 codes + distinct values)
+    message_offsets, messages    UTF-8 blob of all messages + int64 offsets (n + 1)
+
+Events are kept in file order. An .npz member is only read when it is accessed, so a query
+that needs levels and components never loads the message blob, and messages are decoded
+only for the rows asked for. The cache is rebuilt when the trace's size or mtime changes.
+
+Usage: python trace_cache.py system_trace.log --levels ERROR CRITICAL
+"""
+import argparse
+import os
+import time
+import zipfile
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from trace_events import LEVEL_RANK, iter_events
+from trace_io import open_trace
+
+CACHE_VERSION = 1
+CACHE_SUFFIX = ".events.npz"
+COLUMNS = ("time_ms", "level", "component", "message")
+
+def _encode(values):
+    index = {}
+    codes = [index.setdefault(v, len(index)) for v in values]
+    return codes, list(index)
+
+def build_cache(trace_path: str, cache_path: Optional[str] = None) -> str:
+    """Parse the trace (plain or compressed) once and write the columnar cache atomically."""
+    cache_path = cache_path or trace_path + CACHE_SUFFIX
+    stat = os.stat(trace_path)
+    times, levels, components, blob, offsets = [], [], [], bytearray(), [0]
+    with open_trace(trace_path, encoding="utf-8") as f:
+        for event in iter_events(f):
+            times.append(event.time_ms)
+            levels.append(event.level)
+            components.append(event.component)
+            blob += event.message.encode("utf-8")
+            offsets.append(len(blob))
+    level_codes, level_values = _encode(levels)
+    component_codes, component_values = _encode(components)
+
+    tmp_path = cache_path + ".tmp.npz"
+    np.savez(
+        tmp_path,
+        meta=np.array([CACHE_VERSION, stat.st_size, stat.st_mtime_ns], dtype=np.int64),
+        time_ms=np.array(times, dtype=np.int64),
+        level_codes=np.array(level_codes, dtype=np.int16),
+        levels=np.array(level_values, dtype=str),
+        component_codes=np.array(component_codes, dtype=np.int32),
+        components=np.array(component_values, dtype=str),
+        message_offsets=np.array(offsets, dtype=np.int64),
+        messages=np.frombuffer(bytes(blob), dtype=np.uint8),
+    )
+    os.replace(tmp_path, cache_path)  # readers never see a half-written cache
+    return cache_path
+
+def _is_fresh(cache_path: str, stat: os.stat_result) -> bool:
+    try:
+        with np.load(cache_path) as cache:
+            meta = cache["meta"]
+    except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile):
+        return False  # missing, truncated or corrupt: rebuild
+    return meta.tolist() == [CACHE_VERSION, stat.st_size, stat.st_mtime_ns]
+
+class EventColumns:
+    """
+    Lazy view of a trace's cached columns. Attributes load one .npz member on first use;
+    message(rows) decodes only the requested rows.
+    """
+
+    def __init__(self, trace_path: str, cache_path: Optional[str] = None):
+        self.trace_path = trace_path
+        self.cache_path = cache_path or trace_path + CACHE_SUFFIX
+        if not _is_fresh(self.cache_path, os.stat(trace_path)):
+            build_cache(trace_path, self.cache_path)
+        self._npz = np.load(self.cache_path)
+        self._loaded = {}
+
+    def _member(self, name: str):
+        if name not in self._loaded:
+            self._loaded[name] = self._npz[name]
+        return self._loaded[name]
+
+    def __len__(self):
+        return len(self._member("time_ms"))
+
+    @property
+    def time_ms(self) -> np.ndarray:
+        return self._member("time_ms")
+
+    def _categorical(self, name: str, rows=None) -> pd.Categorical:
+        codes = self._member(name + "_codes")
+        return pd.Categorical.from_codes(codes if rows is None else codes[rows], self._member(name + "s").tolist())
+
+    def _values(self, name: str, rows) -> np.ndarray:
+        """Decoded values of a dictionary-encoded column at rows only: the codes are indexed first."""
+        return np.array(self._member(name + "s").tolist(), dtype=object)[self._member(name + "_codes")[rows]]
+
+    @property
+    def level(self) -> pd.Categorical:
+        return self._categorical("level")
+
+    @property
+    def component(self) -> pd.Categorical:
+        return self._categorical("component")
+
+    def level_at(self, rows) -> np.ndarray:
+        return self._values("level", rows)
+
+    def component_at(self, rows) -> np.ndarray:
+        return self._values("component", rows)
+
+    def rows_with_level(self, levels: Iterable[str]) -> np.ndarray:
+        """Row numbers whose level is one of levels, found from the codes alone."""
+        levels = set(levels)
+        wanted = [i for i, level in enumerate(self._member("levels").tolist()) if level in levels]
+        return np.flatnonzero(np.isin(self._member("level_codes"), wanted))
+
+    def timestamp(self, rows=None) -> list:
+        """Trace-style timestamp text ("2010-04-24 07:51:54,401"), rebuilt from time_ms."""
+        times = self.time_ms if rows is None else self.time_ms[rows]
+        text = np.datetime_as_string(times.astype("datetime64[ms]"), unit="ms")
+        return [t.replace("T", " ").replace(".", ",") for t in text.tolist()]
+
+    def message(self, rows=None) -> list:
+        offsets = self._member("message_offsets")
+        blob = self._member("messages").tobytes()
+        if rows is None:
+            rows = range(len(offsets) - 1)
+        if blob.isascii():  # byte offsets are character offsets; decode the blob once
+            text = blob.decode("ascii")
+            return [text[offsets[i]:offsets[i + 1]] for i in rows]
+        return [blob[offsets[i]:offsets[i + 1]].decode("utf-8") for i in rows]
+
+    def frame(self, columns: Iterable[str] = COLUMNS, rows=None) -> pd.DataFrame:
+        """
+        The requested columns as the reporting scripts' frame (Timestamp, Severity, Component,
+        Message), restricted to rows if given. Columns not asked for are never read.
+        """
+        data = {}
+        for column in columns:
+            if column == "time_ms":
+                times = self.time_ms if rows is None else self.time_ms[rows]
+                data["Timestamp"] = times.astype("datetime64[ms]")
+            elif column == "level":
+                data["Severity"] = self._categorical("level", rows)
+            elif column == "component":
+                data["Component"] = self._categorical("component", rows)
+            elif column == "message":
+                data["Message"] = self.message(rows)
+            else:
+                raise ValueError(f"unknown column {column!r}; expected one of {COLUMNS}")
+        return pd.DataFrame(data)
+
+    def close(self):
+        self._npz.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def load_frame(trace_path: str, columns: Iterable[str] = COLUMNS, levels: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """Cached events of a trace as a DataFrame, optionally only those at the given levels."""
+    with EventColumns(trace_path) as events:
+        rows = events.rows_with_level(levels) if levels else None
+        return events.frame(columns, rows)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build or query the columnar event cache of a trace")
+    parser.add_argument("trace", nargs="?", default="system_trace.log")
+    parser.add_argument("--levels", nargs="+", help=f"only these levels, e.g. ERROR CRITICAL ({', '.join(LEVEL_RANK)})")
+    parser.add_argument("--columns", nargs="+", default=list(COLUMNS), choices=COLUMNS)
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    df = load_frame(args.trace, args.columns, args.levels)
+    print(df.to_string(index=False, max_rows=40))
+    print(f"{len(df):,} events in {time.perf_counter() - t0:.3f}s")
@@ -0,0 +1,180 @@
+"""
+Streaming cascade detector: feed trace events one at a time and get an Incident as soon as
+an escalation pattern completes, e.g. WARN -> ERROR -> CRITICAL within 5 seconds.
+
+Two kinds of pattern:
+- Escalation(levels, within): events at these levels, in this order, with the first and
+  last no more than `within` seconds apart.
+- Burst(level, count, within): `count` events at `level` or above within `within` seconds.
+
+Each pattern runs per component (scope="component") or across all components
+(scope="global"). State is a few partial chains per step or a deque bounded by count, so
+every event costs O(1) amortized per pattern whatever the trace length, and the detector
+can sit inline on a live trace (see --follow).
+
+Usage: python trace_cascade.py system_trace.log --within 5
+       python trace_cascade.py live_trace.log --follow --patterns cascades.json
+"""
+import argparse
+import json
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Tuple
+
+from trace_events import TraceEvent, follow_lines, iter_events, level_rank
+from trace_io import open_trace
+
+SCOPES = ("component", "global")
+
+class Escalation(NamedTuple):
+    name: str
+    levels: Tuple[str, ...]
+    within: float               # seconds
+    scope: str = "global"
+
+class Burst(NamedTuple):
+    name: str
+    level: str                  # minimum level counted
+    count: int
+    within: float               # seconds
+    scope: str = "component"
+
+class Incident(NamedTuple):
+    pattern: str
+    scope: str                  # component name, or "*" for global patterns
+    events: Tuple[TraceEvent, ...]
+
+    def describe(self) -> str:
+        first, last = self.events[0], self.events[-1]
+        chain = " -> ".join(f"{e.level} [{e.component}]" for e in self.events)
+        return (f"{first.timestamp} .. {last.timestamp} ({(last.time_ms - first.time_ms) / 1000:.3f}s) "
+                f"{self.pattern} @ {self.scope}: {chain}")
+
+DEFAULT_PATTERNS = [
+    Escalation("escalation", ("WARN", "ERROR", "CRITICAL"), within=5.0, scope="global"),
+    Burst("error-burst", "ERROR", count=3, within=10.0, scope="component"),
+]
+
+class _EscalationState:
+    """
+    chains[j] is the partial match of levels[0..j] that started most recently: a later start
+    leaves the most room in the window, so no other partial match can complete before it.
+    """
+    __slots__ = ("chains",)
+
+    def __init__(self, steps: int):
+        self.chains = [None] * steps
+
+    def update(self, pattern: Escalation, ranks: Tuple[int, ...], event: TraceEvent):
+        window_ms = pattern.within * 1000
+        rank = event.rank
+        # Later steps first, so one event never fills two consecutive steps.
+        for j in range(len(ranks) - 1, -1, -1):
+            if ranks[j] != rank:
+                continue
+            if j == 0:
+                chain = (event,)
+            else:
+                prev = self.chains[j - 1]
+                if prev is None or event.time_ms - prev[0].time_ms > window_ms:
+                    continue
+                chain = prev + (event,)
+            if j == len(ranks) - 1:
+                self.chains = [None] * len(ranks)  # report once, then start over
+                return chain
+            if self.chains[j] is None or chain[0].time_ms >= self.chains[j][0].time_ms:
+                self.chains[j] = chain
+        return None
+
+class _BurstState:
+    __slots__ = ("recent",)
+
+    def __init__(self, count: int):
+        self.recent = deque(maxlen=count)
+
+    def update(self, pattern: Burst, event: TraceEvent):
+        self.recent.append(event)
+        if len(self.recent) == self.recent.maxlen and \
+                event.time_ms - self.recent[0].time_ms <= pattern.within * 1000:
+            burst = tuple(self.recent)
+            self.recent.clear()
+            return burst
+        return None
+
+class CascadeDetector:
+    def __init__(self, patterns: List = DEFAULT_PATTERNS):
+        for pattern in patterns:
+            if pattern.scope not in SCOPES:
+                raise ValueError(f"{pattern.name}: scope must be one of {SCOPES}")
+        self.patterns = list(patterns)
+        self._ranks = [tuple(map(level_rank, p.levels)) if isinstance(p, Escalation) else level_rank(p.level)
+                       for p in self.patterns]
+        self._state: List[Dict[str, object]] = [{} for _ in self.patterns]  # per pattern: scope key -> state
+
+    def feed(self, event: TraceEvent) -> List[Incident]:
+        """Process one event; returns the incidents it completes (usually none)."""
+        incidents = []
+        rank = event.rank
+        for pattern, ranks, states in zip(self.patterns, self._ranks, self._state):
+            key = event.component if pattern.scope == "component" else "*"
+            if isinstance(pattern, Escalation):
+                if rank not in ranks:
+                    continue
+                state = states.get(key)
+                if state is None:
+                    state = states[key] = _EscalationState(len(ranks))
+                events = state.update(pattern, ranks, event)
+            else:
+                if rank < ranks:
+                    continue
+                state = states.get(key)
+                if state is None:
+                    state = states[key] = _BurstState(pattern.count)
+                events = state.update(pattern, event)
+            if events:
+                incidents.append(Incident(pattern.name, key, events))
+        return incidents
+
+    def run(self, events: Iterable[TraceEvent]) -> Iterator[Incident]:
+        for event in events:
+            yield from self.feed(event)
+
+def load_patterns(path: str) -> List:
+    """
+    JSON list of patterns, e.g.
+    [{"name": "escalation", "levels": ["WARN", "ERROR", "FATAL"], "within": 5},
+     {"name": "error-burst", "level": "ERROR", "count": 3, "within": 10, "scope": "component"}]
+    """
+    with open(path, encoding="utf-8") as f:
+        spec = json.load(f)
+    patterns = []
+    for n, entry in enumerate(spec):
+        name = entry.get("name", f"pattern-{n}")
+        if "levels" in entry:
+            patterns.append(Escalation(name, tuple(entry["levels"]), float(entry["within"]),
+                                       entry.get("scope", "global")))
+        elif "level" in entry:
+            patterns.append(Burst(name, entry["level"], int(entry["count"]), float(entry["within"]),
+                                  entry.get("scope", "component")))
+        else:
+            raise ValueError(f"{path}: pattern {n} needs 'levels' (escalation) or 'level' (burst)")
+    return patterns
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Detect incident cascades in a trace as it is read")
+    parser.add_argument("trace", nargs="?", default="system_trace.log")
+    parser.add_argument("--patterns", help="JSON pattern file (default: WARN -> ERROR -> CRITICAL and error bursts)")
+    parser.add_argument("--within", type=float, help="override the window (seconds) of every pattern")
+    parser.add_argument("--follow", action="store_true", help="keep reading as the trace grows")
+    args = parser.parse_args()
+
+    patterns = load_patterns(args.patterns) if args.patterns else DEFAULT_PATTERNS
+    if args.within is not None:
+        patterns = [p._replace(within=args.within) for p in patterns]
+    detector = CascadeDetector(patterns)
+
+    if args.follow:
+        lines = follow_lines(args.trace)
+    else:
+        lines = open_trace(args.trace, encoding="utf-8")
+    for incident in detector.run(iter_events(lines)):
+        print(incident.describe(), flush=True)
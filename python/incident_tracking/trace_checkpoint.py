@@ -0,0 +1,242 @@
+"""
+Resumable reading of a growing, rotating trace. A JSON checkpoint next to the trace
+(system_trace.log -> system_trace.log.checkpoint.json) records the file's device/inode, the
+byte offset after the last complete line, that unfinished last line, and a hash of the file
+head. The next run continues from there:
+
+- same file, grown: only the new bytes are read;
+- renamed away (logrotate create mode): the old file is found by inode, or if it was
+  compressed (system_trace.log.1.gz) by its head hash, and read to its end before the new
+  file is read from byte 0;
+- truncated (copytruncate) or rewritten in place: the copy, if there is one, is found by
+  its head hash and finished first; the new content is read from byte 0.
+
+The checkpoint is only written once blocks() has been read to its end without an exception,
+so every complete line is delivered once: a crash, or a consumer that stops early, leaves the
+old checkpoint and the next run delivers the same lines again.
+
+    with ResumableTrace("system_trace.log") as trace:
+        for block in trace.blocks():   # bytes, whole lines only
+            ...
+
+Usage: python trace_checkpoint.py system_trace.log   (prints the new lines)
+"""
+import argparse
+import glob
+import hashlib
+import json
+import os
+import sys
+from typing import BinaryIO, Iterator, List, NamedTuple, Optional
+
+from trace_io import open_trace
+
+CHECKPOINT_VERSION = 1
+CHECKPOINT_SUFFIX = ".checkpoint.json"
+HEAD_BYTES = 4096           # file head hashed to recognise the same file after a rename
+CHUNK_SIZE = 4 * 1024 * 1024
+
+class Segment(NamedTuple):
+    file: BinaryIO          # positioned at the first byte to read
+    path: str
+    remaining: Optional[int]  # bytes to read, None for "to the end"
+    final: bool             # the file will not grow: an unterminated last line still counts
+
+def _head_digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+def _read_head(f, length: int) -> bytes:
+    f.seek(0)
+    return f.read(length)
+
+class ResumableTrace:
+    def __init__(self, path: str, checkpoint_path: Optional[str] = None):
+        self.path = path
+        self.checkpoint_path = checkpoint_path or path + CHECKPOINT_SUFFIX
+        self.state = self._load()
+        self.notes: List[str] = []    # what the planner decided, for logging
+        self._segments: List[Segment] = []
+        self._position = None         # (offset, partial) reached in the current file
+        self._current_stat = None
+        self._finished = False        # blocks() read to the end: the position may be committed
+
+    def _load(self) -> Optional[dict]:
+        try:
+            with open(self.checkpoint_path, encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return state if state.get("version") == CHECKPOINT_VERSION else None
+
+    def _find_rotated(self, state: dict) -> Optional[Segment]:
+        """The previous file, now under another name in the same directory, positioned at the checkpoint."""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        base = os.path.basename(self.path)
+        candidates = [p for p in glob.glob(os.path.join(directory, glob.escape(base) + "*"))
+                      if os.path.abspath(p) != os.path.abspath(self.path)
+                      and not p.endswith((CHECKPOINT_SUFFIX, ".tmp", ".npz"))]
+        candidates.sort(key=lambda p: os.stat(p).st_mtime, reverse=True)  # most recent rotation first
+        for candidate in candidates:
+            st = os.stat(candidate)
+            if (st.st_dev, st.st_ino) == (state["device"], state["inode"]) and st.st_size >= state["offset"]:
+                f = open(candidate, "rb")
+                f.seek(state["offset"])
+                return Segment(f, candidate, None, True)
+        if not state["head_len"]:
+            return None  # nothing was read from the old file: no content to recognise it by
+        for candidate in candidates:  # compressed or copied: a new inode, so compare contents
+            try:
+                f = open_trace(candidate)
+            except (OSError, ImportError):
+                continue
+            if _head_digest(f.read(state["head_len"])) == state["head"]:
+                skipped = state["head_len"]
+                while skipped < state["offset"]:
+                    step = f.read(min(CHUNK_SIZE, state["offset"] - skipped))
+                    if not step:
+                        break
+                    skipped += len(step)
+                if skipped == state["offset"]:
+                    return Segment(f, candidate, None, True)
+            f.close()
+        return None
+
+    def segments(self) -> List[Segment]:
+        """Byte ranges still to be read, in order; computed once per run."""
+        if self._segments or self._current_stat:
+            return self._segments
+        try:
+            current = open(self.path, "rb")
+        except FileNotFoundError:
+            self.notes.append(f"{self.path} does not exist")
+            return []
+        st = os.fstat(current.fileno())
+        self._current_stat = st
+        start = 0
+        state = self.state
+        if state is None:
+            self.notes.append("no checkpoint: reading from the start")
+        else:
+            change = None
+            if (st.st_dev, st.st_ino) == (state["device"], state["inode"]):
+                partial = state["partial"].encode("utf-8", "surrogateescape")
+                if st.st_size < state["offset"] + len(partial):
+                    change = f"truncated below offset {state['offset']:,}"
+                elif _head_digest(_read_head(current, state["head_len"])) != state["head"] or \
+                        _read_partial(current, state["offset"], len(partial)) != partial:
+                    change = "rewritten in place"
+                else:
+                    start = state["offset"]
+                    self.notes.append(f"resuming at offset {start:,}")
+            else:
+                change = "rotated"
+            if change:
+                # A copytruncate copy, or a new file that reused the old inode after the old
+                # one was compressed, still leaves the old content findable by its head.
+                rotated = self._find_rotated(state)
+                if rotated is None:
+                    self.notes.append(f"{change}, previous content not found: reading from the start")
+                else:
+                    self.notes.append(f"{change}: finishing {rotated.path} from offset {state['offset']:,}")
+                    self._segments.append(rotated)
+        current.seek(start)
+        self._segments.append(Segment(current, self.path, st.st_size - start, False))
+        self._position = (start, b"")
+        return self._segments
+
+    def blocks(self, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        """New complete lines as byte blocks, ending at a newline (or at the end of a rotated file)."""
+        for segment in self.segments():
+            f, remaining = segment.file, segment.remaining
+            offset = f.tell() if not segment.final else None
+            tail = b""
+            while True:
+                size = chunk_size if remaining is None else min(chunk_size, remaining)
+                chunk = f.read(size) if size > 0 else b""
+                if remaining is not None:
+                    remaining -= len(chunk)
+                if not chunk:
+                    break
+                cut = chunk.rfind(b"\n") + 1
+                if cut == 0:
+                    tail += chunk
+                    continue
+                block = tail + chunk[:cut]
+                tail = chunk[cut:]
+                if offset is not None:
+                    offset += len(block)
+                    self._position = (offset, tail)
+                yield block
+            if segment.final:
+                if tail:
+                    yield tail  # the rotated file is complete: its last line is too
+            else:
+                self._position = (offset, tail)
+        self._finished = True
+
+    def lines(self) -> Iterator[str]:
+        for block in self.blocks():
+            lines = block.decode("utf-8", errors="replace").split("\n")
+            if lines[-1] == "":
+                lines.pop()  # blocks end with a newline
+            for line in lines:
+                yield line.rstrip("\r")
+
+    def commit(self):
+        """Record how far blocks() got; call after the lines have been processed. Does nothing
+        unless blocks() was read to its end, so lines that were never delivered are not skipped."""
+        if not self._finished or self._position is None or self._current_stat is None:
+            return
+        offset, partial = self._position
+        current = self._segments[-1].file
+        head_len = min(HEAD_BYTES, offset)
+        state = {
+            "version": CHECKPOINT_VERSION,
+            "path": os.path.abspath(self.path),
+            "device": self._current_stat.st_dev,
+            "inode": self._current_stat.st_ino,
+            "offset": offset,
+            "partial": partial.decode("utf-8", "surrogateescape"),
+            "head_len": head_len,
+            "head": _head_digest(_read_head(current, head_len)),
+        }
+        tmp_path = self.checkpoint_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.checkpoint_path)  # a crash leaves the old checkpoint intact
+        self.state = state
+
+    def close(self):
+        for segment in self._segments:
+            segment.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.commit()
+        self.close()
+
+def _read_partial(f, offset: int, length: int) -> bytes:
+    f.seek(offset)
+    return f.read(length)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Print the lines added to a trace since the last run")
+    parser.add_argument("trace", nargs="?", default="system_trace.log")
+    parser.add_argument("--checkpoint", help=f"checkpoint file (default: <trace>{CHECKPOINT_SUFFIX})")
+    parser.add_argument("--quiet", action="store_true", help="only print the summary")
+    args = parser.parse_args()
+
+    count = 0
+    with ResumableTrace(args.trace, args.checkpoint) as trace:
+        for line in trace.lines():
+            count += 1
+            if not args.quiet:
+                print(line)
+        for note in trace.notes:
+            print(f"# {note}", file=sys.stderr)
+    print(f"# {count:,} new lines", file=sys.stderr)
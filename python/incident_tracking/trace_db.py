@@ -0,0 +1,233 @@
+"""
+SQLite store of parsed trace events, for questions like "all ERROR/FATAL from OrderBook or
+LatencyMonitor between 07:51:55 and 07:51:59" without re-reading the raw traces.
+
+    events(time_ms, timestamp, level, component, message, source_id)
+    indexes: (time_ms), (component, time_ms), (level, time_ms), (source_id)
+    events_fts: FTS5 index over message (when the sqlite3 build has FTS5)
+
+Ingest parses each trace (plain or compressed) once and inserts in batches, one transaction
+per batch; a trace whose size and mtime are unchanged is skipped, a changed one replaced.
+A trace's size and mtime are only recorded with its last batch, so an interrupted ingest is
+redone from scratch on the next run.
+
+Usage: python trace_db.py ingest traces.db system_trace.log
+       python trace_db.py query traces.db --levels ERROR FATAL --components OrderBook LatencyMonitor \
+           --start "2010-04-24 07:51:55" --end "2010-04-24 07:51:59"
+       python trace_db.py query traces.db --text "circuit*" --explain
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import time
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, List, Optional, Union
+
+import pandas as pd
+
+from trace_events import LEVEL_RANK, iter_events
+from trace_io import open_trace
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from timestamp_codec import epoch  # shared with logging/
+
+BATCH = 50_000  # events per insert transaction
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    events INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    source_id INTEGER NOT NULL REFERENCES sources(id),
+    time_ms INTEGER NOT NULL,
+    timestamp TEXT NOT NULL,
+    level TEXT NOT NULL,
+    component TEXT NOT NULL,
+    message TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_time ON events(time_ms);
+CREATE INDEX IF NOT EXISTS events_component_time ON events(component, time_ms);
+CREATE INDEX IF NOT EXISTS events_level_time ON events(level, time_ms);
+CREATE INDEX IF NOT EXISTS events_source ON events(source_id);
+"""
+FTS_SCHEMA = "CREATE VIRTUAL TABLE IF NOT EXISTS events_fts USING fts5(message, content='events', content_rowid='id')"
+
+def connect(db_path: str) -> sqlite3.Connection:
+    con = sqlite3.connect(db_path)
+    con.execute("PRAGMA journal_mode=WAL")
+    con.execute("PRAGMA synchronous=NORMAL")
+    con.executescript(SCHEMA)
+    try:
+        con.execute(FTS_SCHEMA)
+    except sqlite3.OperationalError:
+        pass  # no FTS5 in this build; text queries fall back to LIKE
+    return con
+
+def has_fts(con: sqlite3.Connection) -> bool:
+    return con.execute("SELECT 1 FROM sqlite_master WHERE name = 'events_fts'").fetchone() is not None
+
+def ingest(db_path: str, trace_paths: Iterable[str], batch: int = BATCH) -> int:
+    """Load traces into the database; returns the number of events inserted."""
+    con = connect(db_path)
+    fts = has_fts(con)
+    inserted = 0
+    try:
+        for trace_path in trace_paths:
+            path = os.path.abspath(trace_path)
+            stat = os.stat(path)
+            row = con.execute("SELECT id, size, mtime_ns FROM sources WHERE path = ?", (path,)).fetchone()
+            if row and row[1:] == (stat.st_size, stat.st_mtime_ns):
+                continue  # already loaded
+            with con:
+                if row:
+                    if fts:
+                        con.execute("INSERT INTO events_fts(events_fts, rowid, message) "
+                                    "SELECT 'delete', id, message FROM events WHERE source_id = ?", (row[0],))
+                    con.execute("DELETE FROM events WHERE source_id = ?", (row[0],))
+                    con.execute("DELETE FROM sources WHERE id = ?", (row[0],))
+                # size -1 marks the trace as incomplete until its last batch is in
+                source_id = con.execute("INSERT INTO sources (path, size, mtime_ns, events) VALUES (?, -1, -1, 0)",
+                                        (path,)).lastrowid
+
+            count = 0
+            with open_trace(path, encoding="utf-8") as f:
+                events = iter_events(f)
+                while True:
+                    rows = [(source_id, e.time_ms, e.timestamp, e.level, e.component, e.message)
+                            for e in islice(events, batch)]
+                    if not rows:
+                        break
+                    with con:  # one transaction per batch
+                        first_id = con.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM events").fetchone()[0]
+                        con.executemany("INSERT INTO events (source_id, time_ms, timestamp, level, component, message) "
+                                        "VALUES (?, ?, ?, ?, ?, ?)", rows)
+                        if fts:
+                            con.execute("INSERT INTO events_fts(rowid, message) "
+                                        "SELECT id, message FROM events WHERE id >= ?", (first_id,))
+                    count += len(rows)
+            with con:
+                con.execute("UPDATE sources SET events = ?, size = ?, mtime_ns = ? WHERE id = ?",
+                            (count, stat.st_size, stat.st_mtime_ns, source_id))
+            inserted += count
+        con.execute("ANALYZE")
+    finally:
+        con.close()
+    return inserted
+
+def _to_ms(value: Union[str, datetime, None]) -> Optional[int]:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = pd.Timestamp(value.replace(",", ".")).to_pydatetime()
+    return epoch(value, "ms")
+
+def _level_aliases(levels: Iterable[str]) -> List[str]:
+    """ERROR FATAL -> ERROR, CRITICAL, FATAL: names of equal rank are the same severity."""
+    ranks = {LEVEL_RANK.get(level.upper()) for level in levels}
+    names = {level for level in levels}
+    names.update(name for name, rank in LEVEL_RANK.items() if rank in ranks)
+    return sorted(names)
+
+def build_query(start=None, end=None, components: Optional[List[str]] = None, levels: Optional[List[str]] = None,
+                text: Optional[str] = None, source: Optional[str] = None, fts: bool = True, limit: Optional[int] = None):
+    """SQL and parameters for the filters; start is inclusive, end exclusive."""
+    where, params = [], []
+    start_ms, end_ms = _to_ms(start), _to_ms(end)
+    if start_ms is not None:
+        where.append("time_ms >= ?")
+        params.append(start_ms)
+    if end_ms is not None:
+        where.append("time_ms < ?")
+        params.append(end_ms)
+    if components:
+        where.append(f"component IN ({','.join('?' * len(components))})")
+        params.extend(components)
+    if levels:
+        names = _level_aliases(levels)
+        where.append(f"level IN ({','.join('?' * len(names))})")
+        params.extend(names)
+    if text:
+        if fts:
+            where.append("id IN (SELECT rowid FROM events_fts WHERE events_fts MATCH ?)")
+            params.append(text)
+        else:
+            where.append("message LIKE ? ESCAPE '\\'")
+            params.append("%" + text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%")
+    if source:
+        where.append("source_id = (SELECT id FROM sources WHERE path = ?)")
+        params.append(os.path.abspath(source))
+    sql = "SELECT time_ms, timestamp, level, component, message FROM events"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    # With a component/level filter, "+time_ms" keeps SQLite from walking the whole time
+    # index just to avoid sorting; the composite indexes find far fewer rows to sort.
+    sql += " ORDER BY +time_ms, id" if components or levels else " ORDER BY time_ms, id"
+    if limit:
+        sql += f" LIMIT {int(limit)}"
+    return sql, params
+
+def query(db_path: str, explain: bool = False, **filters) -> pd.DataFrame:
+    """
+    Events matching the filters (see build_query) as a Timestamp/Severity/Component/Message
+    frame, plus the raw trace timestamp text. explain=True returns SQLite's query plan instead.
+    The database is opened read-only, so a mistyped path is reported instead of created.
+    """
+    if not os.path.isfile(db_path):
+        raise FileNotFoundError(f"no trace database at {db_path}; create it with: trace_db.py ingest {db_path} TRACE...")
+    con = sqlite3.connect(Path(db_path).resolve().as_uri() + "?mode=ro", uri=True)
+    try:
+        sql, params = build_query(fts=has_fts(con), **filters)
+        if explain:
+            return pd.DataFrame(con.execute("EXPLAIN QUERY PLAN " + sql, params).fetchall(),
+                                columns=["id", "parent", "notused", "detail"])[["detail"]]
+        rows = con.execute(sql, params).fetchall()
+    finally:
+        con.close()
+    times, stamps, levels, components, messages = zip(*rows) if rows else ((),) * 5
+    return pd.DataFrame({
+        "Timestamp": pd.to_datetime(pd.Series(times, dtype="int64"), unit="ms"),
+        "TimestampText": list(stamps),
+        "Severity": list(levels),
+        "Component": list(components),
+        "Message": list(messages),
+    })
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load trace events into SQLite and query them")
+    commands = parser.add_subparsers(dest="command", required=True)
+    load = commands.add_parser("ingest", help="parse traces into the database")
+    load.add_argument("db")
+    load.add_argument("traces", nargs="+")
+    load.add_argument("--batch", type=int, default=BATCH)
+    ask = commands.add_parser("query", help="filter events by time, component, level and message text")
+    ask.add_argument("db")
+    ask.add_argument("--start", help='inclusive, e.g. "2010-04-24 07:51:55"')
+    ask.add_argument("--end", help="exclusive")
+    ask.add_argument("--components", nargs="+")
+    ask.add_argument("--levels", nargs="+", help="aliases are included: FATAL also matches CRITICAL")
+    ask.add_argument("--text", help="FTS5 match expression over messages, e.g. 'circuit*'")
+    ask.add_argument("--source", help="only events from this trace file")
+    ask.add_argument("--limit", type=int)
+    ask.add_argument("--explain", action="store_true", help="show SQLite's query plan")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    if args.command == "ingest":
+        count = ingest(args.db, args.traces, args.batch)
+        print(f"Inserted {count:,} events in {time.perf_counter() - t0:.2f}s")
+    else:
+        if not os.path.isfile(args.db):
+            ask.error(f"no trace database at {args.db}; create it with: trace_db.py ingest {args.db} TRACE...")
+        df = query(args.db, explain=args.explain, start=args.start, end=args.end, components=args.components,
+                   levels=args.levels, text=args.text, source=args.source, limit=args.limit)
+        print(df.drop(columns="TimestampText", errors="ignore").to_string(index=False, max_rows=50))
+        if not args.explain:
+            print(f"{len(df):,} events in {(time.perf_counter() - t0) * 1000:.1f} ms")
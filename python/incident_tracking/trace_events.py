@@ -0,0 +1,93 @@
+"""
+Trace lines as events, shared by the incident_tracking tools:
+
+    [2010-04-24 07:51:56,220] ERROR - [CircuitBreaker] Threshold crossed on 5 symbols
+
+parse_line() turns one line into a TraceEvent, iter_events() does it for any iterable of
+lines (an open file, a list, follow_lines() on a live trace) and skips lines that do not
+fit the format.
+"""
+import os
+import re
+import sys
+import time
+from typing import Iterable, Iterator, NamedTuple, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from timestamp_codec import TRACE, decode, epoch  # shared with logging/
+
+LINE_PATTERN = re.compile(
+    r'^\[(?P<timestamp>[\d\-:\s,]+)\]\s(?P<level>\w+)\s+-\s+\[(?P<component>[^\]]+)\]\s(?P<message>.*)$'
+)
+
+# Severity order; aliases share a rank so WARN/WARNING and FATAL/CRITICAL compare equal.
+LEVEL_RANK = {
+    "TRACE": 0, "DEBUG": 10, "INFO": 20, "NOTICE": 25,
+    "WARN": 30, "WARNING": 30, "ERROR": 40, "CRITICAL": 50, "FATAL": 50,
+}
+
+class TraceEvent(NamedTuple):
+    time_ms: int        # epoch milliseconds
+    timestamp: str      # as written in the trace
+    level: str
+    component: str
+    message: str
+
+    @property
+    def rank(self) -> int:
+        return level_rank(self.level)
+
+def level_rank(level: str) -> int:
+    """Rank of a level name; unknown levels rank with INFO."""
+    return LEVEL_RANK.get(level.upper(), LEVEL_RANK["INFO"])
+
+_minutes = {}  # "YYYY-MM-DD HH:MM" -> epoch ms; consecutive lines nearly always share one
+
+def time_ms(timestamp: str) -> int:
+    """Epoch milliseconds of a trace timestamp, decoding each distinct minute only once."""
+    if len(timestamp) == TRACE.width and timestamp[16] == ":" and timestamp[19] == ",":
+        seconds, millis = timestamp[17:19], timestamp[20:23]
+        if seconds.isdigit() and millis.isdigit() and seconds < "60":
+            minute = timestamp[:16]
+            base = _minutes.get(minute)
+            if base is None:
+                if len(_minutes) >= 4096:
+                    _minutes.clear()
+                base = _minutes[minute] = epoch(decode(minute + ":00,000", TRACE), "ms")
+            return base + int(seconds) * 1000 + int(millis)
+    return epoch(decode(timestamp, TRACE), "ms")
+
+def parse_line(line: str) -> Optional[TraceEvent]:
+    match = LINE_PATTERN.match(line.rstrip("\r\n"))
+    if not match:
+        return None
+    timestamp, level, component, message = match.groups()
+    try:
+        return TraceEvent(time_ms(timestamp), timestamp, level, component, message)
+    except ValueError:
+        return None
+
+def iter_events(lines: Iterable[str]) -> Iterator[TraceEvent]:
+    for line in lines:
+        event = parse_line(line)
+        if event is not None:
+            yield event
+
+def follow_lines(file_path: str, from_end: bool = False, interval: float = 0.5) -> Iterator[str]:
+    """Yield complete lines of a growing file, polling for new data like tail -f. Never returns."""
+    with open(file_path, "r", encoding="utf-8", errors="replace") as f:
+        if from_end:
+            f.seek(0, os.SEEK_END)
+        partial = ""
+        while True:
+            line = f.readline()
+            if not line:
+                if os.stat(file_path).st_size < f.tell():  # truncated in place: start over
+                    f.seek(0)
+                    partial = ""
+                time.sleep(interval)
+                continue
+            partial += line
+            if partial.endswith("\n"):
+                yield partial
+                partial = ""
@@ -0,0 +1,232 @@
+"""
+Parallel trace ingestion: every trace file, or byte-range shard of a large one, is parsed
+in a worker process into a batch sorted by time, and the parent merges the batches with a
+k-way heap merge into one time-ordered TraceEvent stream. Nothing is re-sorted as a whole,
+and the stream can be consumed as it is merged (to_frame, CascadeDetector.run, ...).
+
+Compressed traces made of independent members (BGZF gzip, multi-frame zstd; see trace_io.py)
+are sharded by member group like plain files. Other compressed traces (plain gzip, bz2, xz)
+cannot be split: each is one shard, decompressed whole in memory while its batch is merged.
+
+Usage: python trace_ingest.py gateway_traces/ --pattern "*.log" --workers 8 --csv day.csv
+"""
+import argparse
+import glob
+import os
+import re
+import sys
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from operator import itemgetter
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+
+import pandas as pd
+
+from trace_cascade import CascadeDetector
+from trace_events import TRACE, TraceEvent, parse_line, time_ms
+from trace_io import decompress_members, detect_codec, group_members, member_ranges, next_member, open_trace
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from batch_merge import merge_batches  # shared with logging/
+
+SPLIT_SIZE = 64 * 1024 * 1024  # files larger than this are cut into several shards
+COMPRESSION_GUESS = 8          # compressed shards hold split_size / 8 compressed bytes
+READ_SIZE = 4 * 1024 * 1024    # bytes of lines per step when scanning a compressed stream
+EARLIEST = -(1 << 63)
+STAMP_PATTERN_BYTES = re.compile(rb"^\[([\d\-:\s,]+)\]", re.MULTILINE)  # the timestamp of LINE_PATTERN
+
+def split_points(file_path: str, split_size: int = SPLIT_SIZE) -> List[int]:
+    """Byte offsets [0, ..., size] cutting the file just after a newline roughly every split_size."""
+    size = os.path.getsize(file_path)
+    points = [0]
+    with open(file_path, "rb") as f:
+        target = split_size
+        while target < size:
+            f.seek(target - 1)
+            f.readline()  # to the end of the line that contains target - 1
+            point = f.tell()
+            if point >= size:
+                break
+            points.append(point)
+            target = point + split_size
+    points.append(size)
+    return points
+
+class Shard(NamedTuple):
+    path: str
+    start: int
+    end: Optional[int]                          # None: the whole compressed file, read as one stream
+    members: Optional[List[Tuple[int, int]]] = None  # a group of independent compressed members
+    previous: Optional[Tuple[int, int]] = None  # the member just before the group
+
+def list_tasks(paths: List[str], split_size: int = SPLIT_SIZE) -> List[Shard]:
+    tasks = []
+    for path in paths:
+        codec = detect_codec(path)
+        if codec:
+            members = member_ranges(path, codec)
+            if not members or len(members) < 2:
+                tasks.append(Shard(path, 0, None))  # one task reads the whole stream
+                continue
+            previous = None
+            for group in group_members(members, max(split_size // COMPRESSION_GUESS, 1)):
+                tasks.append(Shard(path, group[0][0], group[-1][1], group, previous))
+                previous = group[-1]
+            continue
+        points = split_points(path, split_size)
+        tasks.extend(Shard(path, a, b) for a, b in zip(points, points[1:]) if a < b)
+    return tasks
+
+def read_shard(task: Shard) -> bytes:
+    """
+    The bytes of the lines that start in a shard. A member group does not end at a line
+    boundary: a line cut at its start belongs to the previous group, and one cut at its end
+    is completed from the members that follow.
+    """
+    if task.members is None:
+        if task.end is None:
+            with open_trace(task.path) as f:
+                return f.read()
+        with open(task.path, "rb") as f:
+            f.seek(task.start)
+            return f.read(task.end - task.start)
+    codec = detect_codec(task.path)
+    data = decompress_members(task.path, codec, task.members)
+    if task.previous is not None and not decompress_members(task.path, codec, [task.previous]).endswith(b"\n"):
+        data = data[data.find(b"\n") + 1:] if b"\n" in data else b""  # all inside an earlier line
+    pos = task.end
+    with open(task.path, "rb") as f:
+        while data and not data.endswith(b"\n"):
+            member = next_member(f, codec, pos)
+            if member is None:
+                break
+            following = decompress_members(task.path, codec, [member])
+            data += following[:following.find(b"\n") + 1] if b"\n" in following else following
+            pos = member[1]
+    return data
+
+def _codes(values):
+    """Repetitive strings (levels, components) as array("l") codes plus the distinct values."""
+    index = {}
+    codes = array("l", (index.setdefault(v, len(index)) for v in values))
+    return codes.tobytes(), list(index)
+
+def parse_shard(task: Shard):
+    """
+    Worker: parse the lines of one shard (see read_shard) and return them sorted by time, packed so the batch pickles as a few large objects instead of millions of small
+    strings: epoch ms as array("q") bytes, timestamps and messages as newline-joined text
+    (they come from single lines), levels and components as codes.
+    """
+    text = read_shard(task).decode("utf-8", errors="replace")
+    events = [e for e in map(parse_line, text.split("\n")) if e is not None]
+    if any(events[i].time_ms > events[i + 1].time_ms for i in range(len(events) - 1)):
+        events.sort(key=itemgetter(0))  # stable: equal times keep file order
+    times, stamps, levels, components, messages = zip(*events) if events else ((),) * 5
+    return (len(events), array("q", times).tobytes(), "\n".join(stamps), _codes(levels),
+            _codes(components), "\n".join(messages))
+
+def _batch_events(batch) -> Iterator[TraceEvent]:
+    n, raw_times, stamps, levels, components, messages = batch
+    if not n:
+        return iter(())
+    times = array("q")
+    times.frombytes(raw_times)
+    columns = []
+    for raw_codes, values in (levels, components):
+        codes = array("l")
+        codes.frombytes(raw_codes)
+        columns.append(map(values.__getitem__, codes))
+    return map(TraceEvent._make, zip(times, stamps.split("\n"), *columns, messages.split("\n")))
+
+def _earliest(data: bytes) -> Optional[int]:
+    """A lower bound of the event times in data, from its earliest line timestamp; None without one."""
+    stamps = set(STAMP_PATTERN_BYTES.findall(data))
+    if not stamps:
+        return None
+    standard = [s for s in stamps if len(s) == TRACE.width]  # fixed width: sorts as text
+    candidates = ([min(standard)] if standard else []) + [s for s in stamps if len(s) != TRACE.width]
+    try:
+        return min(time_ms(s.decode("ascii")) for s in candidates)
+    except ValueError:
+        return EARLIEST  # a stamp parse_line would skip: no bound from the text alone
+
+def task_start(task: Shard) -> Optional[int]:
+    """
+    Worker: a lower bound of the event times in one shard; None when it has no event line.
+    A compressed file that cannot be split is scanned as a stream, a block of lines at a time,
+    so its bound costs a second decompression but not its size in memory.
+    """
+    if task.end is not None:
+        return _earliest(read_shard(task))
+    bounds = []
+    with open_trace(task.path, workers=1) as f:
+        for lines in iter(lambda: f.readlines(READ_SIZE), []):
+            bounds.append(_earliest(b"".join(lines)))
+    bounds = [b for b in bounds if b is not None]
+    return min(bounds) if bounds else None
+
+def iter_merged(paths: List[str], workers: Optional[int] = None, split_size: int = SPLIT_SIZE) -> Iterator[TraceEvent]:
+    """
+    All events of all traces in time order (ties keep file, then line, order). A quick first
+    pass finds where each shard starts in time, so the merge streams (see merge_batches) and
+    memory follows the shards that overlap in time, not all of them.
+    """
+    tasks = list_tasks(paths, split_size)
+    if not tasks:
+        return
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        starts = list(pool.map(task_start, tasks))
+        yield from merge_batches(pool, parse_shard, tasks, starts, _batch_events, 2 * workers)
+
+def trace_paths(directory: str, pattern: str = "*.log") -> List[str]:
+    return sorted(p for p in glob.glob(os.path.join(directory, pattern)) if os.path.isfile(p))
+
+def to_frame(events) -> pd.DataFrame:
+    """Events as the Timestamp/Severity/Component/Message frame used by the reporting scripts."""
+    times, levels, components, messages = [], [], [], []
+    for event in events:  # a list, or the merged stream itself
+        times.append(event.time_ms)
+        levels.append(event.level)
+        components.append(event.component)
+        messages.append(event.message)
+    return pd.DataFrame({
+        "Timestamp": pd.to_datetime(pd.Series(times, dtype="int64"), unit="ms"),
+        "Severity": levels,
+        "Component": components,
+        "Message": messages,
+    })
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parse trace files in parallel into one time-ordered stream")
+    parser.add_argument("paths", nargs="+", help="trace files or directories")
+    parser.add_argument("--pattern", default="*.log", help="glob for trace files inside directories")
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: CPU count)")
+    parser.add_argument("--split-mb", type=int, default=SPLIT_SIZE // (1024 * 1024),
+                        help="files larger than this are split into several shards")
+    parser.add_argument("--csv", help="write the merged events to this CSV file")
+    parser.add_argument("--cascades", action="store_true", help="run the cascade detector over the merged stream")
+    args = parser.parse_args()
+
+    paths = []
+    for path in args.paths:
+        paths.extend(trace_paths(path, args.pattern) if os.path.isdir(path) else [path])
+
+    t0 = time.perf_counter()
+    events = iter_merged(paths, args.workers, args.split_mb * 1024 * 1024)
+    if args.cascades:
+        detector = CascadeDetector()
+        count = 0
+        for event in events:
+            count += 1
+            for incident in detector.feed(event):
+                print(incident.describe())
+    else:
+        df = to_frame(list(events))
+        count = len(df)
+        if args.csv:
+            df.to_csv(args.csv, index=False)
+        print(df.head(20).to_string(index=False))
+    elapsed = time.perf_counter() - t0
+    print(f"{count:,} events from {len(paths)} file(s) in {elapsed:.2f}s ({count / max(elapsed, 1e-9):,.0f} events/s)")
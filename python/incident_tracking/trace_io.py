@@ -0,0 +1,264 @@
+"""
+Open plain or compressed traces as one stream, chosen by the file's magic bytes rather than
+its name: gzip (.gz, including multi-member and BGZF files), zstd (.zst, needs the optional
+zstandard package), bz2 and xz. Nothing is decompressed to disk.
+
+Files made of many independent members (BGZF-style gzip, multi-frame zstd such as
+`zstd --rsyncable`, pzstd or concatenated rotations) are split at member boundaries, found
+from the headers without decompressing, and the groups of members are decompressed by a
+thread pool (zlib and zstandard release the GIL), then read back in order.
+
+Usage: python trace_io.py system_trace.log.gz   (prints codec, members and read speed)
+"""
+import argparse
+import bz2
+import gzip
+import io
+import lzma
+import os
+import struct
+import time
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:  # .zst input then raises a clear error
+    zstandard = None
+
+BUFFER_SIZE = 1024 * 1024       # read buffer for all streams
+GROUP_SIZE = 8 * 1024 * 1024    # compressed bytes per parallel task
+MAX_BUFFERED = 256 * 1024 * 1024  # decompressed bytes held ahead of the reader by parallel reads
+MAGIC = {
+    b"\x1f\x8b": "gzip",
+    b"\x28\xb5\x2f\xfd": "zstd",
+    b"BZh": "bz2",
+    b"\xfd7zXZ\x00": "xz",
+}
+
+def detect_codec(file_path: str) -> Optional[str]:
+    with open(file_path, "rb") as f:
+        head = f.read(6)
+    for magic, codec in MAGIC.items():
+        if head.startswith(magic):
+            return codec
+    if len(head) >= 4 and 0x184D2A50 <= struct.unpack("<I", head[:4])[0] <= 0x184D2A5F:
+        return "zstd"  # starts with a skippable frame
+    return None
+
+def gzip_members(f, pos: int = 0, count: Optional[int] = None) -> Optional[List[Tuple[int, int]]]:
+    """
+    (start, end) of every member of a BGZF-style gzip file (or of the first count from pos),
+    read from the BSIZE field each member carries in its header; None if any member lacks it
+    (plain gzip has to be read sequentially to find where a member ends).
+    """
+    members = []
+    f.seek(0, os.SEEK_END)
+    size = f.tell()
+    while pos < size and len(members) != count:
+        f.seek(pos)
+        header = f.read(12)
+        if len(header) < 12 or header[:2] != b"\x1f\x8b" or not header[3] & 0x04:  # FEXTRA
+            return None
+        xlen = struct.unpack("<H", header[10:12])[0]
+        extra = f.read(xlen)
+        bsize = None
+        i = 0
+        while i + 4 <= len(extra):
+            sub_id, sub_len = extra[i:i + 2], struct.unpack("<H", extra[i + 2:i + 4])[0]
+            if sub_id == b"BC" and sub_len == 2:
+                bsize = struct.unpack("<H", extra[i + 4:i + 6])[0]
+            i += 4 + sub_len
+        if bsize is None:
+            return None
+        members.append((pos, pos + bsize + 1))
+        pos += bsize + 1
+    return members
+
+def zstd_frames(f, pos: int = 0, count: Optional[int] = None) -> Optional[List[Tuple[int, int]]]:
+    """(start, end) of every zstd frame (or of the first count from pos), walking frame and block headers only."""
+    frames = []
+    f.seek(0, os.SEEK_END)
+    size = f.tell()
+    while pos < size and len(frames) != count:
+        f.seek(pos)
+        header = f.read(18)
+        if len(header) < 8:
+            return None
+        magic = struct.unpack("<I", header[:4])[0]
+        if 0x184D2A50 <= magic <= 0x184D2A5F:  # skippable frame: magic, size, payload
+            pos += 8 + struct.unpack("<I", header[4:8])[0]
+            continue
+        if magic != 0xFD2FB528:
+            return None
+        descriptor = header[4]
+        single_segment = descriptor & 0x20
+        fcs_size = {0: 1 if single_segment else 0, 1: 2, 2: 4, 3: 8}[descriptor >> 6]
+        dict_size = {0: 0, 1: 1, 2: 2, 3: 4}[descriptor & 0x03]
+        block = pos + 5 + (0 if single_segment else 1) + dict_size + fcs_size
+        while True:
+            f.seek(block)
+            raw = f.read(3)
+            if len(raw) < 3:
+                return None
+            block_header = raw[0] | raw[1] << 8 | raw[2] << 16
+            last, block_type, block_size = block_header & 1, (block_header >> 1) & 3, block_header >> 3
+            block += 3 + (1 if block_type == 1 else block_size)  # RLE blocks store one byte
+            if last:
+                break
+        end = block + (4 if descriptor & 0x04 else 0)  # content checksum
+        frames.append((pos, end))
+        pos = end
+    return frames
+
+def next_member(f, codec: str, pos: int) -> Optional[Tuple[int, int]]:
+    """(start, end) of the gzip member or zstd frame at pos; None at the end of the file."""
+    members = (gzip_members if codec == "gzip" else zstd_frames)(f, pos, 1)
+    return members[0] if members else None
+
+def group_members(members: List[Tuple[int, int]], group_size: int) -> List[List[Tuple[int, int]]]:
+    """Consecutive members in groups of about group_size compressed bytes, one task each."""
+    groups = []
+    for start, end in members:
+        if groups and end - groups[-1][0][0] <= group_size:
+            groups[-1].append((start, end))
+        else:
+            groups.append([(start, end)])
+    return groups
+
+def decompress_members(file_path: str, codec: str, members: List[Tuple[int, int]]) -> bytes:
+    base = members[0][0]
+    with open(file_path, "rb") as f:
+        f.seek(base)
+        data = memoryview(f.read(members[-1][1] - base))
+    if codec == "gzip":
+        return b"".join(zlib.decompress(data[a - base:b - base], 31) for a, b in members)
+    dctx = zstandard.ZstdDecompressor()
+    return b"".join(dctx.decompressobj().decompress(data[a - base:b - base]) for a, b in members)
+
+class _ChunkReader(io.RawIOBase):
+    """Raw stream over an iterator of decompressed chunks, for io.BufferedReader."""
+
+    def __init__(self, chunks: Iterator[bytes]):
+        self._chunks = chunks
+        self._current = memoryview(b"")
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while not self._current:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return 0
+            self._current = memoryview(chunk)
+        n = min(len(buffer), len(self._current))
+        buffer[:n] = self._current[:n]
+        self._current = self._current[n:]
+        return n
+
+    def readall(self):
+        rest = [bytes(self._current)]
+        rest.extend(self._chunks)
+        self._current = memoryview(b"")
+        return b"".join(rest)
+
+    def close(self):
+        if hasattr(self._chunks, "close"):
+            self._chunks.close()  # stops the decompressing generator and its pool
+        super().close()
+
+def _parallel_chunks(file_path: str, codec: str, groups, workers: int) -> Iterator[bytes]:
+    """
+    Decompressed groups in file order. At most `workers` groups are decompressed ahead of the
+    reader, and fewer when they would hold more than MAX_BUFFERED bytes: a finished group counts
+    its decompressed size, a running one its compressed size times the highest ratio seen so far
+    (the first group runs alone to measure it). One group is always allowed, however large.
+    """
+    pool = ThreadPoolExecutor(max_workers=workers)
+    try:
+        pending = deque()  # (future, compressed size)
+        ratio = None
+        groups = iter(groups)
+        group = next(groups, None)
+        while group is not None or pending:
+            while group is not None and len(pending) < workers:
+                size = group[-1][1] - group[0][0]
+                if pending:
+                    if ratio is None:
+                        break
+                    held = sum(len(f.result()) if f.done() else n * ratio for f, n in pending)
+                    if held + size * ratio > MAX_BUFFERED:
+                        break
+                pending.append((pool.submit(decompress_members, file_path, codec, group), size))
+                group = next(groups, None)
+            future, size = pending.popleft()
+            chunk = future.result()
+            ratio = max(ratio or 0, len(chunk) / max(size, 1))
+            yield chunk
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+def member_ranges(file_path: str, codec: Optional[str] = None) -> Optional[List[Tuple[int, int]]]:
+    """Independent members of a gzip/zstd file, or None if it must be read sequentially."""
+    codec = codec or detect_codec(file_path)
+    if codec not in ("gzip", "zstd"):
+        return None
+    with open(file_path, "rb") as f:
+        return gzip_members(f) if codec == "gzip" else zstd_frames(f)
+
+def open_trace(file_path: str, encoding: Optional[str] = None, errors: str = "replace",
+               workers: Optional[int] = None):
+    """
+    Open a trace for reading whatever its compression. Returns a buffered binary stream,
+    or a text stream when encoding is given. workers > 1 (default: CPU count, up to 8)
+    decompresses independent members in parallel; workers=1 always streams sequentially.
+    """
+    codec = detect_codec(file_path)
+    if codec == "zstd" and zstandard is None:
+        raise ImportError(f"{file_path} is zstd-compressed; install the zstandard package to read it")
+    workers = workers or min(8, os.cpu_count() or 1)
+
+    members = member_ranges(file_path, codec) if workers > 1 else None
+    if members and len(members) > 1:
+        chunks = _parallel_chunks(file_path, codec, group_members(members, GROUP_SIZE), workers)
+        stream = io.BufferedReader(_ChunkReader(chunks), buffer_size=BUFFER_SIZE)
+    elif codec == "gzip":
+        stream = io.BufferedReader(gzip.GzipFile(file_path, "rb"), buffer_size=BUFFER_SIZE)
+    elif codec == "zstd":
+        raw = open(file_path, "rb")
+        reader = zstandard.ZstdDecompressor().stream_reader(raw, read_size=BUFFER_SIZE, read_across_frames=True,
+                                                            closefd=True)
+        stream = io.BufferedReader(reader, buffer_size=BUFFER_SIZE)
+    elif codec == "bz2":
+        stream = io.BufferedReader(bz2.BZ2File(file_path, "rb"), buffer_size=BUFFER_SIZE)
+    elif codec == "xz":
+        stream = io.BufferedReader(lzma.LZMAFile(file_path, "rb"), buffer_size=BUFFER_SIZE)
+    else:
+        stream = open(file_path, "rb", buffering=BUFFER_SIZE)
+
+    if encoding is None:
+        return stream
+    return io.TextIOWrapper(stream, encoding=encoding, errors=errors)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Show how a trace will be read and time reading it")
+    parser.add_argument("trace")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    codec = detect_codec(args.trace)
+    members = member_ranges(args.trace, codec)
+    print(f"codec: {codec or 'plain'}, independent members: {len(members) if members else 'n/a (sequential)'}")
+    t0 = time.perf_counter()
+    total = 0
+    with open_trace(args.trace, workers=args.workers) as f:
+        while True:
+            block = f.read(BUFFER_SIZE)
+            if not block:
+                break
+            total += len(block)
+    elapsed = time.perf_counter() - t0
+    print(f"{total / 2**20:,.1f} MiB in {elapsed:.2f}s ({total / 2**20 / max(elapsed, 1e-9):,.1f} MiB/s)")
@@ -0,0 +1,180 @@
+"""
+Live per-component severity rates from a trace, served in Prometheus text format.
+
+Every (component, level) pair gets a RateCounter: a ring of per-second counts covering the
+longest window (15 minutes) plus a running total for each window. Recording an event and
+reading a 1m/5m/15m rate are O(1); moving the clock forward only clears the seconds that
+were skipped. Scrapes render from these counters and never touch the trace again.
+
+Usage: python trace_metrics.py live_trace.log --follow --port 8000
+       curl localhost:8000/metrics
+"""
+import argparse
+import threading
+import time
+from array import array
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+
+from trace_events import TraceEvent, follow_lines, iter_events
+from trace_io import open_trace
+
+WINDOWS = {"1m": 60, "5m": 300, "15m": 900}  # label -> seconds
+
+class RateCounter:
+    def __init__(self, windows: Dict[str, int] = WINDOWS):
+        self.windows = dict(windows)
+        self.size = max(self.windows.values())
+        self.slots = array("q", bytes(8 * self.size))  # slot s % size holds the count for second s
+        self.sums = dict.fromkeys(self.windows, 0)      # events in (head - w, head] per window
+        self.head = None                                # latest second seen
+        self.total = 0
+
+    def advance(self, second: int):
+        """Move the clock to `second`, dropping counts that fall out of each window."""
+        if self.head is None:
+            self.head = second
+            return
+        if second <= self.head:
+            return
+        if second - self.head >= self.size:
+            self.slots = array("q", bytes(8 * self.size))
+            self.sums = dict.fromkeys(self.windows, 0)
+        else:
+            for t in range(self.head + 1, second + 1):
+                for name, width in self.windows.items():
+                    self.sums[name] -= self.slots[(t - width) % self.size]
+                self.slots[t % self.size] = 0
+        self.head = second
+
+    def add(self, second: int, count: int = 1):
+        self.advance(second)
+        self.total += count
+        age = self.head - second  # > 0 for a late (out-of-order) event
+        if age >= self.size:
+            return
+        self.slots[second % self.size] += count
+        for name, width in self.windows.items():
+            if age < width:
+                self.sums[name] += count
+
+    def rate(self, window: str) -> float:
+        """Events per second over the window ending at the latest second."""
+        return self.sums[window] / self.windows[window]
+
+class TraceMetrics:
+    """
+    Counters for all (component, level) pairs, safe to update from a reader thread while
+    the HTTP server renders them. The clock is the latest trace time seen, so replaying an
+    old trace gives the rates as they were at its end; with wall_clock=True it is the
+    current time on the trace's clock (see trace_now). Either way every series is aged to the same clock when rendered, so a
+    component that went quiet decays to 0.
+    """
+
+    def __init__(self, windows: Dict[str, int] = WINDOWS, wall_clock: bool = False):
+        self.windows = dict(windows)
+        self.wall_clock = wall_clock
+        self.counters: Dict[Tuple[str, str], RateCounter] = {}
+        self.lines = 0
+        self.clock = None  # latest trace second
+        self._lock = threading.Lock()
+
+    def observe(self, event: TraceEvent):
+        key = (event.component, event.level)
+        with self._lock:
+            counter = self.counters.get(key)
+            if counter is None:
+                counter = self.counters[key] = RateCounter(self.windows)
+            second = event.time_ms // 1000
+            counter.add(second)
+            self.lines += 1
+            if self.clock is None or second > self.clock:
+                self.clock = second
+
+    def render(self, now: Optional[float] = None) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        if now is None and self.wall_clock:
+            now = trace_now()
+        with self._lock:
+            if now is None:
+                now = self.clock
+            if now is not None:
+                for counter in self.counters.values():
+                    counter.advance(int(now))
+            series = sorted(self.counters.items())
+            out = [
+                "# HELP trace_events_total Trace events parsed, by component and level.",
+                "# TYPE trace_events_total counter",
+            ]
+            for (component, level), counter in series:
+                out.append(f'trace_events_total{{component="{_label(component)}",level="{_label(level)}"}} {counter.total}')
+            out += [
+                "# HELP trace_event_rate Events per second over a trailing window, by component and level.",
+                "# TYPE trace_event_rate gauge",
+            ]
+            for (component, level), counter in series:
+                for window in self.windows:
+                    out.append(f'trace_event_rate{{component="{_label(component)}",level="{_label(level)}",'
+                               f'window="{window}"}} {counter.rate(window):.6g}')
+            out += [
+                "# HELP trace_lines_observed_total Events fed to the metrics layer.",
+                "# TYPE trace_lines_observed_total counter",
+                f"trace_lines_observed_total {self.lines}",
+            ]
+        return "\n".join(out) + "\n"
+
+def trace_now() -> float:
+    """
+    The current time in the trace's clock. Trace timestamps are local wall-clock times decoded
+    as if they were UTC (trace_events.time_ms), so the local UTC offset is added to the epoch.
+    """
+    now = datetime.now().astimezone()
+    return now.timestamp() + now.utcoffset().total_seconds()
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def serve(metrics: TraceMetrics, host: str = "127.0.0.1", port: int = 8000) -> ThreadingHTTPServer:
+    """Start a background HTTP server answering GET /metrics; call .shutdown() to stop it."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = metrics.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # scrapes every second would flood the console
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve per-component trace severity rates for Prometheus")
+    parser.add_argument("trace", nargs="?", default="system_trace.log")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--follow", action="store_true", help="keep reading as the trace grows")
+    parser.add_argument("--wall-clock", action="store_true", help="age rates by the current time, not the trace's")
+    args = parser.parse_args()
+
+    metrics = TraceMetrics(wall_clock=args.wall_clock)
+    server = serve(metrics, args.host, args.port)
+    print(f"Serving http://{args.host}:{args.port}/metrics")
+    lines = follow_lines(args.trace) if args.follow else open_trace(args.trace, encoding="utf-8")
+    for event in iter_events(lines):
+        metrics.observe(event)
+    print(f"Read {metrics.lines:,} events; Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
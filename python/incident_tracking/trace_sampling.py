@@ -0,0 +1,148 @@
+"""
+Severity-aware sampling for high-volume traces: keep every WARN/ERROR/CRITICAL/FATAL event
+and a bounded sample of the rest, so a breadcrumb timeline of a noisy trace still shows what
+was going on around each failure without holding millions of INFO/DEBUG lines.
+
+- Time-stratified reservoir: the trace is cut into windows (default 1 s); in each window
+  every component keeps at most `per_window` lower-severity events, a uniform random sample
+  of all it logged in that window (reservoir sampling, one pass).
+- Failure context: the last `context` lower-severity events of a component before one of its
+  kept events, and the next `context` after it, are kept too.
+
+Windows are released in time order once the trace has moved two windows past them, so memory
+is one reservoir per component for the open windows plus the kept events of those windows.
+The context before a kept event therefore only reaches back into the open windows: events of
+a window already released are not kept (they would come out of time order), so with a quiet
+component the "before" context can be shorter than `context`.
+
+Usage: python trace_sampling.py system_trace.log --per-window 20 --window 1 --context 5
+"""
+import argparse
+import random
+import sys
+from collections import Counter, deque
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from trace_events import TraceEvent, iter_events, level_rank
+from trace_io import open_trace
+
+class _Window:
+    __slots__ = ("kept", "reservoirs")
+
+    def __init__(self):
+        self.kept: Dict[int, TraceEvent] = {}    # sequence number -> event
+        self.reservoirs: Dict[str, list] = {}    # component -> [events seen, [(seq, event), ...]]
+
+class SeveritySampler:
+    def __init__(self, keep_level: str = "WARN", per_window: int = 20, window: float = 1.0,
+                 context: int = 5, seed: Optional[int] = None):
+        if per_window < 0 or context < 0 or window <= 0:
+            raise ValueError("per_window and context must be >= 0 and window > 0")
+        self.keep_rank = level_rank(keep_level)
+        self.per_window = per_window
+        self.window_ms = int(window * 1000) or 1
+        self.context = context
+        self.random = random.Random(seed)
+        self.seen: Counter = Counter()     # level -> events fed
+        self.kept: Counter = Counter()     # level -> events released
+        self._windows: Dict[int, _Window] = {}
+        self._latest: Optional[int] = None
+        self._recent: Dict[str, deque] = {}  # component -> (seq, window, event) not yet forced
+        self._after: Dict[str, int] = {}     # component -> context events still to force
+        self._seq = 0
+
+    def feed(self, event: TraceEvent) -> List[TraceEvent]:
+        """Take one event; returns the kept events of windows that are now complete, window by window."""
+        self.seen[event.level] += 1
+        released = []
+        window_id = event.time_ms // self.window_ms
+        if self._latest is None or window_id > self._latest:
+            released = self._release(window_id - 2)
+            self._latest = window_id
+        else:
+            window_id = max(window_id, min(self._windows, default=window_id))  # late events join an open window
+        window = self._windows.get(window_id)
+        if window is None:
+            window = self._windows[window_id] = _Window()
+        seq = self._seq
+        self._seq += 1
+        component = event.component
+
+        if event.rank >= self.keep_rank:
+            window.kept[seq] = event
+            recent = self._recent.get(component)
+            if recent:
+                for s, w, e in recent:
+                    if w in self._windows:  # released windows are out: see the module docstring
+                        self._windows[w].kept[s] = e
+                recent.clear()
+            self._after[component] = self.context
+            return released
+
+        if self._after.get(component):
+            self._after[component] -= 1
+            window.kept[seq] = event
+            return released
+
+        if self.per_window:
+            reservoir = window.reservoirs.get(component)
+            if reservoir is None:
+                reservoir = window.reservoirs[component] = [0, []]
+            reservoir[0] += 1
+            sample = reservoir[1]
+            if len(sample) < self.per_window:
+                sample.append((seq, event))
+            else:
+                j = self.random.randrange(reservoir[0])
+                if j < self.per_window:
+                    sample[j] = (seq, event)
+        if self.context:
+            recent = self._recent.get(component)
+            if recent is None:
+                recent = self._recent[component] = deque(maxlen=self.context)
+            recent.append((seq, window_id, event))
+        return released
+
+    def _release(self, upto: Optional[int] = None) -> List[TraceEvent]:
+        released = []
+        for window_id in sorted(w for w in self._windows if upto is None or w <= upto):
+            window = self._windows.pop(window_id)
+            events = window.kept
+            for _, sample in window.reservoirs.values():
+                events.update(sample)
+            for seq in sorted(events):
+                released.append(events[seq])
+        for event in released:
+            self.kept[event.level] += 1
+        return released
+
+    def flush(self) -> List[TraceEvent]:
+        """Events of all windows still open; call at the end of the trace."""
+        return self._release()
+
+    def run(self, events: Iterable[TraceEvent]) -> Iterator[TraceEvent]:
+        for event in events:
+            yield from self.feed(event)
+        yield from self.flush()
+
+    def summary(self) -> str:
+        seen, kept = sum(self.seen.values()), sum(self.kept.values())
+        levels = ", ".join(f"{level} {self.kept[level]:,}/{count:,}" for level, count in
+                           sorted(self.seen.items(), key=lambda item: -level_rank(item[0])))
+        return f"kept {kept:,} of {seen:,} events ({levels})"
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Print a trace with lower-severity lines sampled")
+    parser.add_argument("trace", nargs="?", default="system_trace.log")
+    parser.add_argument("--keep-level", default="WARN", help="this level and above are always kept")
+    parser.add_argument("--per-window", type=int, default=20, help="lower-severity events kept per component per window")
+    parser.add_argument("--window", type=float, default=1.0, help="window length in seconds")
+    parser.add_argument("--context", type=int, default=5, help="events kept before and after each kept event")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    sampler = SeveritySampler(args.keep_level, args.per_window, args.window, args.context, args.seed)
+    with open_trace(args.trace, encoding="utf-8") as f:
+        for event in sampler.run(iter_events(f)):
+            print(f"[{event.timestamp}] {event.level} - [{event.component}] {event.message}")
+    print(f"# {sampler.summary()}", file=sys.stderr)
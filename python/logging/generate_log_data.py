@@ -0,0 +1,67 @@
+import argparse
+import math
+import random
+from datetime import datetime, timedelta
+
+# Vocabulary for synthetic entries. Words are drawn with Zipf-like weights, so a few are
+# very common ("the", "service") and most are rare, which is what keyword filters see in
+# real journals. A handful of multi-word phrases ("segmentation fault") are mixed in.
+COMMON_WORDS = (
+    "the to and of a in for on with is service user system update run check config set "
+    "build test deploy log file data network disk memory process task job queue cache"
+).split()
+TECH_WORDS = (
+    "make nvcc gcc cmake docker kubectl git ssh sudo apt pip python cuda kernel driver "
+    "mount fstab systemd nginx postgres redis kafka grpc tls cert token secret mfa "
+    "threat model asset mitigation patch upgrade rollback backup restore snapshot"
+).split()
+PHRASES = [
+    "segmentation fault", "disk usage exceeded 90%", "user login detected",
+    "security scan initiated", "maintenance window started", "connection refused",
+    "out of memory", "permission denied", "build succeeded", "build failed",
+]
+VOCABULARY = COMMON_WORDS + TECH_WORDS + PHRASES
+WEIGHTS = [1.0 / (rank + 1) ** 1.1 for rank in range(len(VOCABULARY))]
+
+def generate_entries(n: int, seed: int = 0, start: datetime = datetime(2020, 1, 1),
+                     span_days: float = 5 * 365, shuffle_rate: float = 0.01):
+    """
+    Yield n (timestamp, content) pairs spread over roughly span_days, so date filters select
+    a similar share of entries at every size. Gaps between entries are exponential;
+    shuffle_rate of them are written a little out of order, as happens when journals are
+    merged by hand. Content line counts are log-normal (median ~3 lines, occasionally
+    dozens), with 3-14 words per line.
+    """
+    rng = random.Random(seed)
+    mean_gap_sec = span_days * 86400 / max(n, 1)
+    t = start
+    for _ in range(n):
+        t += timedelta(seconds=max(1, int(rng.expovariate(1.0 / mean_gap_sec))))
+        stamp_time = t - timedelta(seconds=rng.randint(1, 3600)) if rng.random() < shuffle_rate else t
+        lines = max(1, min(60, int(rng.lognormvariate(math.log(3), 0.8))))
+        content = "\n".join(
+            " ".join(rng.choices(VOCABULARY, WEIGHTS, k=rng.randint(3, 14))) for _ in range(lines)
+        )
+        yield stamp_time.strftime("%Y-%m-%d_%H%Mhr_%Ssec"), content
+
+def write_journal(path: str, n: int, seed: int = 0, span_days: float = 5 * 365, batch: int = 10000):
+    """Write n entries in the exact [YYYY-MM-DD_HHMMhr_SSsec] + \"\"\" format used by log_filter."""
+    with open(path, "w", encoding="utf-8") as f:
+        buf = []
+        for timestamp, content in generate_entries(n, seed, span_days=span_days):
+            buf.append(f'[{timestamp}]\n"""\n{content}\n"""\n\n')
+            if len(buf) == batch:
+                f.writelines(buf)
+                buf = []
+        f.writelines(buf)
+
+# Sample usage: python generate_log_data.py synthetic_log.txt --entries 1000000 --seed 42
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write a seeded synthetic log journal")
+    parser.add_argument("output", nargs="?", default="synthetic_log_data.txt")
+    parser.add_argument("--entries", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--span-days", type=float, default=5 * 365, help="time range covered by the entries")
+    args = parser.parse_args()
+    write_journal(args.output, args.entries, args.seed, args.span_days)
+    print(f"Wrote {args.entries:,} entries to {args.output}")
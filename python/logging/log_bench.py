@@ -0,0 +1,185 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from multiprocessing import get_context
+
+try:
+    import resource
+except ImportError:  # not available on Windows; peak RSS is then reported as null
+    resource = None
+
+from generate_log_data import write_journal
+
+DEFAULT_SIZES = [10_000, 1_000_000, 10_000_000]
+
+# Queries timed against every parser that yields an indexed entry list.
+QUERIES = {
+    "date:year": dict(date_filter="2021"),
+    "date:year-range": dict(date_filter="2020-2021"),
+    "date:month": dict(date_filter="2021-03"),
+    "date:day": dict(date_filter="2021-03-15"),
+    "date:month-range": dict(date_filter="05-09"),
+    "keyword:substring": dict(keyword_filter=["nvcc"]),
+    "keyword:and": dict(keyword_filter=["make", "cuda"]),
+    "keyword:phrase": dict(keyword_filter=["segmentation fault"]),
+    "keyword:token": dict(keyword_filter=["docker"], keyword_mode="token"),
+    "entry_nums": dict(entry_nums=[1, 2, 3, 1000]),
+    "latest": dict(latest=True),
+    "combined": dict(date_filter="2021", keyword_filter=["kernel", "patch"], latest=True),
+}
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+def percentiles(samples_ms):
+    if len(samples_ms) < 2:
+        value = samples_ms[0] if samples_ms else None
+        return {"p50": value, "p90": value, "p99": value}
+    cuts = statistics.quantiles(samples_ms, n=100, method="inclusive")
+    return {"p50": cuts[49], "p90": cuts[89], "p99": cuts[98]}
+
+def time_queries(entries, repeats: int):
+    from log_filter import filter_logs
+
+    results = {}
+    for name, kwargs in QUERIES.items():
+        t0 = time.perf_counter()
+        rows = len(filter_logs(entries, **kwargs))  # first call also builds any lazy index
+        cold = (time.perf_counter() - t0) * 1000
+        samples = []
+        for _ in range(repeats):
+            t0 = time.perf_counter()
+            filter_logs(entries, **kwargs)
+            samples.append((time.perf_counter() - t0) * 1000)
+        results[name] = {"rows": rows, "cold_ms": cold, **{f"{k}_ms": v for k, v in percentiles(samples).items()}}
+    return results
+
+def run_stage(stage: str, path: str, repeats: int):
+    """Runs in a fresh process, so peak RSS belongs to this stage alone."""
+    import log_cache
+    import log_filter
+    import log_store
+
+    size = os.path.getsize(path)
+    t0 = time.perf_counter()
+    if stage == "parse_logs":
+        with open(path, "r", encoding="utf-8") as f:
+            entries = log_filter.parse_logs(f.read())
+    elif stage == "parse_log_file":
+        entries = log_filter.parse_log_file(path)
+    elif stage == "entry_table":
+        entries = log_store.EntryTable(path)
+    elif stage == "menu_cold":
+        cache_path = path + ".bench.cache"
+        if os.path.exists(cache_path):
+            os.remove(cache_path)
+        entries = log_cache.load_entries(path, cache_path)
+    elif stage == "menu_warm":
+        cache_path = path + ".bench.cache"
+        if not os.path.exists(cache_path):
+            log_cache.load_entries(path, cache_path)
+        t0 = time.perf_counter()
+        entries = log_cache.load_entries(path, cache_path)
+    else:
+        raise ValueError(f"unknown stage {stage}")
+    elapsed = time.perf_counter() - t0
+
+    result = {
+        "seconds": elapsed,
+        "entries": len(entries),
+        "mb_per_s": size / (1024 * 1024) / elapsed if elapsed else None,
+        "entries_per_s": len(entries) / elapsed if elapsed else None,
+    }
+    if stage in ("parse_log_file", "entry_table") and repeats:
+        result["filters"] = time_queries(entries, repeats)
+    result["peak_rss_mb"] = peak_rss_mb()
+    return result
+
+STAGES = ["parse_logs", "parse_log_file", "entry_table", "menu_cold", "menu_warm"]
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True,
+                                       stderr=subprocess.DEVNULL, cwd=os.path.dirname(os.path.abspath(__file__))).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run(sizes, stages, repeats: int, seed: int, workdir: str):
+    os.makedirs(workdir, exist_ok=True)
+    report = {
+        "meta": {
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "started": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "seed": seed,
+        },
+        "results": {},
+    }
+    spawn = get_context("spawn")
+    for n in sizes:
+        path = os.path.join(workdir, f"synthetic_{n}_seed{seed}.txt")
+        if not os.path.exists(path):
+            print(f"Generating {n:,} entries -> {path}")
+            write_journal(path, n, seed)
+        size_mb = os.path.getsize(path) / (1024 * 1024)
+        report["results"][str(n)] = {"file_mb": size_mb}
+        for stage in stages:
+            with ProcessPoolExecutor(max_workers=1, mp_context=spawn) as pool:
+                result = pool.submit(run_stage, stage, path, repeats).result()
+            report["results"][str(n)][stage] = result
+            print(f"{n:>11,} {stage:<15} {result['seconds']:8.2f}s {result['mb_per_s']:8.1f} MB/s "
+                  f"{result['entries_per_s']:>12,.0f} entries/s  peak {result['peak_rss_mb'] or 0:8.1f} MB")
+            for name, q in result.get("filters", {}).items():
+                print(f"{'':>28}{name:<18} rows={q['rows']:<9} cold={q['cold_ms']:9.2f}ms "
+                      f"p50={q['p50_ms']:8.3f}ms p90={q['p90_ms']:8.3f}ms p99={q['p99_ms']:8.3f}ms")
+    return report
+
+def compare(report, baseline):
+    """Print current/baseline ratios for the headline numbers (lower is better for time and memory)."""
+    print(f"\nCompared with {baseline['meta'].get('revision')} ({baseline['meta'].get('started')}):")
+    for n, stages in report["results"].items():
+        for stage, result in stages.items():
+            old = baseline["results"].get(n, {}).get(stage)
+            if not isinstance(result, dict) or not old:
+                continue
+            line = f"{int(n):>11,} {stage:<15} time x{result['seconds'] / old['seconds']:.2f}"
+            if result.get("peak_rss_mb") and old.get("peak_rss_mb"):
+                line += f"  rss x{result['peak_rss_mb'] / old['peak_rss_mb']:.2f}"
+            print(line)
+            for name, q in result.get("filters", {}).items():
+                old_q = old.get("filters", {}).get(name)
+                if old_q and old_q["p50_ms"]:
+                    print(f"{'':>28}{name:<18} p50 x{q['p50_ms'] / old_q['p50_ms']:.2f}")
+
+# Sample usage: python log_bench.py --sizes 10000 1000000 --output bench_results.json
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the logging parsers and filters on synthetic journals")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES)
+    parser.add_argument("--repeats", type=int, default=50, help="timed runs per filter query")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workdir", default="bench_data", help="where generated journals are kept between runs")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--compare", help="earlier results JSON to compare against")
+    args = parser.parse_args()
+
+    report = run(args.sizes, args.stages, args.repeats, args.seed, args.workdir)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results saved to {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(report, json.load(f))
@@ -0,0 +1,135 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from log_store import EntryTable, scan_columns
+
+CACHE_VERSION = 2
+CACHE_SUFFIX = ".cache"   # sidecar next to the journal, e.g. log_data.txt.cache
+HEADER_BYTES = 4096       # JSON header, padded with spaces; the records follow it
+HEAD_BYTES = 64 * 1024    # how much of the file start is hashed to detect a rewrite
+ANCHOR_BYTES = 4 * 1024   # bytes just before the resume offset, hashed for the same reason
+HEADER_KEYS = ("size", "mtime", "offset", "count", "sorted", "head_len", "head", "anchor")
+
+# One record per entry, in journal order: epoch seconds and the content's byte range.
+RECORD = np.dtype([("epoch", "<i8"), ("offset", "<i8"), ("length", "<i8")])
+
+def _digest(data, start: int, stop: int) -> str:
+    return hashlib.blake2b(data[start:stop], digest_size=16).hexdigest()
+
+def _read_header(cache_path: str):
+    try:
+        with open(cache_path, "rb") as f:
+            header = json.loads(f.read(HEADER_BYTES))
+            size = os.fstat(f.fileno()).st_size
+    except (OSError, ValueError):
+        return None
+    if not isinstance(header, dict) or header.get("version") != CACHE_VERSION \
+            or not all(key in header for key in HEADER_KEYS):
+        return None
+    if not all(isinstance(header[key], int) for key in ("size", "mtime", "offset", "count", "head_len")):
+        return None
+    if HEADER_BYTES + header["count"] * RECORD.itemsize > size:
+        return None  # records missing: an append was cut short
+    return header
+
+def _records(cache_path: str, count: int) -> np.ndarray:
+    if not count:
+        return np.zeros(0, RECORD)
+    return np.memmap(cache_path, RECORD, "r", offset=HEADER_BYTES, shape=(count,))
+
+def _write_cache(cache_path: str, header: dict, records: np.ndarray, append: bool):
+    """
+    Append records after the first header["count"] - len(records) ones and then rewrite the
+    header, so an interrupted append leaves the old count; a new cache goes through a temp file.
+    """
+    encoded = json.dumps({"version": CACHE_VERSION, **header}).encode("utf-8").ljust(HEADER_BYTES)
+    if append:
+        with open(cache_path, "r+b") as f:
+            f.seek(HEADER_BYTES + (header["count"] - len(records)) * RECORD.itemsize)
+            f.write(records.tobytes())
+            f.truncate()
+            f.seek(0)
+            f.write(encoded)
+        return
+    tmp_path = f"{cache_path}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(encoded)
+            f.write(records.tobytes())
+        os.replace(tmp_path, cache_path)  # readers never see a half-written cache
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+def _still_valid(data, header: dict) -> bool:
+    """True if the journal is the cached one with (possibly) bytes appended to it."""
+    if len(data) < header["size"]:
+        return False  # truncated
+    offset = header["offset"]
+    return (_digest(data, 0, header["head_len"]) == header["head"]
+            and _digest(data, max(0, offset - ANCHOR_BYTES), offset) == header["anchor"])
+
+def _columns(records: np.ndarray, in_order: bool):
+    if not in_order:
+        records = records[np.argsort(records["epoch"], kind="stable")]
+    return records["epoch"], records["offset"], records["length"]
+
+def _cached_columns(data, mtime: int, cache_path: str):
+    header = _read_header(cache_path)
+    if header and _still_valid(data, header):
+        if header["size"] == len(data) and header["mtime"] == mtime:
+            return _columns(_records(cache_path, header["count"]), header["sorted"])
+        count, offset, in_order = header["count"], header["offset"], header["sorted"]
+    else:
+        count, offset, in_order = 0, 0, True
+
+    old = _records(cache_path, count)
+    epochs, offsets, lengths, offset = scan_columns(data, offset)
+    new = np.empty(len(epochs), RECORD)
+    new["epoch"], new["offset"], new["length"] = epochs, offsets, lengths
+    if len(new):
+        ascending = np.all(new["epoch"][1:] >= new["epoch"][:-1])
+        in_order = bool(in_order and ascending and (not count or old["epoch"][-1] <= new["epoch"][0]))
+
+    head_len = min(HEAD_BYTES, offset)
+    header = {
+        "size": len(data),
+        "mtime": mtime,
+        "offset": offset,
+        "count": count + len(new),
+        "sorted": in_order,
+        "head_len": head_len,
+        "head": _digest(data, 0, head_len),
+        "anchor": _digest(data, max(0, offset - ANCHOR_BYTES), offset),
+    }
+    try:
+        _write_cache(cache_path, header, new, append=count > 0)
+        records = _records(cache_path, header["count"])
+    except OSError:
+        # Best effort: a read-only directory or a full disk only costs the speed-up.
+        records = np.concatenate([old, new])
+    return _columns(records, in_order)
+
+def load_entries(file_path: str, cache_path: str = None) -> EntryTable:
+    """
+    Return the sorted entries of an append-only journal as an EntryTable, with its columns
+    (epoch, content offset and length per entry) kept in a sidecar cache. The cache is keyed
+    on file size, mtime and a hash of the file head (plus the bytes just before the last
+    parsed offset):
+    - unchanged file: the columns are mapped from the cache, whatever the journal's length,
+    - appended file: only bytes after the last complete entry are parsed, and their records
+      appended to the cache,
+    - truncated or rewritten file: the cache is discarded and rebuilt from byte 0.
+    Records are kept in journal order; a journal with out-of-order entries is sorted with
+    one argsort on load. The cache is best-effort: if it cannot be written the entries are
+    still returned.
+    """
+    cache_path = cache_path or file_path + CACHE_SUFFIX
+    mtime = os.stat(file_path).st_mtime_ns  # before mapping: a later append only looks stale
+    return EntryTable(file_path, columns=lambda data: _cached_columns(data, mtime, cache_path))
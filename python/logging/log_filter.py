@@ -1,20 +1,89 @@
+import os
 import re
+import sys
 from datetime import datetime
 from typing import List, Optional
 
+from log_index import EntryList
+from log_query import LogQuery, date_predicate, date_ranges  # date_* re-exported for callers
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from timestamp_codec import JOURNAL, decode  # shared with incident_tracking
+
 LOG_PATTERN = re.compile(r"\[(\d{4}-\d{2}-\d{2}_\d{4}hr_\d{2}sec)]\n+\"\"\"(.*?)\"\"\"", re.DOTALL)
 
+# Byte-level patterns for the streaming parser. "\r?\n" keeps CRLF journals working in binary mode,
+# which text mode used to handle through universal newlines.
+LOG_PATTERN_BYTES = re.compile(rb"\[(\d{4}-\d{2}-\d{2}_\d{4}hr_\d{2}sec)](?:\r?\n)+\"\"\"(.*?)\"\"\"", re.DOTALL)
+HEADER_PATTERN_BYTES = re.compile(rb"\[\d{4}-\d{2}-\d{2}_\d{4}hr_\d{2}sec](?:\r?\n)+\"\"\"")
+
+CHUNK_SIZE = 1 << 20  # 1 MiB reads
+
+def make_entry(timestamp: str, content: str):
+    return {
+        "datetime": decode(timestamp, JOURNAL),
+        "timestamp": timestamp,
+        "content": content.strip()
+    }
+
 def parse_logs(text: str):
-    matches = LOG_PATTERN.findall(text)
-    entries = []
-    for timestamp, content in matches:
-        ts_clean = timestamp.replace("hr", "").replace("sec", "").replace("_", " ").replace("-", " ")
-        dt = datetime.strptime(ts_clean, "%Y %m %d %H%M %S")
-        entries.append({
-            "datetime": dt,
-            "timestamp": timestamp,
-            "content": content.strip()
-        })
+    entries = [make_entry(timestamp, content) for timestamp, content in LOG_PATTERN.findall(text)]
+    entries.sort(key=lambda x: x["datetime"])
+    return EntryList(entries)
+
+def iter_log_spans(f, chunk_size: int = CHUNK_SIZE):
+    """
+    Scan a binary file object in fixed-size chunks and yield every complete entry as
+    (timestamp, content_bytes, start, end), where start/end are absolute byte offsets of the
+    whole entry (header to closing quotes).
+
+    Only the unfinished tail of the buffer is carried over between reads, so an entry whose
+    header or \"\"\" block straddles a chunk boundary is picked up once the rest arrives, and
+    memory stays bounded by chunk_size plus the largest single entry.
+    """
+    base = f.tell()
+    buf = b""
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            break
+        buf += chunk
+
+        pos = 0
+        for m in LOG_PATTERN_BYTES.finditer(buf):
+            yield m.group(1).decode("ascii"), m.group(2), base + m.start(), base + m.end()
+            pos = m.end()
+
+        # Keep from the first header whose block is still open; otherwise from the last "[",
+        # which may be the start of a header cut by the chunk boundary.
+        header = HEADER_PATTERN_BYTES.search(buf, pos)
+        if header:
+            keep = header.start()
+        else:
+            keep = buf.rfind(b"[", pos)
+            if keep < 0:
+                keep = len(buf)
+        base += keep
+        buf = buf[keep:]
+
+def decode_content(content: bytes) -> str:
+    text = content.decode("utf-8", errors="replace")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n")
+    return text
+
+def iter_logs(file_path: str, chunk_size: int = CHUNK_SIZE):
+    """
+    Stream entries from a journal file one at a time, in file order, with the same dict shape
+    as parse_logs. Memory use does not grow with the file size.
+    """
+    with open(file_path, "rb") as f:
+        for timestamp, content, _, _ in iter_log_spans(f, chunk_size):
+            yield make_entry(timestamp, decode_content(content))
+
+def parse_log_file(file_path: str, chunk_size: int = CHUNK_SIZE):
+    """Like parse_logs, but streams the file instead of reading it into one string first."""
+    entries = EntryList(iter_logs(file_path, chunk_size))
     entries.sort(key=lambda x: x["datetime"])
     return entries
 
@@ -23,44 +92,17 @@ def filter_logs(
     date_filter: Optional[str] = None,
     keyword_filter: Optional[List[str]] = None,
     entry_nums: Optional[List[int]] = None,
-    latest: bool = False
+    latest: bool = False,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    keyword_mode: str = "substring"
 ):
-    result = entries
-
-    if date_filter:
-        if "-" in date_filter:
-            # handle range
-            parts = date_filter.split("-")
-            if len(parts) == 2 and len(parts[0]) == 4 and len(parts[1]) == 4:
-                y_start, y_end = int(parts[0]), int(parts[1])
-                result = [e for e in result if y_start <= e["datetime"].year <= y_end]
-            elif len(parts[0]) == 2 and len(parts[1]) == 2:
-                m_start, m_end = int(parts[0]), int(parts[1])
-                result = [e for e in result if m_start <= e["datetime"].month <= m_end]
-        elif len(date_filter) == 10:
-            target = datetime.strptime(date_filter, "%Y-%m-%d").date()
-            result = [e for e in result if e["datetime"].date() == target]
-        elif len(date_filter) == 7:
-            y, m = map(int, date_filter.split("-"))
-            result = [e for e in result if e["datetime"].year == y and e["datetime"].month == m]
-        elif len(date_filter) == 4:
-            y = int(date_filter)
-            result = [e for e in result if e["datetime"].year == y]
-
-    if keyword_filter:
-        keywords = [k.lower() for k in keyword_filter]
-        result = [
-            e for e in result
-            if all(kw in e["content"].lower() for kw in keywords)
-        ]
-
-    if entry_nums:
-        result = [entries[i-1] for i in entry_nums if 0 < i <= len(entries)]
-
-    if latest:
-        result = [result[-1]] if result else []
-
-    return result
+    # entries must be sorted by datetime, as returned by parse_logs / parse_log_file.
+    # keyword_mode is one of log_index.KEYWORD_MODES; see keyword_match.
+    # All filters are combined (AND) into one LogQuery plan; entry_nums count from 1 in the
+    # full sorted list and keep the order given.
+    query = LogQuery(date_filter, keyword_filter, entry_nums, latest, since, until, keyword_mode)
+    return query.run(entries)
 
 def print_entries(entries):
     for entry in entries:
@@ -71,10 +113,7 @@ def print_entries(entries):
 
 # Sample usage
 if __name__ == "__main__":
-    with open("log_data.txt", "r") as f:  # replace with the actual file path
-        raw_text = f.read()
-
-    all_entries = parse_logs(raw_text)
+    all_entries = parse_log_file("log_data.txt")  # replace with the actual file path
 
     # Guided example: filter by May to Sep
     logs = filter_logs(all_entries, date_filter="05-09")
@@ -106,3 +145,8 @@ if __name__ == "__main__":
     print("Latest Entry:")
     print_entries(logs)
 
+
+    # Guided example: show how a combined query is planned and where the time went
+    query = LogQuery(date_filter="2025-05", keyword_filter=["automation"], latest=True)
+    print_entries(query.run(all_entries))
+    print(query.explain())
@@ -1,48 +1,33 @@
 from datetime import datetime
-import re
 import os
 
+from log_cache import load_entries
+from log_filter import filter_logs as query_logs
+
 # Constants
 LOG_FILE = "log_data.txt"  # Replace with your actual log file name
-TIMESTAMP_REGEX = r"\[(\d{4}-\d{2}-\d{2}_\d{4}hr_\d{2}sec)\]"
 
-# Function to parse logs
+# Function to parse logs: columns mapped from the sidecar cache, only newly appended entries are parsed
 def parse_logs(file_path):
-    with open(file_path, "r", encoding="utf-8") as f:
-        content = f.read()
-
-    entries = re.findall(rf"{TIMESTAMP_REGEX}\n+\"\"\"(.*?)\"\"\"", content, re.DOTALL)
-    parsed = [
-        (datetime.strptime(ts, "%Y-%m-%d_%H%Mhr_%Ssec"), msg.strip())
-        for ts, msg in entries
-    ]
-    parsed.sort(key=lambda x: x[0])  # Ensure sorted by time
-    return parsed
+    return load_entries(file_path)
 
 # Function to filter logs
 def filter_logs(logs, option):
     if option == "1":  # Latest update
-        return [logs[-1]]
+        return [logs[-1]] if logs else []
 
     elif option == "2":  # By year/month or range
         start = input("Enter start date (YYYY-MM or YYYY or YYYY-MM-DD): ").strip()
         end = input("Enter end date (same format): ").strip()
 
-        def date_filter(log):
-            log_date = log[0]
-            fmt = "%Y-%m-%d" if "-" in start and len(start) > 7 else ("%Y-%m" if "-" in start else "%Y")
-            s = datetime.strptime(start, fmt)
-            e = datetime.strptime(end, fmt)
-            return s <= log_date <= e
-
-        return list(filter(date_filter, logs))
+        fmt = "%Y-%m-%d" if "-" in start and len(start) > 7 else ("%Y-%m" if "-" in start else "%Y")
+        s = datetime.strptime(start, fmt)
+        e = datetime.strptime(end, fmt)
+        return query_logs(logs, since=s, until=e)
 
     elif option == "3":  # By keyword(s)
         keywords = input("Enter keywords separated by space: ").strip().lower().split()
-        return [
-            log for log in logs
-            if all(k in log[1].lower() for k in keywords)
-        ]
+        return query_logs(logs, keyword_filter=keywords) if keywords else list(logs)
 
     elif option == "4":  # By entry number
         nums = input("Enter entry numbers separated by space (e.g., 1 2 3): ").strip().split()
@@ -73,8 +58,8 @@ def main():
             break
 
         filtered = filter_logs(logs, choice)
-        for i, (ts, msg) in enumerate(filtered, 1):
-            print(f"\n[{ts.strftime('%Y-%m-%d_%H%Mhr_%Ssec')}]\n\"\"\"\n{msg}\n\"\"\"")
+        for entry in filtered:
+            print(f"\n[{entry['timestamp']}]\n\"\"\"\n{entry['content']}\n\"\"\"")
 
 if __name__ == "__main__":
     main()
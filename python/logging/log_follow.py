@@ -0,0 +1,133 @@
+import argparse
+import os
+import time
+from typing import Callable, List, Optional
+
+from log_filter import decode_content, iter_log_spans, make_entry, print_entries
+from log_index import KEYWORD_MODES, check_keyword_mode, keyword_match
+from log_query import date_predicate
+
+class FollowFilter:
+    """
+    A registered filter whose result is kept up to date one entry at a time.
+    With latest=True only the most recent match is kept, otherwise matches accumulate.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        date_filter: Optional[str] = None,
+        keyword_filter: Optional[List[str]] = None,
+        latest: bool = False,
+        keyword_mode: str = "substring",
+        on_match: Optional[Callable] = None
+    ):
+        self.name = name
+        self.date_match = date_predicate(date_filter) if date_filter else None
+        self.keywords = [k.lower() for k in keyword_filter] if keyword_filter else None
+        self.keyword_mode = check_keyword_mode(keyword_mode)
+        self.latest = latest
+        self.on_match = on_match
+        self.results = []
+
+    def matches(self, entry) -> bool:
+        if self.date_match and not self.date_match(entry["datetime"]):
+            return False
+        if self.keywords and not keyword_match(entry["content"], self.keywords, self.keyword_mode):
+            return False
+        return True
+
+    def update(self, entry) -> bool:
+        if not self.matches(entry):
+            return False
+        if self.latest:
+            # Journals are appended in time order, but keep the newest even if one arrives late.
+            if self.results and entry["datetime"] < self.results[0]["datetime"]:
+                return False
+            self.results = [entry]
+        else:
+            self.results.append(entry)
+        if self.on_match:
+            self.on_match(self, entry)
+        return True
+
+class LogFollower:
+    """
+    tail -f for a journal: every poll reads only the bytes appended since the last complete
+    entry, parses the new entries and runs each registered filter on them. A partially
+    written entry is left for the next poll. If the file is truncated or replaced (rotation),
+    reading restarts from byte 0 of the new file; already accumulated results are kept.
+    """
+
+    def __init__(self, file_path: str, from_end: bool = False):
+        self.file_path = file_path
+        self.filters = {}
+        self.offset = 0
+        self.inode = None
+        if from_end and os.path.exists(file_path):
+            stat = os.stat(file_path)
+            self.offset = stat.st_size
+            self.inode = stat.st_ino
+
+    def add_filter(self, name: str, **kwargs) -> FollowFilter:
+        self.filters[name] = FollowFilter(name, **kwargs)
+        return self.filters[name]
+
+    def results(self, name: str):
+        return self.filters[name].results
+
+    def poll(self):
+        """Parse entries appended since the last poll, update the filters and return the entries."""
+        try:
+            stat = os.stat(self.file_path)
+        except FileNotFoundError:
+            return []  # mid-rotation; try again on the next poll
+        if stat.st_ino != self.inode or stat.st_size < self.offset:
+            self.inode = stat.st_ino
+            self.offset = 0
+        if stat.st_size == self.offset:
+            return []
+
+        new_entries = []
+        with open(self.file_path, "rb") as f:
+            f.seek(self.offset)
+            for timestamp, content, _, end in iter_log_spans(f):
+                entry = make_entry(timestamp, decode_content(content))
+                new_entries.append(entry)
+                for flt in self.filters.values():
+                    flt.update(entry)
+                self.offset = end
+        return new_entries
+
+    def run(self, interval: float = 2.0, max_polls: Optional[int] = None):
+        polls = 0
+        while max_polls is None or polls < max_polls:
+            self.poll()
+            polls += 1
+            time.sleep(interval)
+
+# Sample usage: python log_follow.py log_data.txt --keyword error --date 2025
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Follow a growing log journal and print entries as they match")
+    parser.add_argument("log_file", nargs="?", default="log_data.txt")
+    parser.add_argument("--date", help='date filter, e.g. "2025", "2025-05", "2025-05-10", "1975-2025", "05-09"')
+    parser.add_argument("--keyword", nargs="+", help="all keywords must match")
+    parser.add_argument("--keyword-mode", choices=KEYWORD_MODES, default="substring")
+    parser.add_argument("--latest", action="store_true", help="only report a match if it is the newest so far")
+    parser.add_argument("--interval", type=float, default=2.0, help="seconds between polls")
+    parser.add_argument("--from-end", action="store_true", help="skip entries already in the file")
+    args = parser.parse_args()
+
+    follower = LogFollower(args.log_file, from_end=args.from_end)
+    follower.add_filter(
+        "cli",
+        date_filter=args.date,
+        keyword_filter=args.keyword,
+        latest=args.latest,
+        keyword_mode=args.keyword_mode,
+        on_match=lambda flt, entry: print_entries([entry]),
+    )
+    try:
+        follower.run(args.interval)
+    except KeyboardInterrupt:
+        print(f"\nStopped; {len(follower.results('cli'))} matching entries collected.")
@@ -0,0 +1,300 @@
+import calendar
+import re
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import MAXYEAR, date, datetime
+from functools import cached_property
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+Range = Tuple[int, int]  # half-open [lo, hi) slice of entry positions
+
+TOKEN_PATTERN = re.compile(r"\w+")
+GRAM = 3  # n-gram length for substring lookups
+KEYWORD_MODES = ("substring", "token", "prefix")
+STOP_GRAM_FRACTION = 8  # grams in more than 1 entry in 8 are not indexed
+
+def to_epoch(dt: datetime) -> int:
+    # Journal timestamps carry no zone, so they are treated as wall-clock seconds.
+    return calendar.timegm(dt.timetuple())
+
+def month_start(year: int, month: int) -> int:
+    """
+    Epoch seconds at the start of a month; month 13 is January of the next year. The month
+    after December 9999 (past datetime's range) is the end of that day, so upper bounds hold.
+    """
+    year, month = year + (month - 1) // 12, (month - 1) % 12 + 1
+    if year > MAXYEAR:
+        return to_epoch(datetime(MAXYEAR, 12, 31)) + 86400
+    return to_epoch(datetime(year, month, 1))
+
+class TimeIndex:
+    """
+    Sorted int64 array of epoch seconds, one per entry, in the same order as the entries.
+    Every lookup is a binary search that returns (lo, hi) positions, so the caller only
+    touches the entries that actually match.
+    """
+
+    def __init__(self, entries=(), epochs=None):
+        # Tables that already hold epoch seconds pass them in directly.
+        self.epochs = epochs if epochs is not None else array("q", (to_epoch(e["datetime"]) for e in entries))
+
+    def __len__(self):
+        return len(self.epochs)
+
+    def span(self, start: datetime, stop: datetime) -> Range:
+        """Entries with start <= datetime < stop."""
+        return self.epoch_span(to_epoch(start) + (1 if start.microsecond else 0),
+                               to_epoch(stop) + (1 if stop.microsecond else 0))
+
+    def epoch_span(self, start: int, stop: int) -> Range:
+        """Entries with start <= epoch seconds < stop."""
+        lo = bisect_left(self.epochs, start)
+        return lo, bisect_left(self.epochs, stop, lo)
+
+    def between(self, since: Optional[datetime] = None, until: Optional[datetime] = None) -> Range:
+        """Entries with since <= datetime <= until; either bound may be left open."""
+        lo = 0
+        hi = len(self.epochs)
+        if since is not None:
+            lo = bisect_left(self.epochs, to_epoch(since) + (1 if since.microsecond else 0))
+        if until is not None:
+            hi = bisect_right(self.epochs, to_epoch(until), lo)
+        return lo, max(lo, hi)
+
+    def day(self, d: date) -> Range:
+        start = to_epoch(datetime(d.year, d.month, d.day))
+        return self.epoch_span(start, start + 86400)
+
+    def month(self, year: int, month: int) -> Range:
+        if not 1 <= month <= 12:
+            raise ValueError("month must be in 1..12")
+        return self.epoch_span(month_start(year, month), month_start(year, month + 1))
+
+    def years(self, first: int, last: int) -> Range:
+        if first > last:
+            return 0, 0
+        return self.epoch_span(month_start(first, 1), month_start(last + 1, 1))
+
+    def month_range(self, first: int, last: int) -> List[Range]:
+        """
+        Months first..last of every year in the index. The filter is periodic, so it resolves
+        to one slice per year between the oldest and newest entry (empty slices dropped).
+        """
+        if not len(self.epochs) or not (1 <= first <= last <= 12):
+            return []
+        oldest = time.gmtime(self.epochs[0]).tm_year
+        newest = time.gmtime(self.epochs[-1]).tm_year
+        ranges = []
+        for year in range(oldest, newest + 1):
+            lo, hi = self.epoch_span(month_start(year, first), month_start(year, last + 1))
+            if lo < hi:
+                ranges.append((lo, hi))
+        return ranges
+
+def check_keyword_mode(mode: str) -> str:
+    if mode not in KEYWORD_MODES:
+        raise ValueError(f"unknown keyword mode {mode!r}; expected one of {KEYWORD_MODES}")
+    return mode
+
+def keyword_match(content: str, keywords: List[str], mode: str = "substring") -> bool:
+    """
+    Check one entry against lowercased keywords (all must match):
+    "substring" - keyword appears anywhere in the content (the original filter_logs behaviour),
+    "token"     - keyword is a whole word,
+    "prefix"    - some word starts with the keyword.
+    """
+    text = content.lower()
+    if mode == "substring":
+        return all(kw in text for kw in keywords)
+    tokens = set(TOKEN_PATTERN.findall(text))
+    if mode == "token":
+        return all(kw in tokens for kw in keywords)
+    check_keyword_mode(mode)
+    return all(any(t.startswith(kw) for t in tokens) for kw in keywords)
+
+def intersect(postings: List[List[int]]) -> List[int]:
+    """AND of sorted posting lists, starting from the rarest so the working set only shrinks."""
+    postings = sorted(postings, key=len)
+    result = postings[0]
+    for other in postings[1:]:
+        if not result:
+            break
+        merged = []
+        lo = 0
+        n = len(other)
+        for i in result:
+            lo = bisect_left(other, i, lo)
+            if lo == n:
+                break
+            if other[lo] == i:
+                merged.append(i)
+        result = merged
+    return list(result)
+
+def intersect_arrays(postings: List[np.ndarray]) -> np.ndarray:
+    """intersect for sorted NumPy posting arrays: each step binary-searches the survivors in the next list."""
+    postings = sorted(postings, key=len)
+    result = postings[0]
+    for other in postings[1:]:
+        if not len(result):
+            break
+        at = np.minimum(np.searchsorted(other, result), len(other) - 1)
+        result = result[other[at] == result] if len(other) else result[:0]
+    return result
+
+def _byte_grams(texts: List[bytes], first_id: int):
+    """(gram code, entry id) of every distinct 3-byte substring of each text, sorted by code then id."""
+    lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+    data = np.frombuffer(b"".join(texts), dtype=np.uint8).astype(np.uint32)
+    if len(data) < GRAM:
+        return np.zeros(0, np.uint64)
+    codes = data[:-2] << 16 | data[1:-1] << 8 | data[2:]
+    owner = np.repeat(np.arange(len(texts), dtype=np.int64), lengths)[:-2]
+    inside = (np.arange(len(codes)) + GRAM) <= np.repeat(np.cumsum(lengths), lengths)[:-2]  # gram within its text
+    pairs = np.sort(codes[inside].astype(np.uint64) << np.uint64(32) | (owner[inside] + first_id).astype(np.uint64))
+    return pairs[np.concatenate([[True], pairs[1:] != pairs[:-1]])]  # repeats within an entry dropped
+
+class GramPostings:
+    """
+    3-byte gram -> sorted entry ids over the UTF-8 encoded, lowercased content, frozen into three
+    NumPy arrays (CSR): the distinct gram codes, their offsets, and the uint32 entry ids.
+    A keyword that is a substring of an entry has all its byte grams in it, so the intersection
+    of its gram postings is a superset of the matches (in bytes as in characters).
+
+    Grams found in more than one entry in STOP_GRAM_FRACTION are not stored: their postings
+    would be most of the index while barely narrowing a search. Built in two passes over blocks
+    of entries (count, then fill), so no per-posting Python objects exist at any point.
+    """
+
+    BLOCK = 8192  # entries per pass; bounds the temporary arrays to tens of MiB
+
+    def __init__(self, entries):
+        n = len(entries)
+        gram_codes, counts = np.zeros(0, np.uint32), np.zeros(0, np.int64)
+        for pairs in self._blocks(entries):
+            codes, block_counts = np.unique((pairs >> np.uint64(32)).astype(np.uint32), return_counts=True)
+            merged = np.concatenate([gram_codes, codes])
+            gram_codes, slot = np.unique(merged, return_inverse=True)
+            counts = np.bincount(slot, weights=np.concatenate([counts, block_counts]),
+                                 minlength=len(gram_codes)).astype(np.int64)
+        keep = counts * STOP_GRAM_FRACTION <= n
+        self.stop_codes = set(gram_codes[~keep].tolist())
+        self.codes = gram_codes[keep]
+        counts = counts[keep]
+        self.offsets = np.concatenate([[0], np.cumsum(counts)])
+        self.ids = np.zeros(self.offsets[-1], dtype=np.uint32)
+        filled = np.zeros(len(self.codes), dtype=np.int64)
+        for pairs in self._blocks(entries):
+            codes = (pairs >> np.uint64(32)).astype(np.uint32)
+            slot = np.searchsorted(self.codes, codes)
+            stored = (slot < len(self.codes)) & (self.codes[np.minimum(slot, len(self.codes) - 1)] == codes)
+            slot, ids = slot[stored], (pairs[stored] & np.uint64(0xFFFFFFFF)).astype(np.uint32)
+            run_start = np.flatnonzero(np.concatenate([[True], slot[1:] != slot[:-1]])) if len(slot) else slot
+            rank = np.arange(len(slot)) - np.repeat(run_start, np.diff(np.append(run_start, len(slot))))
+            self.ids[self.offsets[slot] + filled[slot] + rank] = ids
+            filled[slot[run_start]] += np.diff(np.append(run_start, len(slot)))
+
+    def _blocks(self, entries):
+        for first in range(0, len(entries), self.BLOCK):
+            texts = [entries[i]["content"].lower().encode("utf-8")
+                     for i in range(first, min(first + self.BLOCK, len(entries)))]
+            yield _byte_grams(texts, first)
+
+    def postings(self, keyword: str) -> List[Optional[np.ndarray]]:
+        """Posting arrays of the keyword's grams; None for a gram too common to be stored."""
+        data = keyword.encode("utf-8")
+        result = []
+        for code in {data[j] << 16 | data[j + 1] << 8 | data[j + 2] for j in range(len(data) - GRAM + 1)}:
+            k = int(np.searchsorted(self.codes, code))
+            if k < len(self.codes) and self.codes[k] == code:
+                result.append(self.ids[self.offsets[k]:self.offsets[k + 1]])
+            elif code in self.stop_codes:
+                result.append(None)
+            else:
+                result.append(self.ids[:0])  # in no entry
+        return result
+
+class KeywordIndex:
+    """
+    Inverted indexes over lowercased entry content, each built on the first query that needs it:
+    tokens - word -> sorted entry ids (array('I')), for "token" and "prefix" lookups,
+    grams  - 3-byte substring -> sorted entry ids (GramPostings), for "substring" lookups.
+    Substring candidates from the gram index are a superset, so they are re-checked against
+    the content; that check only runs on the (usually tiny) intersection.
+    """
+
+    def __init__(self, entries):
+        self.entries = entries
+
+    @cached_property
+    def tokens(self) -> dict:
+        tokens = {}
+        for i, e in enumerate(self.entries):
+            for token in set(TOKEN_PATTERN.findall(e["content"].lower())):
+                postings = tokens.get(token)
+                if postings is None:
+                    postings = tokens[token] = array("I")
+                postings.append(i)
+        return tokens
+
+    @cached_property
+    def grams(self) -> GramPostings:
+        return GramPostings(self.entries)
+
+    @cached_property
+    def vocabulary(self) -> List[str]:
+        return sorted(self.tokens)
+
+    def prefix_postings(self, prefix: str) -> List[int]:
+        lo = bisect_left(self.vocabulary, prefix)
+        ids = set()
+        for token in self.vocabulary[lo:]:
+            if not token.startswith(prefix):
+                break
+            ids.update(self.tokens[token])
+        return sorted(ids)
+
+    def _gram_postings(self, keywords: List[str]) -> list:
+        """Posting arrays of the keywords' stored grams (common grams are left out)."""
+        return [p for k in keywords for p in self.grams.postings(k) if p is not None]
+
+    def estimate(self, keywords: List[str], mode: str = "substring") -> int:
+        """Upper bound on the number of matches: the size of the rarest posting list involved."""
+        keywords = [k.lower() for k in keywords]
+        check_keyword_mode(mode)
+        if mode == "token":
+            return min(len(self.tokens.get(k, ())) for k in keywords)
+        if mode == "prefix":
+            return min(len(self.prefix_postings(k)) for k in keywords)
+        return min(map(len, self._gram_postings(keywords)), default=len(self.entries))
+
+    def search(self, keywords: List[str], mode: str = "substring") -> List[int]:
+        """Sorted ids of the entries matching every keyword, same semantics as keyword_match."""
+        keywords = [k.lower() for k in keywords]
+        check_keyword_mode(mode)
+        if mode == "token":
+            return intersect([self.tokens.get(k, array("I")) for k in keywords])
+        if mode == "prefix":
+            return intersect([self.prefix_postings(k) for k in keywords])
+
+        postings = self._gram_postings(keywords)
+        candidates = intersect_arrays(postings).tolist() if postings else range(len(self.entries))
+        return [i for i in candidates if keyword_match(self.entries[i]["content"], keywords)]
+
+class EntryList(list):
+    """
+    The sorted entry list returned by parse_logs. Indexes are built on first use and kept
+    for the lifetime of the list, so they are paid for once per parse rather than once per
+    query. They are not updated if the list is mutated afterwards.
+    """
+
+    @cached_property
+    def time_index(self) -> TimeIndex:
+        return TimeIndex(self)
+
+    @cached_property
+    def keyword_index(self) -> KeywordIndex:
+        return KeywordIndex(self)
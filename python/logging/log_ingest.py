@@ -0,0 +1,176 @@
+import argparse
+import glob
+import os
+import re
+import sys
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from log_cache import CACHE_SUFFIX
+from log_filter import decode_content, filter_logs, iter_log_spans, print_entries
+from log_index import EntryList
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from batch_merge import merge_batches  # shared with incident_tracking
+from timestamp_codec import JOURNAL, to_epoch_array  # shared with incident_tracking
+
+EPOCH = datetime(1970, 1, 1)
+SPLIT_SIZE = 64 * 1024 * 1024   # files larger than this are cut into several tasks
+SCAN_WINDOW = 1024 * 1024       # bytes read at a time while looking for a split point
+SIDECAR_SUFFIXES = (CACHE_SUFFIX, ".tmp")  # parse caches (log_cache.py, log_bench.py) and their temp files
+STAMP_PATTERN_BYTES = re.compile(rb"\[(\d{4}-\d{2}-\d{2}_\d{4}hr_\d{2}sec)]")
+
+# A safe place to cut a journal: right after an entry's closing quotes and before the next
+# header, so no entry straddles two tasks.
+BOUNDARY_PATTERN = re.compile(
+    rb"\"\"\"[ \t\r\n]*(?=\[\d{4}-\d{2}-\d{2}_\d{4}hr_\d{2}sec](?:\r?\n)+\"\"\")"
+)
+
+class _Window:
+    """File object limited to [start, end), enough for iter_log_spans."""
+
+    def __init__(self, f, end: int):
+        self.f = f
+        self.end = end
+
+    def tell(self):
+        return self.f.tell()
+
+    def read(self, n: int):
+        n = min(n, self.end - self.f.tell())
+        return self.f.read(n) if n > 0 else b""
+
+def split_points(file_path: str, split_size: int = SPLIT_SIZE) -> List[int]:
+    """Byte offsets [0, ..., size] that cut the file at entry boundaries roughly every split_size."""
+    size = os.path.getsize(file_path)
+    points = [0]
+    with open(file_path, "rb") as f:
+        target = split_size
+        while target < size:
+            pos = max(points[-1], target - 3)
+            found = None
+            while pos < size and found is None:
+                f.seek(pos)
+                window = f.read(SCAN_WINDOW + 256)  # overlap so a boundary is never cut in half
+                m = BOUNDARY_PATTERN.search(window)
+                if m:
+                    found = pos + m.end()
+                elif len(window) <= 256:
+                    break
+                else:
+                    pos += SCAN_WINDOW
+            if found is None:
+                break
+            if found > points[-1]:
+                points.append(found)
+            target = max(found, target) + split_size
+    points.append(size)
+    return points
+
+def parse_shard(task):
+    """
+    Worker: parse one (path, start, end) byte range and return a compact batch sorted by time:
+    (epoch seconds as array("q") bytes, timestamps, contents).
+    """
+    file_path, start, end = task
+    stamps = []
+    contents = []
+    with open(file_path, "rb") as f:
+        f.seek(start)
+        for timestamp, content, _, _ in iter_log_spans(_Window(f, end)):
+            stamps.append(timestamp)
+            contents.append(decode_content(content).strip())
+    epochs = to_epoch_array(stamps, JOURNAL, "s")
+    order = sorted(range(len(epochs)), key=epochs.__getitem__)
+    return (
+        array("q", (epochs[i] for i in order)).tobytes(),
+        [stamps[i] for i in order],
+        [contents[i] for i in order],
+    )
+
+def _batch_entries(batch):
+    raw, stamps, contents = batch
+    epochs = array("q")
+    epochs.frombytes(raw)
+    for epoch, timestamp, content in zip(epochs, stamps, contents):
+        yield epoch, timestamp, content
+
+def list_tasks(paths: List[str], split_size: int = SPLIT_SIZE):
+    tasks = []
+    for path in paths:
+        points = split_points(path, split_size)
+        tasks.extend((path, a, b) for a, b in zip(points, points[1:]) if a < b)
+    return tasks
+
+def task_start(task) -> Optional[int]:
+    """
+    Worker: a lower bound of the epochs in one (path, start, end) byte range, from its earliest
+    header-like timestamp (the format sorts as text); None when the range holds no entry.
+    """
+    file_path, start, end = task
+    with open(file_path, "rb") as f:
+        f.seek(start)
+        stamps = STAMP_PATTERN_BYTES.findall(f.read(end - start))
+    if not stamps:
+        return None
+    try:
+        return to_epoch_array([min(stamps).decode("ascii")], JOURNAL, "s")[0]
+    except ValueError:
+        return -(1 << 63)  # not a valid date: merge this batch from the start
+
+def iter_merged(paths: List[str], workers: Optional[int] = None, split_size: int = SPLIT_SIZE):
+    """
+    Parse many journals in a process pool and yield their entries in one time-ordered stream.
+    Each task returns an already sorted batch, so the parent only does a k-way heap merge
+    (ties keep file/task order) instead of sorting everything again. A quick first pass finds
+    where each task starts in time, so the merge streams (see merge_batches) and memory
+    follows the batches that overlap in time, not the whole archive.
+    """
+    tasks = list_tasks(paths, split_size)
+    if not tasks:
+        return
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        starts = list(pool.map(task_start, tasks))
+        merged = merge_batches(pool, parse_shard, tasks, starts, _batch_entries, 2 * workers)
+        for epoch, timestamp, content in merged:
+            yield {
+                "datetime": EPOCH + timedelta(seconds=epoch),
+                "timestamp": timestamp,
+                "content": content
+            }
+
+def journal_paths(directory: str, pattern: str = "*") -> List[str]:
+    """Files matching pattern in directory, without the sidecars written next to journals."""
+    return sorted(p for p in glob.glob(os.path.join(directory, pattern))
+                  if os.path.isfile(p) and not p.endswith(SIDECAR_SUFFIXES))
+
+def ingest_directory(directory: str, pattern: str = "*", workers: Optional[int] = None,
+                     split_size: int = SPLIT_SIZE) -> EntryList:
+    """All journals in a directory merged into one sorted EntryList, ready for filter_logs."""
+    paths = journal_paths(directory, pattern)
+    return EntryList(iter_merged(paths, workers, split_size))
+
+# Sample usage: python log_ingest.py rotated_logs/ --pattern "log_data*.txt" --keyword error
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parse a directory of log journals in parallel")
+    parser.add_argument("directory")
+    parser.add_argument("--pattern", default="*", help='glob for journal files, e.g. "*.txt"')
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: CPU count)")
+    parser.add_argument("--split-mb", type=int, default=SPLIT_SIZE // (1024 * 1024),
+                        help="files larger than this are split into several tasks")
+    parser.add_argument("--date", help="date filter, as in filter_logs")
+    parser.add_argument("--keyword", nargs="+", help="keyword filter, as in filter_logs")
+    parser.add_argument("--latest", action="store_true")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    entries = ingest_directory(args.directory, args.pattern, args.workers, args.split_mb * 1024 * 1024)
+    elapsed = time.perf_counter() - t0
+    print(f"Ingested {len(entries):,} entries in {elapsed:.2f}s ({len(entries) / max(elapsed, 1e-9):,.0f} entries/s)")
+
+    if args.date or args.keyword or args.latest:
+        print_entries(filter_logs(entries, date_filter=args.date, keyword_filter=args.keyword, latest=args.latest))
@@ -0,0 +1,217 @@
+import time
+from bisect import bisect_right
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from log_index import TimeIndex, check_keyword_mode, keyword_match
+
+def parse_date_filter(date_filter: str) -> Tuple[str, tuple]:
+    """
+    A date_filter string as (kind, values), the one parse shared by date_ranges and
+    date_predicate:
+    "YYYY-MM-DD" -> ("day", (date,)), "YYYY" / "YYYY-YYYY" -> ("years", (first, last)),
+    "YYYY-MM" -> ("month", (year, month)), "MM-MM" -> ("months", (first, last)) in every year.
+    Unrecognised filters are ("all", ()).
+    """
+    parts = date_filter.split("-")
+    if len(parts) == 3 and len(date_filter) == 10:
+        return "day", (datetime.strptime(date_filter, "%Y-%m-%d").date(),)
+    if len(parts) == 2 and len(parts[0]) == 4 and len(parts[1]) == 4:
+        return "years", (int(parts[0]), int(parts[1]))
+    if len(parts) == 2 and len(parts[0]) == 4 and len(parts[1]) == 2:
+        return "month", (int(parts[0]), int(parts[1]))
+    if len(parts) == 2 and len(parts[0]) == 2 and len(parts[1]) == 2:
+        return "months", (int(parts[0]), int(parts[1]))
+    if len(parts) == 1 and len(date_filter) == 4:
+        return "years", (int(date_filter), int(date_filter))
+    return "all", ()
+
+def date_ranges(index: TimeIndex, date_filter: str):
+    """Resolve a date_filter string (see parse_date_filter) to (lo, hi) slices of the sorted entries."""
+    kind, values = parse_date_filter(date_filter)
+    if kind == "day":
+        return [index.day(*values)]
+    if kind == "years":
+        return [index.years(*values)]
+    if kind == "month":
+        return [index.month(*values)]
+    if kind == "months":
+        return index.month_range(*values)
+    return [(0, len(index))]
+
+def date_predicate(date_filter: str):
+    """Per-entry form of date_ranges, for entries that are not in an indexed list."""
+    kind, values = parse_date_filter(date_filter)
+    if kind == "day":
+        target, = values
+        return lambda dt: dt.date() == target
+    if kind == "years":
+        first, last = values
+        return lambda dt: first <= dt.year <= last
+    if kind == "month":
+        year, month = values
+        return lambda dt: dt.year == year and dt.month == month
+    if kind == "months":
+        first, last = values
+        return lambda dt: first <= dt.month <= last
+    return lambda dt: True
+
+class Stage:
+    """One step of a plan: how candidates are produced or narrowed, with its estimate and timing."""
+
+    def __init__(self, kind: str, description: str, estimate: int, cost: int = 1):
+        self.kind = kind
+        self.description = description
+        self.estimate = estimate
+        self.cost = cost  # relative per-candidate cost when used as a residual predicate
+        self.elapsed = None
+
+class LogQuery:
+    """
+    The filter_logs predicates compiled into one plan.
+
+    Indexes are used when the entries carry them (EntryList, log_store.EntryTable); plain
+    lists get a throwaway time index and linear keyword scans.
+
+    Every predicate is reduced to entry positions in the sorted list:
+    - entry_nums  -> direct O(1) positions (1-based, in the order given),
+    - date/since/until -> time-index slices (exact counts from the bisect),
+    - keyword     -> posting list from the keyword index (size estimated from the rarest list).
+    The cheapest of these drives the scan; the rest become residual predicates, ordered by
+    estimated pass rate and checked per candidate with short-circuiting, in a single pass.
+    latest is pushed into the scan: candidates are walked newest first and the first one that
+    passes is the answer.
+    """
+
+    def __init__(
+        self,
+        date_filter: Optional[str] = None,
+        keyword_filter: Optional[List[str]] = None,
+        entry_nums: Optional[List[int]] = None,
+        latest: bool = False,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        keyword_mode: str = "substring"
+    ):
+        self.date_filter = date_filter
+        self.keywords = [k.lower() for k in keyword_filter] if keyword_filter else None
+        self.entry_nums = entry_nums
+        self.latest = latest
+        self.since = since
+        self.until = until
+        self.keyword_mode = check_keyword_mode(keyword_mode)
+        self.stages = []
+        self.rows = None
+
+    def _date_ranges(self, entries):
+        index = getattr(entries, "time_index", None)
+        if index is None:
+            index = TimeIndex(entries)
+        ranges = date_ranges(index, self.date_filter) if self.date_filter else [(0, len(entries))]
+        if self.since or self.until:
+            lo, hi = index.between(self.since, self.until)
+            ranges = [(max(a, lo), min(b, hi)) for a, b in ranges if a < hi and b > lo]
+        return [(a, b) for a, b in ranges if a < b]
+
+    def plan(self, entries):
+        """
+        Choose the access path and order the residual predicates.
+        Returns (driver, residuals): driver is (stage, ids) where ids is a sequence of positions
+        in output order (or a callable producing one), residuals a list of (stage, predicate).
+        """
+        self.stages = []
+        n = len(entries)
+        paths = []
+        residuals = []
+
+        if self.entry_nums:
+            ids = [i - 1 for i in self.entry_nums if 0 < i <= n]
+            wanted = set(ids)
+            stage = Stage("lookup", f"entry numbers {self.entry_nums}", len(ids))
+            paths.append((stage, ids, wanted.__contains__))
+
+        if self.date_filter or self.since or self.until:
+            ranges = self._date_ranges(entries)
+            starts = [a for a, _ in ranges]
+            ends = [b for _, b in ranges]
+
+            def in_ranges(i, starts=starts, ends=ends):
+                j = bisect_right(starts, i) - 1
+                return j >= 0 and i < ends[j]
+
+            label = " ".join(filter(None, [
+                f"date {self.date_filter!r}" if self.date_filter else None,
+                f"since {self.since}" if self.since else None,
+                f"until {self.until}" if self.until else None,
+            ]))
+            stage = Stage("range", f"time-index slices for {label} ({len(ranges)} slices)",
+                          sum(b - a for a, b in ranges))
+            paths.append((stage, lambda: [i for a, b in ranges for i in range(a, b)], in_ranges))
+
+        if self.keywords:
+            keywords, mode = self.keywords, self.keyword_mode
+
+            def contains(i):
+                return keyword_match(entries[i]["content"], keywords, mode)
+
+            index = getattr(entries, "keyword_index", None)
+            if index is not None:
+                stage = Stage("postings", f"keyword index {keywords} [{mode}]",
+                              index.estimate(keywords, mode), cost=2)
+                paths.append((stage, lambda: index.search(keywords, mode), contains))
+            else:
+                residuals.append((Stage("filter", f"keyword scan {keywords} [{mode}]", n, cost=2), contains))
+
+        if paths:
+            paths.sort(key=lambda p: p[0].estimate)
+            # entry_nums keeps its user-given order, so it always drives when present.
+            lookup = [p for p in paths if p[0].kind == "lookup"]
+            driver = lookup[0] if lookup else paths[0]
+            for path in paths:
+                if path is not driver:
+                    path[0].kind = "filter"
+                    residuals.append((path[0], path[2]))
+            driver_stage, ids = driver[0], driver[1]
+        else:
+            driver_stage, ids = Stage("scan", "all entries", n), range(n)
+
+        # Most selective first; content scans are the expensive ones, so they go last on ties.
+        residuals.sort(key=lambda r: (r[0].estimate, r[0].cost))
+        return (driver_stage, ids), residuals
+
+    def run(self, entries):
+        t0 = time.perf_counter()
+        (driver, ids), residuals = self.plan(entries)
+        plan_stage = Stage("plan", "bisect time index, estimate and order predicates", len(entries))
+        plan_stage.elapsed = time.perf_counter() - t0
+
+        t1 = time.perf_counter()
+        if callable(ids):
+            ids = ids()  # candidates are only materialised for the path that drives the scan
+        driver.elapsed = time.perf_counter() - t1
+
+        checks = [predicate for _, predicate in residuals]
+        t2 = time.perf_counter()
+        if self.latest:
+            match = next((i for i in reversed(ids) if all(check(i) for check in checks)), None)
+            result = [entries[match]] if match is not None else []
+        else:
+            result = [entries[i] for i in ids if all(check(i) for check in checks)]
+        scan = Stage("scan", "single pass over candidates" + (", newest first, stop at first match"
+                                                              if self.latest else ""), len(ids))
+        scan.elapsed = time.perf_counter() - t2
+
+        self.stages = [plan_stage, driver] + [stage for stage, _ in residuals] + [scan]
+        self.rows = len(result)
+        return result
+
+    def explain(self) -> str:
+        """The plan chosen by the last run, with the time spent in each stage."""
+        if self.rows is None:
+            return "LogQuery: not run yet"
+        lines = ["LogQuery plan:"]
+        for i, stage in enumerate(self.stages, 1):
+            timing = f"{stage.elapsed * 1000:9.3f} ms" if stage.elapsed is not None else "   (in scan)"
+            lines.append(f"  {i}. {stage.kind:<8} est={stage.estimate:<8} {timing}  {stage.description}")
+        lines.append(f"  rows: {self.rows}")
+        return "\n".join(lines)
@@ -0,0 +1,122 @@
+import mmap
+import os
+import sys
+from array import array
+from datetime import datetime, timedelta
+from functools import cached_property
+
+from log_filter import LOG_PATTERN_BYTES, decode_content
+from log_index import KeywordIndex, TimeIndex
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from timestamp_codec import JOURNAL, to_epoch_array  # shared with incident_tracking
+
+EPOCH = datetime(1970, 1, 1)
+BATCH = 65536  # timestamps decoded per to_epoch call
+
+def scan_columns(data, pos: int = 0):
+    """
+    (epochs, offsets, lengths, end) of the complete entries in data[pos:], in file order:
+    array("q") columns of epoch seconds and content byte ranges, and the offset just past
+    the last entry (pos if there is none).
+    """
+    epochs = array("q")
+    offsets = array("q")
+    lengths = array("q")
+    stamps = []
+    end = pos
+    for m in LOG_PATTERN_BYTES.finditer(data, pos):
+        stamps.append(m.group(1).decode("ascii"))
+        start, stop = m.span(2)
+        offsets.append(start)
+        lengths.append(stop - start)
+        end = m.end()
+        if len(stamps) == BATCH:
+            epochs.extend(to_epoch_array(stamps, JOURNAL, "s"))
+            stamps = []
+    epochs.extend(to_epoch_array(stamps, JOURNAL, "s"))
+    return epochs, offsets, lengths, end
+
+def sorted_columns(data):
+    """scan_columns of the whole journal, sorted by time (stable, like list.sort)."""
+    epochs, offsets, lengths, _ = scan_columns(data)
+    if any(epochs[i] > epochs[i + 1] for i in range(len(epochs) - 1)):
+        order = sorted(range(len(epochs)), key=epochs.__getitem__)
+        epochs = array("q", (epochs[i] for i in order))
+        offsets = array("q", (offsets[i] for i in order))
+        lengths = array("q", (lengths[i] for i in order))
+    return epochs, offsets, lengths
+
+class EntryTable:
+    """
+    Column-oriented, read-only view of a journal: three int64 arrays (epoch seconds, content
+    offset, content length) sorted by time, with content kept in the mmap'd source file and
+    decoded only when an entry is accessed. That is 24 bytes per entry instead of a dict,
+    a datetime, the timestamp string and a copy of the content.
+
+    It behaves like the list returned by parse_logs: len(), iteration and table[i] give the
+    usual {"datetime", "timestamp", "content"} dicts (built on access), and it carries
+    time_index / keyword_index so filter_logs and LogQuery use the indexed paths.
+    Keep the table open while entries are being read; close() releases the mapping.
+    """
+
+    def __init__(self, file_path: str, columns=None):
+        # columns(data) gives the time-sorted (epochs, offsets, lengths) of the mapped journal;
+        # the default scans all of it, log_cache.load_entries reads them from its sidecar.
+        self.file_path = file_path
+        self._file = open(file_path, "rb")
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file cannot be mapped
+            self._mm = b""
+        self.epochs, self.offsets, self.lengths = (columns or sorted_columns)(self._mm)
+
+    def __len__(self):
+        return len(self.epochs)
+
+    def datetime_at(self, i: int) -> datetime:
+        return EPOCH + timedelta(seconds=int(self.epochs[i]))
+
+    def content_at(self, i: int) -> str:
+        start = int(self.offsets[i])
+        return decode_content(self._mm[start:start + int(self.lengths[i])]).strip()
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("entry index out of range")
+        dt = self.datetime_at(i)
+        return {
+            "datetime": dt,
+            "timestamp": f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d}_{dt.hour:02d}{dt.minute:02d}hr_{dt.second:02d}sec",
+            "content": self.content_at(i),
+        }
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    @cached_property
+    def time_index(self) -> TimeIndex:
+        return TimeIndex(epochs=self.epochs)  # already sorted epoch seconds, nothing to build
+
+    @cached_property
+    def keyword_index(self) -> KeywordIndex:
+        return KeywordIndex(self)
+
+    def close(self):
+        if isinstance(self._mm, mmap.mmap):
+            self._mm.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def load_table(file_path: str) -> EntryTable:
+    return EntryTable(file_path)
@@ -0,0 +1,209 @@
+"""
+Shared timestamp decoding for the logging and incident_tracking tools.
+
+Known formats have a fixed width, so they are decoded by position instead of going through
+datetime.strptime:
+- decode(value, fmt)          one string -> datetime (fast path, strptime fallback)
+- to_epoch(values, fmt, unit) many strings -> int64 epoch array in one vectorized NumPy step
+- to_epoch_array(...)         the same, packed into a stdlib array("q")
+- to_datetime64(values, fmt)  many strings -> datetime64[us] array
+
+Values that do not fit the fixed layout are handed to strptime, so malformed input still
+raises ValueError exactly as before (or becomes NaT with errors="coerce").
+Timestamps carry no zone and are treated as UTC wall-clock time.
+
+Benchmark: python timestamp_codec.py --n 10000000
+"""
+import argparse
+import calendar
+import re
+import time
+from array import array
+from datetime import datetime, timedelta
+from typing import List, NamedTuple, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # batch API degrades to plain lists
+    np = None
+
+class TimestampFormat(NamedTuple):
+    name: str
+    pattern: str                                    # strptime format, used for the fallback
+    width: int
+    fields: Tuple[Tuple[int, int], ...]             # (start, stop) of Y, m, d, H, M, S[, fraction]
+    literals: Tuple[Tuple[int, str], ...]           # fixed separator characters by position
+    regex: "re.Pattern"
+
+def _build_format(name: str, pattern: str, sample: str, fields) -> TimestampFormat:
+    digit_pos = {i for start, stop in fields for i in range(start, stop)}
+    literals = tuple((i, c) for i, c in enumerate(sample) if i not in digit_pos)
+    regex = ""
+    pos = 0
+    for start, stop in fields:
+        regex += re.escape(sample[pos:start]) + f"([0-9]{{{stop - start}}})"
+        pos = stop
+    regex += re.escape(sample[pos:])
+    return TimestampFormat(name, pattern, len(sample), tuple(fields), literals, re.compile(regex))
+
+# [2025-05-10_1140hr_36sec] journals in logging/
+JOURNAL = _build_format(
+    "journal", "%Y-%m-%d_%H%Mhr_%Ssec", "2025-05-10_1140hr_36sec",
+    [(0, 4), (5, 7), (8, 10), (11, 13), (13, 15), (18, 20)],
+)
+# [2010-04-24 07:51:54,401] traces in incident_tracking/ (milliseconds)
+TRACE = _build_format(
+    "trace", "%Y-%m-%d %H:%M:%S,%f", "2010-04-24 07:51:54,401",
+    [(0, 4), (5, 7), (8, 10), (11, 13), (14, 16), (17, 19), (20, 23)],
+)
+FORMATS = {fmt.name: fmt for fmt in (JOURNAL, TRACE)}
+
+UNITS = {"s": 1, "ms": 1_000, "us": 1_000_000}
+NAT = -(2 ** 63)  # int64 marker for values coerced to NaT
+
+def decode(value: str, fmt: TimestampFormat = JOURNAL) -> datetime:
+    """Decode one timestamp. Strings that do not fit the fixed layout go through strptime."""
+    m = fmt.regex.fullmatch(value)
+    if m:
+        parts = m.groups()
+        try:
+            if len(parts) == 7:
+                # fraction digits scaled to microseconds, e.g. "401" -> 401000
+                return datetime(int(parts[0]), int(parts[1]), int(parts[2]), int(parts[3]),
+                                int(parts[4]), int(parts[5]), int(parts[6]) * 10 ** (6 - len(parts[6])))
+            return datetime(int(parts[0]), int(parts[1]), int(parts[2]),
+                            int(parts[3]), int(parts[4]), int(parts[5]))
+        except ValueError:
+            pass  # e.g. 2025-02-30; let strptime produce its usual error
+    return datetime.strptime(value, fmt.pattern)
+
+def epoch(dt: datetime, unit: str = "s") -> int:
+    scale = UNITS[unit]
+    return calendar.timegm(dt.timetuple()) * scale + dt.microsecond * scale // 1_000_000
+
+def _fallback(values, rows, fmt, unit, errors, out):
+    for i in rows:
+        try:
+            out[i] = epoch(decode(values[i], fmt), unit)
+        except ValueError:
+            if errors == "raise":
+                raise
+            out[i] = NAT
+
+def to_epoch(values: List[str], fmt: TimestampFormat = JOURNAL, unit: str = "s", errors: str = "raise"):
+    """
+    Decode a batch of timestamps to an int64 array of epoch units ("s", "ms" or "us").
+
+    All well-formed rows are decoded together: the strings are joined into one byte buffer,
+    viewed as an (n, width) uint8 matrix, and every field is read with column arithmetic.
+    Rows that fail the layout or range checks are decoded one by one through strptime;
+    errors="raise" propagates its ValueError, errors="coerce" stores NAT instead.
+    Without NumPy a plain list is returned.
+    """
+    if unit not in UNITS:
+        raise ValueError(f"unit must be one of {sorted(UNITS)}")
+    n = len(values)
+    if np is None:
+        out = [0] * n
+        _fallback(values, range(n), fmt, unit, errors, out)
+        return out
+
+    out = np.full(n, NAT, dtype=np.int64)
+    if n == 0:
+        return out
+
+    width = fmt.width
+    lengths = np.fromiter(map(len, values), dtype=np.int64, count=n)
+    fixed = np.flatnonzero(lengths == width)
+    # latin-1 with "replace" keeps one byte per character, so the matrix stays aligned;
+    # anything outside ASCII then fails the digit/literal checks below.
+    joined = "".join(values if len(fixed) == n else [values[i] for i in fixed])
+    raw = np.frombuffer(joined.encode("latin-1", errors="replace"), dtype=np.uint8)
+    raw = raw.reshape(len(fixed), width)
+
+    ok = np.ones(len(fixed), dtype=bool)
+    for pos, char in fmt.literals:
+        ok &= raw[:, pos] == ord(char)
+
+    numbers = []
+    for start, stop in fmt.fields:
+        digits = raw[:, start:stop].astype(np.int64) - 48
+        ok &= ((digits >= 0) & (digits <= 9)).all(axis=1)
+        numbers.append(digits @ (10 ** np.arange(stop - start - 1, -1, -1, dtype=np.int64)))
+    year, month, day, hour, minute, second = numbers[:6]
+
+    ok &= (month >= 1) & (month <= 12) & (day >= 1) & (hour < 24) & (minute < 60) & (second < 60)
+    ok &= year >= 1
+    safe_month = np.where(ok, month, 1)
+    months = (year - 1970) * 12 + safe_month - 1
+    month_start = months.astype("datetime64[M]").astype("datetime64[D]").astype(np.int64)
+    next_month = (months + 1).astype("datetime64[M]").astype("datetime64[D]").astype(np.int64)
+    ok &= day <= next_month - month_start
+
+    days = month_start + day - 1
+    scale = UNITS[unit]
+    values_out = ((days * 86400 + hour * 3600 + minute * 60 + second) * scale)
+    if len(numbers) == 7:
+        frac_digits = fmt.fields[6][1] - fmt.fields[6][0]
+        values_out += numbers[6] * 10 ** (6 - frac_digits) * scale // 1_000_000
+    out[fixed[ok]] = values_out[ok]
+
+    bad = np.ones(n, dtype=bool)
+    bad[fixed[ok]] = False
+    _fallback(values, np.flatnonzero(bad), fmt, unit, errors, out)
+    return out
+
+def to_epoch_array(values: List[str], fmt: TimestampFormat = JOURNAL, unit: str = "s", errors: str = "raise") -> array:
+    """to_epoch packed into a stdlib array("q"), for callers that store compact columns."""
+    decoded = to_epoch(values, fmt, unit, errors)
+    out = array("q")
+    if np is not None:
+        out.frombytes(decoded.astype(np.int64, copy=False).tobytes())
+    else:
+        out.extend(decoded)
+    return out
+
+def to_datetime64(values: List[str], fmt: TimestampFormat = JOURNAL, errors: str = "raise"):
+    """Like to_epoch, as a datetime64[us] array (coerced values become NaT)."""
+    if np is None:
+        raise ImportError("to_datetime64 needs numpy")
+    return to_epoch(values, fmt, "us", errors).view("datetime64[us]")
+
+def benchmark(n: int, fmt: TimestampFormat, strptime_sample: int):
+    base = datetime(2010, 1, 1)
+    step = 7.3  # seconds, so every field changes
+    render = {
+        "journal": lambda dt: dt.strftime("%Y-%m-%d_%H%Mhr_%Ssec"),
+        "trace": lambda dt: dt.strftime("%Y-%m-%d %H:%M:%S,") + f"{dt.microsecond // 1000:03d}",
+    }[fmt.name]
+    print(f"Generating {n:,} {fmt.name} timestamps...")
+    values = [render(base + timedelta(seconds=i * step)) for i in range(n)]
+
+    # strptime is timed on a sample and extrapolated; at 10M it would take minutes.
+    sample = values[:min(n, strptime_sample)]
+    t0 = time.perf_counter()
+    for v in sample:
+        datetime.strptime(v, fmt.pattern)
+    strptime_rate = len(sample) / (time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    for v in sample:
+        decode(v, fmt)
+    decode_rate = len(sample) / (time.perf_counter() - t0)
+
+    print(f"strptime      : {strptime_rate:>14,.0f} ts/s  (est. {n / strptime_rate:8.2f}s for {n:,})")
+    print(f"decode        : {decode_rate:>14,.0f} ts/s  (est. {n / decode_rate:8.2f}s)  x{decode_rate / strptime_rate:.1f}")
+    if np is not None:
+        t0 = time.perf_counter()
+        to_epoch(values, fmt, "us")
+        elapsed = time.perf_counter() - t0
+        print(f"to_epoch batch: {n / elapsed:>14,.0f} ts/s  ({elapsed:8.2f}s)  x{n / elapsed / strptime_rate:.1f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark timestamp decoding against datetime.strptime")
+    parser.add_argument("--n", type=int, default=10_000_000, help="number of timestamps")
+    parser.add_argument("--format", choices=sorted(FORMATS), default="journal")
+    parser.add_argument("--strptime-sample", type=int, default=200_000,
+                        help="how many values strptime/decode are timed on")
+    args = parser.parse_args()
+    benchmark(args.n, FORMATS[args.format], args.strptime_sample)